@@ -451,9 +451,10 @@ ShellRoot {
         let pos = mediaPosition
         let newIndex = -1
 
+        // Several lines can share a timestamp; stay on the first one (the original text)
         for (let i = 0; i < lyricsLines.length; i++) {
             if (lyricsLines[i].time <= pos) {
-                newIndex = i
+                if (newIndex < 0 || lyricsLines[i].time > lyricsLines[newIndex].time) newIndex = i
             } else {
                 break
             }
@@ -463,7 +464,9 @@ ShellRoot {
             currentLyricIndex = newIndex
             if (newIndex >= 0) {
                 currentLyric = lyricsLines[newIndex].text
-                nextLyric = (newIndex + 1 < lyricsLines.length) ? lyricsLines[newIndex + 1].text : ""
+                let nextIndex = newIndex + 1
+                while (nextIndex < lyricsLines.length && lyricsLines[nextIndex].time <= lyricsLines[newIndex].time) nextIndex++
+                nextLyric = nextIndex < lyricsLines.length ? lyricsLines[nextIndex].text : ""
             } else if (lyricsLines.length > 0) {
                 currentLyric = ""
                 nextLyric = lyricsLines[0].text
@@ -0,0 +1,1150 @@
+#!/usr/bin/env python3
+"""媒体组件性能基准脚本。"""
+
+from __future__ import annotations
+
+import argparse
+import contextlib
+import json
+import math
+import os
+import random
+import shutil
+import signal
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Any, Callable
+
+import lyrics_fetcher
+import media_state
+
+
+BENCH_PLAYER = "bench"
+BENCH_ARTIST = "Bench Artist"
+BENCH_ALBUM = "Bench Album"
+BENCH_TRACK_LENGTH_SECONDS = 240.0
+BENCH_LINE_SPACING_SECONDS = 1.5
+BENCH_SEEK_POSITION_SECONDS = 90.0
+BENCH_PAUSE_SECONDS = 2.0
+BENCH_STARTUP_TIMEOUT_SECONDS = 10.0
+BENCH_LRCLIB_LINES = 60
+# 【媒体组件】【基准测试】增强格式歌词每行的逐字时间数量
+BENCH_WORDS_PER_LINE = 8
+# 【媒体组件】【基准测试】同一批歌曲在不同播放器和专辑中的常见写法，用于估算缓存键规范化后的命中率
+BENCH_KEY_PLAYLIST = [
+    ("Bohemian Rhapsody", "Queen", "A Night at the Opera"),
+    ("Bohemian Rhapsody - Remastered 2011", "Queen", "A Night at the Opera (2011 Remaster)"),
+    ("Bohemian Rhapsody (Remastered 2011)", "Queen", "Greatest Hits"),
+    ("Bohemian Rhapsody", "Queen - Topic", ""),
+    ("Bohemian Rhapsody - Live Aid", "Queen", "Live Aid"),
+    ("Don't Stop Me Now - Remastered 2011", "Queen", "Jazz"),
+    ("Don't Stop Me Now", "Queen", "Greatest Hits"),
+    ("Under Pressure", "Queen & David Bowie", "Hot Space"),
+    ("Under Pressure - Remastered 2011", "David Bowie, Queen", "Greatest Hits II"),
+    ("Under Pressure", "Queen/David Bowie", ""),
+    ("Get Lucky (feat. Pharrell Williams & Nile Rodgers)", "Daft Punk", "Random Access Memories"),
+    ("Get Lucky", "Daft Punk feat. Pharrell Williams", "Random Access Memories"),
+    ("Get Lucky - Radio Edit", "Daft Punk", "Get Lucky"),
+    ("Get Lucky (Radio Edit)", "Daft Punk, Pharrell Williams, Nile Rodgers", ""),
+    ("晴天", "周杰倫", "葉惠美"),
+    ("晴天", "周杰倫", "Jay Chou's Greatest Hits"),
+    ("【MV】晴天", "周杰倫", ""),
+    ("晴天 (Live)", "周杰倫", "地表最強世界巡迴演唱會"),
+    ("ＬＯＶＥ　ＰＯＥＭ", "ＩＵ", "Love poem"),
+    ("Love Poem", "IU", "Love poem"),
+    ("Shape of You", "Ed Sheeran", "÷ (Deluxe)"),
+    ("Shape of You", "Ed Sheeran", "÷"),
+    ("Shape of You (Official Music Video)", "Ed Sheeran", ""),
+    ("Shape of You - Acoustic", "Ed Sheeran", "Shape of You (Acoustic)"),
+    ("Blinding Lights", "The Weeknd", "After Hours"),
+    ("Blinding Lights", "The Weeknd", "The Highlights"),
+    ("Blinding Lights - Single Version", "The Weeknd", "Blinding Lights"),
+    ("Take On Me", "a-ha", "Hunting High and Low"),
+    ("Take On Me - 2015 Remaster", "a-ha", "Hunting High and Low (Remastered)"),
+    ("Take On Me (MTV Unplugged)", "a-ha", "MTV Unplugged"),
+    ("Clair de Lune", "Claude Debussy", "Suite bergamasque"),
+    ("Wonderwall", "Oasis", "(What's the Story) Morning Glory?"),
+    ("Wonderwall - Remastered", "Oasis", "(What's the Story) Morning Glory? (Deluxe Remastered Edition)"),
+    ("Wonderwall", "Oasis", "Stop the Clocks"),
+]
+
+# 【媒体组件】【基准测试】假 playerctl 支持批量查询和逐字段查询，状态文件按序号保存多个播放器，进度按写入状态时的墙钟时间推算
+FAKE_PLAYERCTL = """#!/bin/sh
+. "$QS_MEDIA_BENCH_STATE"
+value() { eval "printf '%s' \\"\\$${1}_$2\\""; }
+position_us() {
+    position=$(value POSITION_US "$1")
+    if [ "$(value STATUS "$1")" = "Playing" ]; then
+        now=$(date +%s%N)
+        position=$((position + (now - $(value ANCHOR_NS "$1")) / 1000))
+    fi
+    printf '%s' "$position"
+}
+if [ "$COUNT" -eq 0 ]; then
+    echo "No players found" >&2
+    exit 1
+fi
+if [ "$1" = "-l" ]; then
+    i=1
+    while [ "$i" -le "$COUNT" ]; do value PLAYER "$i"; echo; i=$((i + 1)); done
+    exit 0
+fi
+if [ "$1" = "-a" ] && [ "$2" = "metadata" ]; then
+    i=1
+    while [ "$i" -le "$COUNT" ]; do
+        printf '%s\\037%s\\037%s\\037%s\\037%s\\037%s\\037%s\\n' "$(value PLAYER "$i")" "$(value STATUS "$i")" \\
+            "$(position_us "$i")" "$(value LENGTH_US "$i")" "$(value TITLE "$i")" "$(value ARTIST "$i")" "$(value ALBUM "$i")"
+        i=$((i + 1))
+    done
+    exit 0
+fi
+[ "$1" = "-p" ] || exit 1
+i=1
+while [ "$i" -le "$COUNT" ] && [ "$(value PLAYER "$i")" != "$2" ]; do i=$((i + 1)); done
+if [ "$i" -gt "$COUNT" ]; then
+    echo "No players found" >&2
+    exit 1
+fi
+case "$3 $4" in
+    "status ") value STATUS "$i" ;;
+    "position ") position=$(position_us "$i"); printf '%d.%06d' $((position / 1000000)) $((position % 1000000)) ;;
+    "metadata xesam:title") value TITLE "$i" ;;
+    "metadata xesam:artist") value ARTIST "$i" ;;
+    "metadata xesam:album") value ALBUM "$i" ;;
+    "metadata mpris:length") value LENGTH_US "$i" ;;
+    *) exit 1 ;;
+esac
+echo
+"""
+
+
+def percentile(values: list[float], ratio: float) -> float:
+    """计算分位数。
+
+    Args:
+        values: 样本列表。
+        ratio: 分位比例，取值 0 到 1。
+    Returns:
+        float: 分位数；样本为空时返回 0。
+    """
+    if not values:
+        return 0
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, round(ratio * (len(ordered) - 1))))
+    return ordered[index]
+
+
+def count_playerctl_forks(reader: Callable[[], Any], ticks: int) -> dict[str, Any]:
+    """重复执行播放器读取函数，统计 playerctl 进程数和单次耗时。
+
+    Args:
+        reader: 播放器读取函数。
+        ticks: 执行次数。
+    Returns:
+        dict[str, Any]: 统计结果。
+    """
+    original = media_state.run_playerctl
+    forks = 0
+
+    def counted(args: list[str], timeout: float = 2) -> Any:
+        nonlocal forks
+        forks += 1
+        return original(args, timeout)
+
+    latencies: list[float] = []
+    media_state.run_playerctl = counted
+    try:
+        for _ in range(ticks):
+            started_at = time.perf_counter()
+            reader()
+            latencies.append((time.perf_counter() - started_at) * 1000)
+    finally:
+        media_state.run_playerctl = original
+
+    forks_per_tick = forks / max(ticks, 1)
+    return {
+        "ticks": ticks,
+        "forks_per_tick": round(forks_per_tick, 2),
+        "forks_per_second": round(forks_per_tick / media_state.POLL_INTERVAL_SECONDS, 2),
+        "tick_ms_mean": round(statistics.fmean(latencies), 2) if latencies else 0,
+        "tick_ms_p95": round(percentile(latencies, 0.95), 2),
+    }
+
+
+def bench_playerctl(ticks: int) -> dict[str, Any]:
+    """使用假 playerctl 对比逐字段查询和批量查询的进程数与耗时。
+
+    Args:
+        ticks: 每种模式执行次数。
+    Returns:
+        dict[str, Any]: 两种模式的统计结果；假 playerctl 输出不符合预期时返回失败信息。
+    """
+    # 【媒体组件】【基准测试】使用 PATH 最前面的假 playerctl 和两个固定播放器，结果不受本机 playerctl 版本和正在运行的播放器影响；
+    # 第一个播放器暂停、第二个播放中，逐字段查询需要依次检查两个播放器的状态
+    now = time.time()
+    players = [
+        {"player": f"{BENCH_PLAYER}-paused", "title": "Bench Paused", "status": "Paused", "position": 30.0, "anchor": now},
+        {"player": BENCH_PLAYER, "title": "Bench Playing", "status": "Playing", "position": 60.0, "anchor": now},
+    ]
+    saved = {name: os.environ.get(name) for name in ("PATH", "QS_MEDIA_BENCH_STATE")}
+    with tempfile.TemporaryDirectory(prefix="qs-media-bench-") as temp_dir:
+        temp_path = Path(temp_dir)
+        state_file = temp_path / "playerctl-state"
+        bin_dir = install_fake_playerctl(temp_path)
+        write_fake_playerctl_state(state_file, players)
+        os.environ["PATH"] = f"{bin_dir}{os.pathsep}{saved['PATH'] or ''}"
+        os.environ["QS_MEDIA_BENCH_STATE"] = str(state_file)
+        try:
+            individual_players = media_state.read_players_individually()
+            batched_players = media_state.read_players_batched()
+            if [player["player"] for player in individual_players] != [BENCH_PLAYER] or batched_players is None or len(batched_players) != len(players):
+                return {"success": False, "error": "fake playerctl returned unexpected players"}
+            return {
+                "success": True,
+                "players": len(players),
+                "individual": count_playerctl_forks(media_state.read_players_individually, ticks),
+                "batched": count_playerctl_forks(media_state.read_players_playerctl, ticks),
+            }
+        finally:
+            for name, value in saved.items():
+                if value is None:
+                    os.environ.pop(name, None)
+                else:
+                    os.environ[name] = value
+
+
+def synthetic_lines(count: int, words: int = 0) -> list[dict[str, Any]]:
+    """生成用于基准测试的同步歌词。
+
+    Args:
+        count: 歌词行数。
+        words: 每行的逐字时间数量，为 0 时不生成逐字时间。
+    Returns:
+        list[dict[str, Any]]: 歌词行列表。
+    """
+    lines = [{"time": round(index * 2.5, 2), "text": f"第 {index + 1} 行 lyric line {index + 1}"} for index in range(count)]
+    for line in lines if words else ():
+        line["words"] = [{"time": round(line["time"] + step * 2.5 / words, 2), "text": f"w{step} "} for step in range(words)]
+    return lines
+
+
+def playing_snapshot(index: int, lines: list[dict[str, Any]] | None, status: str = "Playing") -> dict[str, Any]:
+    """生成第 index 首曲目的快照。
+
+    Args:
+        index: 曲目序号。
+        lines: 同步歌词；为 None 时生成歌词加载中的快照。
+        status: 播放状态文本。
+    Returns:
+        dict[str, Any]: 媒体状态快照。
+    """
+    title = f"Bench Track {index}"
+    track = {
+        "key": media_state.track_key(title, "Bench Artist", "Bench Album", "bench"),
+        "title": title,
+        "artist": "Bench Artist",
+        "album": "Bench Album",
+        "length": 210.0,
+        "player": "bench",
+    }
+    snapshot = media_state.base_snapshot("bench", track, 0.0, status)
+    if lines is not None:
+        snapshot["lyrics"] = media_state.build_lyrics_state({"success": True, "synced": True, "lines": lines}, 0.0)
+    return snapshot
+
+
+def linear_current_line(lines: list[dict[str, Any]], position: float) -> int:
+    """逐行扫描查找当前歌词行，作为索引查找的对照。
+
+    Args:
+        lines: 歌词行列表。
+        position: 播放进度，单位为秒。
+    Returns:
+        int: 当前行下标；进度早于第一行时返回 -1。
+    """
+    current_index = -1
+    for index, line in enumerate(lines):
+        if line["time"] <= position:
+            current_index = index
+        else:
+            break
+    return current_index
+
+
+def bench_lyrics_lookup(line_count: int, queries: int) -> dict[str, Any]:
+    """比较逐行扫描和歌词时间索引在顺序播放与随机跳转下的单次查找耗时。
+
+    Args:
+        line_count: 歌词行数。
+        queries: 每种场景的查找次数。
+    Returns:
+        dict[str, Any]: 每种场景的平均耗时，单位为微秒。
+    """
+    lines = synthetic_lines(line_count)
+    word_lines = synthetic_lines(line_count, BENCH_WORDS_PER_LINE)
+    end = lines[-1]["time"] + 5
+    # 【媒体组件】【基准测试】顺序播放按 0.1 秒步进循环，随机场景模拟频繁跳转
+    sequential = [(step * 0.1) % end for step in range(queries)]
+    generator = random.Random(line_count)
+    scattered = [generator.uniform(0, end) for _ in range(queries)]
+
+    def measure(lookup: Callable[[float], Any], positions: list[float]) -> float:
+        """执行一组查找并返回平均耗时。
+
+        Args:
+            lookup: 查找函数。
+            positions: 播放进度列表。
+        Returns:
+            float: 平均耗时，单位为微秒。
+        """
+        started_at = time.perf_counter()
+        for position in positions:
+            lookup(position)
+        return (time.perf_counter() - started_at) * 1_000_000 / max(len(positions), 1)
+
+    results = {
+        "lines": line_count,
+        "queries": queries,
+        "linear_sequential_us": measure(lambda position: linear_current_line(lines, position), sequential),
+        "linear_random_us": measure(lambda position: linear_current_line(lines, position), scattered),
+        "indexed_sequential_us": measure(lambda position: lyrics_fetcher.get_current_line(lines, position), sequential),
+        "indexed_random_us": measure(lambda position: lyrics_fetcher.get_current_line(lines, position), scattered),
+        "indexed_words_random_us": measure(lambda position: lyrics_fetcher.get_current_line(word_lines, position), scattered),
+    }
+    return {key: round(value, 3) if isinstance(value, float) else value for key, value in results.items()}
+
+
+class StubLrclibHandler(BaseHTTPRequestHandler):
+    """模拟 lrclib.net 的本地歌词服务：/get 一律未找到，/search 返回同步歌词，用于测量冷启动曲目的完整回退路径。"""
+
+    protocol_version = "HTTP/1.1"
+    # 响应头和响应体分两次写出，关闭 Nagle 避免与延迟确认叠加出 40 毫秒的额外等待
+    disable_nagle_algorithm = True
+
+    def setup(self) -> None:
+        """接受新连接时按握手延迟等待，模拟 TCP 与 TLS 握手的往返时间。
+
+        Args:
+            无。
+        Returns:
+            None: 无返回值。
+        """
+        super().setup()
+        self.server.connections += 1
+        time.sleep(self.server.handshake_seconds)
+
+    def do_GET(self) -> None:
+        """按请求路径返回未找到或搜索结果。
+
+        Args:
+            无。
+        Returns:
+            None: 无返回值。
+        """
+        time.sleep(self.server.rtt_seconds)
+        if self.path.startswith("/api/search"):
+            lrc = "\n".join(f"[{line['time'] // 60:02.0f}:{line['time'] % 60:05.2f}]{line['text']}" for line in synthetic_lines(BENCH_LRCLIB_LINES))
+            status, body = 200, json.dumps([{"syncedLyrics": lrc, "plainLyrics": ""}]).encode("utf-8")
+        else:
+            status, body = 404, b'{"message":"Failed to find specified track"}'
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format: str, *args: Any) -> None:
+        """关闭访问日志输出。
+
+        Args:
+            format: 日志格式。
+            args: 日志参数。
+        Returns:
+            None: 无返回值。
+        """
+
+
+def sequential_lrclib_fetch(title: str) -> dict[str, Any]:
+    """按改为并发请求之前的顺序，先精确查询、未找到时再搜索。
+
+    Args:
+        title: 曲目标题。
+    Returns:
+        dict[str, Any]: 歌词请求结果。
+    """
+    params = {"track_name": title, "artist_name": BENCH_ARTIST, "album_name": BENCH_ALBUM, "duration": int(BENCH_TRACK_LENGTH_SECONDS)}
+    outcome = lyrics_fetcher.query_lrclib("get", params)
+    if "result" not in outcome:
+        outcome = lyrics_fetcher.query_lrclib("search", {"q": f"{BENCH_ARTIST} {title}"})
+    return outcome.get("result") or {"success": False, "error": outcome.get("error", "")}
+
+
+def bench_lyrics_fetch(tracks: int, handshake_ms: float, rtt_ms: float) -> dict[str, Any]:
+    """对比每次新建客户端顺序请求、复用连接池顺序请求和复用连接池并发请求时，冷启动曲目从请求到拿到歌词的耗时。
+
+    Args:
+        tracks: 每种模式请求的曲目数量。
+        handshake_ms: 模拟的每个新连接握手耗时，单位为毫秒。
+        rtt_ms: 模拟的每次请求往返耗时，单位为毫秒。
+    Returns:
+        dict[str, Any]: 每种模式的耗时分位数和新建连接数。
+    """
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StubLrclibHandler)
+    server.daemon_threads = True
+    server.connections = 0
+    server.handshake_seconds = handshake_ms / 1000
+    server.rtt_seconds = rtt_ms / 1000
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+
+    original_api = lyrics_fetcher.LRCLIB_API
+    original_cache_home = os.environ.get("XDG_CACHE_HOME")
+    results: dict[str, Any] = {"tracks": tracks, "handshake_ms": handshake_ms, "rtt_ms": rtt_ms}
+    try:
+        with tempfile.TemporaryDirectory(prefix="qs-media-bench-") as cache_home:
+            # 【媒体组件】【基准测试】歌词缓存写入临时目录，每首曲目都是冷启动
+            os.environ["XDG_CACHE_HOME"] = cache_home
+            lyrics_fetcher.LRCLIB_API = f"http://127.0.0.1:{server.server_address[1]}/api"
+            for mode in ("per-call-sequential", "pooled-sequential", "pooled-raced"):
+                lyrics_fetcher.close_lrclib_clients()
+                connections_before = server.connections
+                durations = []
+                for index in range(tracks):
+                    title = f"{mode} Track {index}"
+                    if mode == "per-call-sequential":
+                        # 每首曲目使用新客户端，等同于改为连接池之前的行为
+                        lyrics_fetcher.close_lrclib_clients()
+                    started_at = time.perf_counter()
+                    if mode == "pooled-raced":
+                        result = lyrics_fetcher.fetch_lrclib_lyrics(title, BENCH_ARTIST, BENCH_ALBUM, BENCH_TRACK_LENGTH_SECONDS)
+                    else:
+                        result = sequential_lrclib_fetch(title)
+                    durations.append((time.perf_counter() - started_at) * 1000)
+                    if not result.get("success"):
+                        raise RuntimeError(f"stub lyrics request failed: {result}")
+                results[mode] = {
+                    "first_lyric_ms_p50": round(percentile(durations, 0.5), 2),
+                    "first_lyric_ms_p95": round(percentile(durations, 0.95), 2),
+                    "first_lyric_ms_mean": round(statistics.fmean(durations), 2),
+                    "connections": server.connections - connections_before,
+                }
+    finally:
+        lyrics_fetcher.close_lrclib_clients()
+        lyrics_fetcher.LRCLIB_API = original_api
+        if original_cache_home is None:
+            os.environ.pop("XDG_CACHE_HOME", None)
+        else:
+            os.environ["XDG_CACHE_HOME"] = original_cache_home
+        server.shutdown()
+        server.server_close()
+    return results
+
+
+def load_key_playlist(path: str) -> list[tuple[str, str, str]]:
+    """读取 CSV 播放列表，每行依次为标题、艺术家和专辑。
+
+    Args:
+        path: CSV 文件路径；为空时使用内置样例。
+    Returns:
+        list[tuple[str, str, str]]: 曲目元数据列表。
+    """
+    if not path:
+        return BENCH_KEY_PLAYLIST
+
+    import csv
+
+    with open(path, newline="", encoding="utf-8") as playlist_file:
+        return [
+            (row[0], row[1] if len(row) > 1 else "", row[2] if len(row) > 2 else "")
+            for row in csv.reader(playlist_file)
+            if row and row[0].strip()
+        ]
+
+
+def bench_cache_keys(playlist_path: str) -> dict[str, Any]:
+    """按顺序播放一遍列表，比较原样缓存键与规范化缓存键的命中率。
+
+    Args:
+        playlist_path: CSV 播放列表路径；为空时使用内置样例。
+    Returns:
+        dict[str, Any]: 两种缓存键的不同键数量和命中率。
+    """
+    playlist = load_key_playlist(playlist_path)
+    results: dict[str, Any] = {"plays": len(playlist)}
+    for name, make_key in (
+        ("legacy", lambda track: lyrics_fetcher.legacy_lyrics_cache_key(*track)),
+        ("normalized", lambda track: lyrics_fetcher.lyrics_cache_key(*track)),
+    ):
+        seen: set[str] = set()
+        hits = 0
+        for track in playlist:
+            key = make_key(track)
+            hits += key in seen
+            seen.add(key)
+        results[name] = {"keys": len(seen), "hits": hits, "hit_rate": round(hits / max(len(playlist), 1), 3)}
+    return results
+
+
+def bench_state_writes(tracks: int, lines: int, ticks_per_track: int) -> dict[str, Any]:
+    """模拟连续播放，比较不同写入策略下状态文件的写入字节数。
+
+    Args:
+        tracks: 模拟的曲目数量。
+        lines: 每首歌词行数。
+        ticks_per_track: 每首曲目经历的轮询次数。
+    Returns:
+        dict[str, Any]: 写入字节数统计。
+    """
+    lyrics_lines = synthetic_lines(lines)
+    with tempfile.TemporaryDirectory() as temp_dir:
+        os.environ["XDG_RUNTIME_DIR"] = temp_dir
+        writer = media_state.StateWriter()
+        per_tick_bytes = 0
+        change_only_inline_bytes = 0
+
+        for index in range(tracks):
+            # 【媒体组件】【基准测试】每首曲目依次经历加载中、稳定播放和一次暂停
+            events = [playing_snapshot(index, None)]
+            events += [playing_snapshot(index, lyrics_lines) for _ in range(ticks_per_track)]
+            events.append(playing_snapshot(index, lyrics_lines, "Paused"))
+            for snapshot in events:
+                inline_size = len(json.dumps(snapshot, ensure_ascii=False).encode("utf-8"))
+                per_tick_bytes += inline_size
+                if writer.write(snapshot):
+                    change_only_inline_bytes += inline_size
+
+        split_bytes = writer.bytes_written + writer.lyrics_bytes_written
+        return {
+            "tracks": tracks,
+            "lines_per_track": lines,
+            "ticks": tracks * (ticks_per_track + 2),
+            "writes": writer.writes,
+            "per_tick_inline_bytes": per_tick_bytes,
+            "change_only_inline_bytes": change_only_inline_bytes,
+            "split_bytes": split_bytes,
+            "split_state_bytes": writer.bytes_written,
+            "split_lyrics_bytes": writer.lyrics_bytes_written,
+            "hot_state_bytes_per_write": round(writer.bytes_written / max(writer.writes, 1)),
+        }
+
+
+def parse_importtime(stderr: str) -> dict[str, int]:
+    """解析 python -X importtime 输出中顶层模块的累计导入耗时。
+
+    Args:
+        stderr: 子进程标准错误输出。
+    Returns:
+        dict[str, int]: 模块名到累计导入耗时的映射，单位为微秒。
+    """
+    modules: dict[str, int] = {}
+    for line in stderr.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        parts = line.split("|")
+        if len(parts) != 3 or parts[2].startswith("  ") or not parts[1].strip().isdigit():
+            continue
+        modules[parts[2].strip()] = int(parts[1])
+    return modules
+
+
+def bench_startup(commands: list[str], runs: int) -> dict[str, Any]:
+    """统计 media_state.py 短命令的启动耗时和导入的重量级模块。
+
+    Args:
+        commands: 需要测量的子命令列表。
+        runs: 每个子命令执行次数。
+    Returns:
+        dict[str, Any]: 每个子命令的启动统计。
+    """
+    script = os.path.join(os.path.dirname(os.path.abspath(__file__)), "media_state.py")
+    results: dict[str, Any] = {}
+    for command in commands:
+        latencies: list[float] = []
+        for _ in range(runs):
+            started_at = time.perf_counter()
+            subprocess.run([sys.executable, script, command], capture_output=True, check=False)
+            latencies.append((time.perf_counter() - started_at) * 1000)
+
+        # 【媒体组件】【基准测试】site 由解释器环境决定，不计入脚本自身的导入耗时
+        traced = subprocess.run([sys.executable, "-X", "importtime", script, command], capture_output=True, text=True, check=False)
+        modules = parse_importtime(traced.stderr)
+        modules.pop("site", None)
+        results[command] = {
+            "wall_ms_median": round(statistics.median(latencies), 1),
+            "wall_ms_p95": round(percentile(latencies, 0.95), 1),
+            "import_ms": round(sum(modules.values()) / 1000, 1),
+            "slowest_imports_ms": {
+                name: round(value / 1000, 1)
+                for name, value in sorted(modules.items(), key=lambda item: item[1], reverse=True)[:5]
+            },
+            "loads_httpx": "httpx" in traced.stderr,
+            "loads_asyncio": "asyncio" in modules,
+        }
+    return results
+
+
+def bench_timeline(duration: float, track_seconds: float) -> list[tuple[float, dict[str, Any]]]:
+    """生成基准测试的播放脚本：每首曲目依次经历开始播放、跳转、暂停和继续播放。
+
+    Args:
+        duration: 脚本总时长，单位为秒。
+        track_seconds: 每首曲目的播放时长，单位为秒。
+    Returns:
+        list[tuple[float, dict[str, Any]]]: 按时间排序的事件列表，时间相对脚本开始。
+    """
+    events: list[tuple[float, dict[str, Any]]] = []
+    for index in range(math.ceil(duration / track_seconds)):
+        started_at = index * track_seconds
+        pause_at = started_at + track_seconds * 0.7
+        events += [
+            (started_at, {"action": "track", "title": f"Bench Track {index}"}),
+            (started_at + track_seconds * 0.4, {"action": "seek", "position": BENCH_SEEK_POSITION_SECONDS}),
+            (pause_at, {"action": "pause"}),
+            (pause_at + BENCH_PAUSE_SECONDS, {"action": "play"}),
+        ]
+    return [(at, event) for at, event in events if at < duration]
+
+
+def apply_bench_event(player: dict[str, Any], event: dict[str, Any]) -> None:
+    """把脚本事件应用到假播放器模型。
+
+    Args:
+        player: 假播放器模型，包含 title、status、position 和 anchor。
+        event: 脚本事件。
+    Returns:
+        None: 无返回值。
+    """
+    now = time.time()
+    if player["status"] == "Playing":
+        player["position"] += now - player["anchor"]
+    player["anchor"] = now
+
+    action = event["action"]
+    if action == "track":
+        player.update({"title": event["title"], "status": "Playing", "position": 0.0})
+    elif action == "seek":
+        player["position"] = float(event["position"])
+    elif action == "pause":
+        player["status"] = "Paused"
+    elif action == "play":
+        player["status"] = "Playing"
+    elif action == "quit":
+        player.update({"title": "", "status": "Stopped", "position": 0.0})
+
+
+def write_fake_playerctl_state(path: Path, players: list[dict[str, Any]]) -> None:
+    """写入假 playerctl 读取的状态文件。
+
+    Args:
+        path: 状态文件路径。
+        players: 假播放器模型列表，每项可用 player 字段指定播放器名称；没有标题的播放器视为已退出。
+    Returns:
+        None: 无返回值。
+    """
+    players = [player for player in players if player["title"]]
+    values: dict[str, Any] = {"COUNT": len(players)}
+    for index, player in enumerate(players, start=1):
+        values.update({
+            f"PLAYER_{index}": player.get("player", BENCH_PLAYER),
+            f"STATUS_{index}": player["status"],
+            f"TITLE_{index}": player["title"],
+            f"ARTIST_{index}": BENCH_ARTIST,
+            f"ALBUM_{index}": BENCH_ALBUM,
+            f"POSITION_US_{index}": int(player["position"] * 1_000_000),
+            f"ANCHOR_NS_{index}": int(player["anchor"] * 1_000_000_000),
+            f"LENGTH_US_{index}": int(BENCH_TRACK_LENGTH_SECONDS * 1_000_000),
+        })
+    # 【媒体组件】【基准测试】先写临时文件再替换，避免假 playerctl 读到半份状态
+    temp_path = path.with_suffix(".tmp")
+    temp_path.write_text("".join(f"{key}='{value}'\n" for key, value in values.items()), encoding="utf-8")
+    temp_path.replace(path)
+
+
+def install_fake_playerctl(directory: Path) -> Path:
+    """在目录中写入假 playerctl，供放在 PATH 最前面。
+
+    Args:
+        directory: 存放假 playerctl 的目录。
+    Returns:
+        Path: 假 playerctl 所在的 bin 目录。
+    """
+    bin_dir = directory / "bin"
+    bin_dir.mkdir()
+    stub = bin_dir / "playerctl"
+    stub.write_text(FAKE_PLAYERCTL, encoding="utf-8")
+    stub.chmod(0o755)
+    return bin_dir
+
+
+def run_fake_mpris() -> None:
+    """在当前会话总线上运行一个由标准输入事件驱动的假 MPRIS 播放器。
+
+    Args:
+        无。
+    Returns:
+        None: 无返回值。
+    """
+    import asyncio
+
+    from dbus_next import PropertyAccess, Variant
+    from dbus_next.aio import MessageBus
+    from dbus_next.service import ServiceInterface, dbus_property, signal as dbus_signal
+
+    class FakePlayer(ServiceInterface):
+        """按基准脚本切换状态的 MPRIS 播放器接口。"""
+
+        def __init__(self) -> None:
+            """初始化播放器状态。
+
+            Args:
+                无。
+            Returns:
+                None: 无返回值。
+            """
+            super().__init__("org.mpris.MediaPlayer2.Player")
+            self.model = {"title": "", "status": "Stopped", "position": 0.0, "anchor": time.time()}
+
+        def metadata(self) -> dict[str, Variant]:
+            """生成当前曲目的 MPRIS 元数据。
+
+            Args:
+                无。
+            Returns:
+                dict[str, Variant]: 元数据。
+            """
+            return {
+                "mpris:trackid": Variant("o", "/org/mpris/MediaPlayer2/Track/bench"),
+                "xesam:title": Variant("s", self.model["title"]),
+                "xesam:artist": Variant("as", [BENCH_ARTIST]),
+                "xesam:album": Variant("s", BENCH_ALBUM),
+                "mpris:length": Variant("x", int(BENCH_TRACK_LENGTH_SECONDS * 1_000_000)),
+            }
+
+        @dbus_property(access=PropertyAccess.READ)
+        def PlaybackStatus(self) -> "s":
+            """MPRIS 播放状态属性。"""
+            return self.model["status"]
+
+        @dbus_property(access=PropertyAccess.READ)
+        def Metadata(self) -> "a{sv}":
+            """MPRIS 元数据属性。"""
+            return self.metadata()
+
+        @dbus_property(access=PropertyAccess.READ)
+        def Position(self) -> "x":
+            """MPRIS 进度属性，单位为微秒。"""
+            position = self.model["position"]
+            if self.model["status"] == "Playing":
+                position += time.time() - self.model["anchor"]
+            return int(position * 1_000_000)
+
+        @dbus_property(access=PropertyAccess.READ)
+        def Rate(self) -> "d":
+            """MPRIS 播放速率属性。"""
+            return 1.0
+
+        @dbus_signal()
+        def Seeked(self, position: int) -> "x":
+            """MPRIS 跳转信号。"""
+            return position
+
+        def apply(self, event: dict[str, Any]) -> None:
+            """应用脚本事件并发出对应的 D-Bus 信号。
+
+            Args:
+                event: 脚本事件。
+            Returns:
+                None: 无返回值。
+            """
+            apply_bench_event(self.model, event)
+            if event["action"] == "seek":
+                self.Seeked(int(self.model["position"] * 1_000_000))
+                return
+            self.emit_properties_changed({"PlaybackStatus": self.model["status"], "Metadata": self.metadata()})
+
+    async def serve() -> None:
+        """注册播放器并逐行处理标准输入中的事件。
+
+        Args:
+            无。
+        Returns:
+            None: 无返回值。
+        """
+        bus = await MessageBus().connect()
+        player = FakePlayer()
+        bus.export("/org/mpris/MediaPlayer2", player)
+        await bus.request_name(f"org.mpris.MediaPlayer2.{BENCH_PLAYER}")
+        print("ready", flush=True)
+        while True:
+            line = await asyncio.to_thread(sys.stdin.readline)
+            if not line:
+                break
+            event = json.loads(line)
+            if event["action"] == "quit":
+                break
+            player.apply(event)
+        bus.disconnect()
+
+    asyncio.run(serve())
+
+
+def process_cpu_seconds(pid: int) -> tuple[float, float]:
+    """读取进程自身和已回收子进程消耗的 CPU 时间。
+
+    Args:
+        pid: 进程 ID。
+    Returns:
+        tuple[float, float]: 自身 CPU 秒数和子进程 CPU 秒数。
+    """
+    fields = Path(f"/proc/{pid}/stat").read_text(encoding="utf-8").rsplit(")", 1)[1].split()
+    ticks = os.sysconf("SC_CLK_TCK")
+    return (int(fields[11]) + int(fields[12])) / ticks, (int(fields[13]) + int(fields[14])) / ticks
+
+
+class LyricLagRecorder:
+    """订阅后台推送，记录歌词行自然切换时相对歌词时间戳的延迟。"""
+
+    def __init__(self, lines: list[dict[str, Any]]) -> None:
+        """初始化记录器。
+
+        Args:
+            lines: 所有基准曲目共用的同步歌词。
+        Returns:
+            None: 无返回值。
+        """
+        self.lines = lines
+        self.lags_ms: list[float] = []
+        self.messages = 0
+        self.ready = threading.Event()
+        self.client: socket.socket | None = None
+        self.thread: threading.Thread | None = None
+
+    def start(self, path: Path, timeout: float) -> bool:
+        """连接订阅套接字并在后台线程读取推送。
+
+        Args:
+            path: 订阅套接字路径。
+            timeout: 等待后台脚本就绪的最长时间，单位为秒。
+        Returns:
+            bool: 收到首个全量快照时返回 True。
+        """
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            client = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            try:
+                client.connect(str(path))
+            except OSError:
+                client.close()
+                time.sleep(0.05)
+                continue
+            self.client = client
+            self.thread = threading.Thread(target=self.read, daemon=True)
+            self.thread.start()
+            return self.ready.wait(max(deadline - time.monotonic(), 0))
+        return False
+
+    def read(self) -> None:
+        """逐行读取推送并计算歌词行切换延迟。
+
+        Args:
+            无。
+        Returns:
+            None: 无返回值。
+        """
+        assert self.client is not None
+        anchor: dict[str, Any] | None = None
+        playing = False
+        last_index = -1
+        with contextlib.suppress(OSError, ValueError), self.client.makefile("r", encoding="utf-8") as stream:
+            for line in stream:
+                received_at = time.monotonic()
+                message = json.loads(line)
+                self.messages += 1
+                self.ready.set()
+                state = message.get("state") or message
+                playback = state.get("playback") or {}
+                if playback:
+                    # 【媒体组件】【基准测试】切歌、跳转和暂停导致的行变化不是自然切换，不计入延迟
+                    anchor = playback.get("anchor")
+                    playing = bool(playback.get("playing"))
+                    last_index = -1
+                if message.get("type") != "lyrics_line":
+                    continue
+
+                index = int(message.get("index", -1))
+                if anchor and playing and last_index >= 0 and index == last_index + 1:
+                    position = anchor["position"] + (received_at - anchor["monotonic"]) * anchor.get("rate", 1.0)
+                    self.lags_ms.append((position - self.lines[index]["time"]) * 1000)
+                last_index = index
+
+    def close(self) -> None:
+        """断开订阅连接。
+
+        Args:
+            无。
+        Returns:
+            None: 无返回值。
+        """
+        if self.client is not None:
+            with contextlib.suppress(OSError, ValueError):
+                self.client.shutdown(socket.SHUT_RDWR)
+            self.client.close()
+        if self.thread is not None:
+            self.thread.join(timeout=2)
+
+
+def start_private_bus(env: dict[str, str]) -> subprocess.Popen[str]:
+    """启动私有会话总线，并把地址写入环境变量。
+
+    Args:
+        env: 后续子进程使用的环境变量，会被原地更新。
+    Returns:
+        subprocess.Popen[str]: dbus-daemon 进程。
+    """
+    bus = subprocess.Popen(
+        ["dbus-daemon", "--session", "--nofork", "--print-address"],
+        stdout=subprocess.PIPE,
+        stderr=subprocess.DEVNULL,
+        text=True,
+        env=env,
+    )
+    assert bus.stdout is not None
+    env["DBUS_SESSION_BUS_ADDRESS"] = bus.stdout.readline().strip()
+    return bus
+
+
+def bench_daemon(backend: str, duration: float, track_seconds: float) -> dict[str, Any]:
+    """在隔离环境中运行后台脚本，用假播放器驱动脚本并统计开销。
+
+    Args:
+        backend: 数据源，dbus 使用私有会话总线和假 MPRIS 播放器，playerctl 使用假 playerctl。
+        duration: 播放脚本时长，单位为秒。
+        track_seconds: 每首曲目的播放时长，单位为秒。
+    Returns:
+        dict[str, Any]: 基准测试结果。
+    """
+    required = "dbus-daemon" if backend == "dbus" else "date"
+    if shutil.which(required) is None:
+        return {"success": False, "error": f"{required} not found"}
+
+    timeline = bench_timeline(duration, track_seconds)
+    lines = [
+        {"time": round(index * BENCH_LINE_SPACING_SECONDS, 2), "text": f"第 {index + 1} 行"}
+        for index in range(int(BENCH_TRACK_LENGTH_SECONDS / BENCH_LINE_SPACING_SECONDS))
+    ]
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        temp_path = Path(temp_dir)
+        env = dict(os.environ)
+        env.update({"XDG_RUNTIME_DIR": str(temp_path / "run"), "XDG_CACHE_HOME": str(temp_path / "cache")})
+        (temp_path / "run").mkdir(mode=0o700)
+        os.environ.update({"XDG_RUNTIME_DIR": env["XDG_RUNTIME_DIR"], "XDG_CACHE_HOME": env["XDG_CACHE_HOME"]})
+
+        # 【媒体组件】【基准测试】1. 预先写入歌词缓存，后台脚本不访问网络
+        for _, event in timeline:
+            if event["action"] == "track":
+                lyrics_fetcher.save_cached_lyrics(
+                    event["title"], BENCH_ARTIST, BENCH_ALBUM, BENCH_TRACK_LENGTH_SECONDS, BENCH_PLAYER,
+                    {"success": True, "synced": True, "lines": lines, "source": "bench"},
+                )
+
+        # 【媒体组件】【基准测试】2. 准备数据源：私有总线加假 MPRIS 播放器，或 PATH 中的假 playerctl
+        player = {"title": "", "status": "Stopped", "position": 0.0, "anchor": time.time()}
+        helpers: list[subprocess.Popen[str]] = []
+        fake_mpris: subprocess.Popen[str] | None = None
+        state_file = temp_path / "playerctl-state"
+        if backend == "dbus":
+            helpers.append(start_private_bus(env))
+            fake_mpris = subprocess.Popen(
+                [sys.executable, os.path.abspath(__file__), "fake-mpris"],
+                stdin=subprocess.PIPE,
+                stdout=subprocess.PIPE,
+                text=True,
+                env=env,
+            )
+            helpers.append(fake_mpris)
+            assert fake_mpris.stdout is not None
+            if fake_mpris.stdout.readline().strip() != "ready":
+                return {"success": False, "error": "fake MPRIS player failed to start"}
+        else:
+            bin_dir = install_fake_playerctl(temp_path)
+            write_fake_playerctl_state(state_file, [player])
+            env.update({"PATH": f"{bin_dir}{os.pathsep}{env.get('PATH', '')}", "QS_MEDIA_BACKEND": "playerctl"})
+            env["QS_MEDIA_BENCH_STATE"] = str(state_file)
+
+        def apply(event: dict[str, Any]) -> None:
+            """把事件发给当前数据源的假播放器。
+
+            Args:
+                event: 脚本事件。
+            Returns:
+                None: 无返回值。
+            """
+            apply_bench_event(player, event)
+            if fake_mpris is not None:
+                assert fake_mpris.stdin is not None
+                fake_mpris.stdin.write(json.dumps(event) + "\n")
+                fake_mpris.stdin.flush()
+            else:
+                write_fake_playerctl_state(state_file, [player])
+
+        # 【媒体组件】【基准测试】3. 启动后台脚本并订阅推送，启动开销单独统计
+        script = os.path.join(os.path.dirname(os.path.abspath(__file__)), "media_state.py")
+        daemon = subprocess.Popen(
+            [sys.executable, script, "daemon"],
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+            env=env,
+        )
+        recorder = LyricLagRecorder(lines)
+        try:
+            if not recorder.start(temp_path / "run" / "quickshell" / "media-state.sock", BENCH_STARTUP_TIMEOUT_SECONDS):
+                return {"success": False, "error": "media daemon did not start"}
+            started_cpu, started_children_cpu = process_cpu_seconds(daemon.pid)
+            started_stats = media_state.query_live_stats() or {}
+
+            # 【媒体组件】【基准测试】4. 按时间表驱动假播放器，结束时播放器退出
+            started_at = time.monotonic()
+            for at, event in timeline:
+                time.sleep(max(started_at + at - time.monotonic(), 0))
+                apply(event)
+            time.sleep(max(started_at + duration - time.monotonic(), 0))
+            elapsed = time.monotonic() - started_at
+
+            stats = media_state.query_live_stats() or {}
+            cpu, children_cpu = process_cpu_seconds(daemon.pid)
+        finally:
+            recorder.close()
+            with contextlib.suppress(OSError, ValueError):
+                apply({"action": "quit"})
+            daemon.send_signal(signal.SIGTERM)
+            try:
+                daemon.wait(timeout=5)
+            except subprocess.TimeoutExpired:
+                daemon.kill()
+            for helper in reversed(helpers):
+                helper.terminate()
+                helper.wait(timeout=5)
+
+    metrics = stats.get("metrics") or {}
+    started_metrics = started_stats.get("metrics") or {}
+    ticks = (metrics.get("latency", {}).get("tick") or {}).get("count", 0)
+    ticks -= (started_metrics.get("latency", {}).get("tick") or {}).get("count", 0)
+    minutes = elapsed / 60
+    lags = recorder.lags_ms
+    return {
+        "success": True,
+        "backend": backend,
+        "duration_seconds": round(elapsed, 2),
+        "events": len(timeline),
+        "ticks": ticks,
+        "ticks_per_second": round(ticks / elapsed, 3),
+        "startup_cpu_seconds": round(started_cpu, 3),
+        "cpu_seconds_per_minute": round((cpu - started_cpu) / minutes, 3),
+        "children_cpu_seconds_per_minute": round((children_cpu - started_children_cpu) / minutes, 3),
+        "writes": int(stats.get("writes", 0)) - int(started_stats.get("writes", 0)),
+        "skipped_writes": int(stats.get("skipped_writes", 0)) - int(started_stats.get("skipped_writes", 0)),
+        "counters": metrics.get("counters", {}),
+        "pushed_messages": recorder.messages,
+        "lyric_switches": len(lags),
+        "lyric_lag_ms_p50": round(percentile(lags, 0.5), 2),
+        "lyric_lag_ms_p95": round(percentile(lags, 0.95), 2),
+        "lyric_lag_ms_max": round(max(lags), 2) if lags else 0,
+    }
+
+
+def parse_args() -> argparse.Namespace:
+    """解析命令行参数。
+
+    Args:
+        无。
+    Returns:
+        argparse.Namespace: 命令行参数对象。
+    """
+    parser = argparse.ArgumentParser(description="QuickShell media benchmarks")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    playerctl_parser = subparsers.add_parser("playerctl", help="对比 playerctl 逐字段与批量查询")
+    playerctl_parser.add_argument("--ticks", type=int, default=40, help="每种模式执行次数")
+
+    writes_parser = subparsers.add_parser("state-writes", help="比较状态文件写入策略的写入字节数")
+    writes_parser.add_argument("--tracks", type=int, default=17, help="模拟曲目数量，默认约为一小时")
+    writes_parser.add_argument("--lines", type=int, default=80, help="每首歌词行数")
+    writes_parser.add_argument("--ticks-per-track", type=int, default=420, help="每首曲目的轮询次数")
+
+    lookup_parser = subparsers.add_parser("lyrics-lookup", help="比较逐行扫描与索引查找当前歌词行的耗时")
+    lookup_parser.add_argument("--lines", type=int, default=1500, help="歌词行数")
+    lookup_parser.add_argument("--queries", type=int, default=20000, help="每种场景的查找次数")
+
+    fetch_parser = subparsers.add_parser("lyrics-fetch", help="用本地假歌词服务对比新建客户端、连接池和并发请求的冷启动歌词耗时")
+    fetch_parser.add_argument("--tracks", type=int, default=20, help="每种模式请求的曲目数量")
+    fetch_parser.add_argument("--handshake-ms", type=float, default=60, help="模拟的新连接握手耗时，单位为毫秒")
+    fetch_parser.add_argument("--rtt-ms", type=float, default=20, help="模拟的请求往返耗时，单位为毫秒")
+
+    keys_parser = subparsers.add_parser("cache-keys", help="比较原样缓存键与规范化缓存键在播放列表上的命中率")
+    keys_parser.add_argument("--playlist", default="", help="CSV 播放列表，每行为标题、艺术家、专辑；默认使用内置样例")
+
+    daemon_parser = subparsers.add_parser("daemon", help="用假播放器驱动后台脚本，统计 CPU、写入次数和歌词切换延迟")
+    daemon_parser.add_argument("--backend", choices=["dbus", "playerctl"], default="dbus", help="数据源")
+    daemon_parser.add_argument("--duration", type=float, default=60, help="播放脚本时长，单位为秒")
+    daemon_parser.add_argument("--track-seconds", type=float, default=20, help="每首曲目的播放时长，单位为秒")
+
+    subparsers.add_parser("fake-mpris", help="运行由标准输入驱动的假 MPRIS 播放器，供 daemon 基准内部使用")
+
+    startup_parser = subparsers.add_parser("startup", help="统计 snapshot 等短命令的启动与导入耗时")
+    startup_parser.add_argument("--runs", type=int, default=15, help="每个子命令执行次数")
+    startup_parser.add_argument("commands", nargs="*", default=["snapshot", "ensure-daemon", "stats"], help="需要测量的子命令")
+    return parser.parse_args()
+
+
+def main() -> None:
+    """执行命令行入口。
+
+    Args:
+        无。
+    Returns:
+        None: 无返回值。
+    """
+    args = parse_args()
+    if args.command == "playerctl":
+        print(json.dumps(bench_playerctl(args.ticks), ensure_ascii=False, indent=2))
+        return
+
+    if args.command == "state-writes":
+        result = bench_state_writes(args.tracks, args.lines, args.ticks_per_track)
+        print(json.dumps(result, ensure_ascii=False, indent=2))
+        return
+
+    if args.command == "lyrics-lookup":
+        print(json.dumps(bench_lyrics_lookup(args.lines, args.queries), ensure_ascii=False, indent=2))
+        return
+
+    if args.command == "lyrics-fetch":
+        print(json.dumps(bench_lyrics_fetch(args.tracks, args.handshake_ms, args.rtt_ms), ensure_ascii=False, indent=2))
+        return
+
+    if args.command == "cache-keys":
+        print(json.dumps(bench_cache_keys(args.playlist), ensure_ascii=False, indent=2))
+        return
+
+    if args.command == "daemon":
+        print(json.dumps(bench_daemon(args.backend, args.duration, args.track_seconds), ensure_ascii=False, indent=2))
+        return
+
+    if args.command == "fake-mpris":
+        run_fake_mpris()
+        return
+
+    if args.command == "startup":
+        print(json.dumps(bench_startup(args.commands, args.runs), ensure_ascii=False, indent=2))
+        return
+
+
+if __name__ == "__main__":
+    main()
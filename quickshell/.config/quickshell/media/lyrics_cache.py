@@ -0,0 +1,472 @@
+#!/usr/bin/env python3
+"""歌词缓存存储：单个 SQLite 文件保存所有歌词结果，按条目数和字节数上限做 LRU 淘汰。"""
+
+from __future__ import annotations
+
+import contextlib
+import json
+import os
+import threading
+import time
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+import media_metrics
+
+if TYPE_CHECKING:
+    import sqlite3
+
+
+LYRICS_CACHE_TTL_SECONDS = 60 * 60 * 24 * 30
+# 【媒体组件】【歌词缓存】未找到歌词的曲目按 6 小时起步、每次翻倍缓存，最长一周，之后重新确认是否有人上传
+LYRICS_MISS_TTL_SECONDS = 60 * 60 * 6
+LYRICS_MISS_TTL_MAX_SECONDS = 60 * 60 * 24 * 7
+# 【媒体组件】【歌词缓存】超时和服务端错误只短暂缓存，按 1 分钟起步翻倍，最长 30 分钟
+LYRICS_ERROR_TTL_SECONDS = 60
+LYRICS_ERROR_TTL_MAX_SECONDS = 60 * 30
+LYRICS_CACHE_SCHEMA_VERSION = 3
+DEFAULT_MAX_ENTRIES = 5000
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+# 【媒体组件】【歌词缓存】淘汰时多删一部分，避免缓存贴着上限时每次写入都触发淘汰
+EVICT_HEADROOM_RATIO = 0.9
+
+connection_lock = threading.Lock()
+connections: dict[str, sqlite3.Connection] = {}
+
+
+def cache_base_dir() -> Path:
+    """获取 QuickShell 缓存目录。
+
+    Args:
+        无。
+    Returns:
+        Path: 缓存目录。
+    """
+    base_dir = Path(os.environ.get("XDG_CACHE_HOME", Path.home() / ".cache")) / "quickshell"
+    base_dir.mkdir(parents=True, exist_ok=True)
+    return base_dir
+
+
+def cache_db_path() -> Path:
+    """获取歌词缓存数据库路径。
+
+    Args:
+        无。
+    Returns:
+        Path: 数据库文件路径。
+    """
+    return cache_base_dir() / "lyrics-cache.sqlite3"
+
+
+def legacy_cache_dir() -> Path:
+    """获取旧版每首一个 JSON 文件的歌词缓存目录。
+
+    Args:
+        无。
+    Returns:
+        Path: 旧版缓存目录。
+    """
+    return cache_base_dir() / "media-lyrics"
+
+
+def env_limit(name: str, default: int) -> int:
+    """读取环境变量中的缓存上限。
+
+    Args:
+        name: 环境变量名。
+        default: 未设置或格式错误时的默认值。
+    Returns:
+        int: 上限值；小于等于 0 表示不限制。
+    """
+    try:
+        return int(os.environ.get(name, default))
+    except ValueError:
+        return default
+
+
+def max_entries() -> int:
+    """获取缓存条目数上限。
+
+    Args:
+        无。
+    Returns:
+        int: 条目数上限，可通过 QS_MEDIA_LYRICS_CACHE_MAX_ENTRIES 配置。
+    """
+    return env_limit("QS_MEDIA_LYRICS_CACHE_MAX_ENTRIES", DEFAULT_MAX_ENTRIES)
+
+
+def max_bytes() -> int:
+    """获取缓存字节数上限。
+
+    Args:
+        无。
+    Returns:
+        int: 字节数上限，可通过 QS_MEDIA_LYRICS_CACHE_MAX_BYTES 配置。
+    """
+    return env_limit("QS_MEDIA_LYRICS_CACHE_MAX_BYTES", DEFAULT_MAX_BYTES)
+
+
+def connect() -> sqlite3.Connection:
+    """打开歌词缓存数据库，首次打开时建表并迁移旧版缓存文件。
+
+    Args:
+        无。
+    Returns:
+        sqlite3.Connection: 数据库连接；同一进程内复用，调用方需持有 connection_lock。
+    """
+    path = str(cache_db_path())
+    connection = connections.get(path)
+    if connection is not None:
+        return connection
+
+    # 传入歌词数组的 line 命令不读缓存，sqlite3 到第一次打开数据库时才导入
+    import sqlite3
+
+    # 【媒体组件】【歌词缓存】1. 后台脚本在多个线程中获取歌词，连接由 connection_lock 串行化
+    connection = sqlite3.connect(path, timeout=5, check_same_thread=False, isolation_level=None)
+    connection.execute("PRAGMA journal_mode=WAL")
+    connection.execute("PRAGMA synchronous=NORMAL")
+    schema_version = connection.execute("PRAGMA user_version").fetchone()[0]
+    if schema_version < LYRICS_CACHE_SCHEMA_VERSION:
+        migrate_schema(connection, schema_version)
+    connections[path] = connection
+
+    # 【媒体组件】【歌词缓存】2. 旧版缓存目录存在时一次性导入并删除小文件
+    if legacy_cache_dir().is_dir():
+        migrate_legacy_files(connection)
+    return connection
+
+
+def migrate_schema(connection: sqlite3.Connection, schema_version: int) -> None:
+    """创建或升级缓存表结构。
+
+    Args:
+        connection: 数据库连接。
+        schema_version: 数据库当前的结构版本，0 表示新建。
+    Returns:
+        None: 无返回值。
+    """
+    script = ""
+    if schema_version < 1:
+        script += """
+            CREATE TABLE IF NOT EXISTS lyrics (
+                key TEXT PRIMARY KEY,
+                cached_at REAL NOT NULL,
+                accessed_at REAL NOT NULL,
+                size INTEGER NOT NULL,
+                result TEXT NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS lyrics_accessed_at ON lyrics (accessed_at);
+        """
+    if schema_version < 2:
+        # 【媒体组件】【歌词缓存】版本 2 按条目记录过期时间和连续未命中次数，用于缓存未找到歌词的结果
+        script += f"""
+            ALTER TABLE lyrics ADD COLUMN expires_at REAL NOT NULL DEFAULT 0;
+            ALTER TABLE lyrics ADD COLUMN misses INTEGER NOT NULL DEFAULT 0;
+            UPDATE lyrics SET expires_at = cached_at + {LYRICS_CACHE_TTL_SECONDS};
+            DROP INDEX IF EXISTS lyrics_cached_at;
+            CREATE INDEX IF NOT EXISTS lyrics_expires_at ON lyrics (expires_at);
+        """
+    if schema_version < 3:
+        # 【媒体组件】【歌词缓存】版本 3 增加别名表，不同写法的曲目元数据指向同一条缓存
+        script += """
+            CREATE TABLE IF NOT EXISTS aliases (
+                alias TEXT PRIMARY KEY,
+                key TEXT NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS aliases_key ON aliases (key);
+        """
+    connection.executescript(f"BEGIN;{script}PRAGMA user_version = {LYRICS_CACHE_SCHEMA_VERSION};COMMIT;")
+
+
+def migrate_legacy_files(connection: sqlite3.Connection) -> int:
+    """把旧版 JSON 缓存文件导入数据库并删除。
+
+    Args:
+        connection: 数据库连接。
+    Returns:
+        int: 导入的条目数量。
+    """
+    legacy_dir = legacy_cache_dir()
+    now = time.time()
+    rows = []
+    files = []
+    for path in legacy_dir.iterdir():
+        if not path.is_file():
+            continue
+        files.append(path)
+        if path.suffix != ".json":
+            continue
+        try:
+            payload = json.loads(path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            continue
+        if not isinstance(payload, dict) or not isinstance(payload.get("result"), dict):
+            continue
+        cached_at = float(payload.get("cached_at", 0) or 0)
+        if now - cached_at > LYRICS_CACHE_TTL_SECONDS or not payload["result"].get("success"):
+            continue
+        text = json.dumps(payload["result"], ensure_ascii=False)
+        rows.append((path.stem, cached_at, cached_at, len(text.encode("utf-8")), text, cached_at + LYRICS_CACHE_TTL_SECONDS, 0))
+
+    connection.execute("BEGIN")
+    connection.executemany("INSERT OR IGNORE INTO lyrics VALUES (?, ?, ?, ?, ?, ?, ?)", rows)
+    connection.execute("COMMIT")
+    for path in files:
+        path.unlink(missing_ok=True)
+    with contextlib.suppress(OSError):
+        legacy_dir.rmdir()
+    evict(connection)
+    return len(rows)
+
+
+def get(key: str) -> dict[str, Any] | None:
+    """按缓存键读取歌词结果，键本身没有条目时再查别名表，同时刷新最近访问时间。
+
+    Args:
+        key: 缓存键。
+    Returns:
+        dict[str, Any] | None: 歌词结果，未命中记录的 success 为 False；未缓存或已过期时返回 None。
+    """
+    now = time.time()
+    with connection_lock:
+        connection = connect()
+        row = connection.execute("SELECT expires_at, misses, result FROM lyrics WHERE key = ?", (key,)).fetchone()
+        if row is None:
+            target = connection.execute("SELECT key FROM aliases WHERE alias = ?", (key,)).fetchone()
+            if target is None:
+                return None
+            key = target[0]
+            row = connection.execute("SELECT expires_at, misses, result FROM lyrics WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                return None
+            media_metrics.count("lyrics_cache_alias_hit")
+        expires_at, misses, text = row
+        if now >= expires_at:
+            # 【媒体组件】【歌词缓存】过期的未命中记录保留下来，下次未命中时据此延长缓存时间
+            if not misses:
+                connection.execute("DELETE FROM lyrics WHERE key = ?", (key,))
+            return None
+        connection.execute("UPDATE lyrics SET accessed_at = ? WHERE key = ?", (now, key))
+
+    try:
+        result = json.loads(text)
+    except ValueError:
+        return None
+    return result if isinstance(result, dict) else None
+
+
+def put(key: str, result: dict[str, Any], aliases: list[str] | None = None) -> None:
+    """写入歌词结果，超过上限时淘汰最久未访问的条目。
+
+    Args:
+        key: 缓存键。
+        result: 歌词结果。
+        aliases: 指向该条目的其他缓存键。
+    Returns:
+        None: 无返回值。
+    """
+    now = time.time()
+    text = json.dumps(result, ensure_ascii=False)
+    with connection_lock:
+        connection = connect()
+        connection.execute(
+            "INSERT OR REPLACE INTO lyrics VALUES (?, ?, ?, ?, ?, ?, ?)",
+            (key, now, now, len(text.encode("utf-8")), text, now + LYRICS_CACHE_TTL_SECONDS, 0),
+        )
+        add_aliases(connection, key, aliases or [])
+        evict(connection)
+
+
+def add_aliases(connection: sqlite3.Connection, key: str, aliases: list[str]) -> None:
+    """登记指向缓存条目的别名，并删除别名自身残留的条目。
+
+    Args:
+        connection: 数据库连接。
+        key: 缓存条目的键。
+        aliases: 别名列表。
+    Returns:
+        None: 无返回值。
+    """
+    aliases = [alias for alias in aliases if alias and alias != key]
+    if not aliases:
+        return
+    connection.executemany("INSERT OR REPLACE INTO aliases VALUES (?, ?)", [(alias, key) for alias in aliases])
+    # 【媒体组件】【歌词缓存】别名上的条目会优先于别名生效，无论是未命中记录还是不区分时长的旧条目，都以新写入的结果为准
+    connection.executemany("DELETE FROM lyrics WHERE key = ?", [(alias,) for alias in aliases])
+
+
+def alias(alias_key: str, key: str) -> None:
+    """把缓存键登记为已有条目的别名。
+
+    Args:
+        alias_key: 别名缓存键。
+        key: 已有条目的缓存键。
+    Returns:
+        None: 无返回值。
+    """
+    with connection_lock:
+        add_aliases(connect(), key, [alias_key])
+
+
+def miss_ttl(misses: int, permanent: bool) -> float:
+    """计算连续未命中后的缓存时间。
+
+    Args:
+        misses: 连续未命中次数，从 1 开始。
+        permanent: 是否为歌词库确认没有歌词；False 表示超时等临时错误。
+    Returns:
+        float: 缓存时间，单位为秒。
+    """
+    base, limit = (
+        (LYRICS_MISS_TTL_SECONDS, LYRICS_MISS_TTL_MAX_SECONDS)
+        if permanent
+        else (LYRICS_ERROR_TTL_SECONDS, LYRICS_ERROR_TTL_MAX_SECONDS)
+    )
+    return min(base * (2 ** min(misses - 1, 16)), limit)
+
+
+def put_miss(key: str, result: dict[str, Any], permanent: bool) -> dict[str, Any]:
+    """写入未获取到歌词的结果，同类结果连续出现时逐次延长缓存时间。
+
+    Args:
+        key: 缓存键。
+        result: 失败的歌词请求结果。
+        permanent: 是否为歌词库确认没有歌词；False 表示超时等临时错误。
+    Returns:
+        dict[str, Any]: 带有 miss 类型和 retry_at 重试时间的结果。
+    """
+    now = time.time()
+    kind = "permanent" if permanent else "transient"
+    with connection_lock:
+        connection = connect()
+        row = connection.execute("SELECT misses, result FROM lyrics WHERE key = ?", (key,)).fetchone()
+        misses = 1
+        if row is not None and row[0]:
+            try:
+                previous_kind = json.loads(row[1]).get("miss")
+            except (ValueError, AttributeError):
+                previous_kind = None
+            # 【媒体组件】【歌词缓存】临时错误和确认无歌词分别累计，类型切换时从头计算
+            if previous_kind == kind:
+                misses = row[0] + 1
+
+        expires_at = now + miss_ttl(misses, permanent)
+        result = {**result, "miss": kind, "misses": misses, "retry_at": round(expires_at, 3)}
+        text = json.dumps(result, ensure_ascii=False)
+        connection.execute(
+            "INSERT OR REPLACE INTO lyrics VALUES (?, ?, ?, ?, ?, ?, ?)",
+            (key, now, now, len(text.encode("utf-8")), text, expires_at, misses),
+        )
+        evict(connection)
+    media_metrics.count(f"lyrics_cache_{kind}_miss_stored")
+    return result
+
+
+def evict(connection: sqlite3.Connection) -> int:
+    """按条目数和字节数上限淘汰最久未访问的条目。
+
+    Args:
+        connection: 数据库连接。
+    Returns:
+        int: 淘汰的条目数量。
+    """
+    entries_limit = max_entries()
+    bytes_limit = max_bytes()
+    count, total = connection.execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM lyrics").fetchone()
+    over_entries = entries_limit > 0 and count > entries_limit
+    over_bytes = bytes_limit > 0 and total > bytes_limit
+    if not over_entries and not over_bytes:
+        return 0
+
+    target_entries = int(entries_limit * EVICT_HEADROOM_RATIO) if entries_limit > 0 else count
+    target_bytes = int(bytes_limit * EVICT_HEADROOM_RATIO) if bytes_limit > 0 else total
+    victims = []
+    for key, size in connection.execute("SELECT key, size FROM lyrics ORDER BY accessed_at"):
+        if count <= target_entries and total <= target_bytes:
+            break
+        victims.append((key,))
+        count -= 1
+        total -= size
+
+    connection.execute("BEGIN")
+    connection.executemany("DELETE FROM lyrics WHERE key = ?", victims)
+    connection.executemany("DELETE FROM aliases WHERE key = ?", victims)
+    connection.execute("COMMIT")
+    media_metrics.count("lyrics_cache_evictions", len(victims))
+    return len(victims)
+
+
+def sweep(connection: sqlite3.Connection) -> int:
+    """删除超过有效期的条目；未命中记录过期后再保留一个有效期，用于延长下次的缓存时间。
+
+    Args:
+        connection: 数据库连接。
+    Returns:
+        int: 删除的条目数量。
+    """
+    now = time.time()
+    cursor = connection.execute(
+        "DELETE FROM lyrics WHERE (misses = 0 AND expires_at < ?) OR (misses > 0 AND expires_at < ?)",
+        (now, now - LYRICS_CACHE_TTL_SECONDS),
+    )
+    removed = cursor.rowcount
+    connection.execute("DELETE FROM aliases WHERE key NOT IN (SELECT key FROM lyrics)")
+    return removed
+
+
+def stats() -> dict[str, Any]:
+    """统计缓存条目数、占用空间和过期条目。
+
+    Args:
+        无。
+    Returns:
+        dict[str, Any]: 缓存统计。
+    """
+    with connection_lock:
+        connection = connect()
+        count, total, oldest, newest = connection.execute(
+            "SELECT COUNT(*), COALESCE(SUM(size), 0), MIN(cached_at), MAX(cached_at) FROM lyrics"
+        ).fetchone()
+        expired, misses = connection.execute(
+            "SELECT COALESCE(SUM(expires_at < ?), 0), COALESCE(SUM(misses > 0), 0) FROM lyrics", (time.time(),)
+        ).fetchone()
+        aliases = connection.execute("SELECT COUNT(*) FROM aliases").fetchone()[0]
+
+    path = cache_db_path()
+    file_bytes = sum(
+        candidate.stat().st_size
+        for candidate in (path, path.with_name(path.name + "-wal"))
+        if candidate.exists()
+    )
+    return {
+        "success": True,
+        "path": str(path),
+        "entries": count,
+        "payload_bytes": total,
+        "file_bytes": file_bytes,
+        "expired_entries": expired,
+        "miss_entries": misses,
+        "aliases": aliases,
+        "oldest_cached_at": oldest or 0,
+        "newest_cached_at": newest or 0,
+        "max_entries": max_entries(),
+        "max_bytes": max_bytes(),
+    }
+
+
+def gc() -> dict[str, Any]:
+    """清理过期条目、按上限淘汰并压缩数据库文件。
+
+    Args:
+        无。
+    Returns:
+        dict[str, Any]: 清理结果和清理后的缓存统计。
+    """
+    with connection_lock:
+        connection = connect()
+        expired = sweep(connection)
+        evicted = evict(connection)
+        connection.execute("VACUUM")
+        connection.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+    return {**stats(), "expired_removed": expired, "evicted": evicted}
@@ -2,68 +2,150 @@
 """
 Lyrics fetcher for QuickShell media player.
 Supports:
-  1. MPRIS local lyrics (xesam:asText) - for musicfox, etc.
-  2. lrclib.net API - online fallback
+  1. Local .lrc files next to the audio - indexed by lyrics_local
+  2. MPRIS local lyrics (xesam:asText) - for musicfox, etc.
+  3. lrclib.net API - online fallback
 """
 
+import os
 import sys
 import json
 import re
+from array import array
+from bisect import bisect_left, bisect_right
+from collections import OrderedDict
 import subprocess
 import hashlib
-import os
+import importlib.util
+import threading
 import time
-from pathlib import Path
+from typing import TYPE_CHECKING, Any, Callable
 
-import httpx
+import lyrics_cache
+import lyrics_keys
+import lyrics_local
+import media_metrics
 
-LRCLIB_API = "https://lrclib.net/api"
-LYRICS_CACHE_TTL_SECONDS = 60 * 60 * 24 * 30
+if TYPE_CHECKING:
+    from concurrent.futures import ThreadPoolExecutor
 
+LRCLIB_API = "https://lrclib.net/api"
+LRCLIB_TIMEOUT_SECONDS = 10
+LRCLIB_CONNECT_TIMEOUT_SECONDS = 5
+# 【媒体组件】【歌词获取】后台脚本同时最多为几个播放器请求歌词，连接数不需要更多
+LRCLIB_MAX_CONNECTIONS = 4
+LRCLIB_MAX_KEEPALIVE_CONNECTIONS = 2
+# 【媒体组件】【歌词获取】空闲连接保留一首歌左右的时间；服务端先关闭时 httpx 会丢弃该连接重新建立
+LRCLIB_KEEPALIVE_EXPIRY_SECONDS = 300
+# 【媒体组件】【歌词获取】每首曲目同时请求 MPRIS、精确查询和搜索三个来源，允许两个播放器同时加载
+LYRICS_RACE_WORKERS = 6
+# 【媒体组件】【歌词缓存】与 lrclib.net 精确查询的时长容差相近，播放器报告的时长常有一两秒出入
+LYRICS_DURATION_TOLERANCE_SECONDS = 3
+LRCLIB_USER_AGENT = "quickshell-media-lyrics (https://github.com/jswysnemc/dotfiles)"
+LYRICS_INDEX_CACHE_SIZE = 8
+# LRC 正则与 lyrics_keys 一样只保存字符串，第一次解析歌词时由 re 模块编译并缓存
+LRC_TIME_PATTERN = r"\[(\d+):(\d{1,2})(?:[.:](\d{1,3}))?\]"
+LRC_WORD_PATTERN = r"<(\d+):(\d{1,2})(?:[.:](\d{1,3}))?>"
+LRC_OFFSET_PATTERN = r"(?i)\[offset:\s*([+-]?\d+)\s*\]"
+# 【媒体组件】【歌词翻译】翻译和音译歌词的时间与原文相差不超过该值时视为同一行
+LYRICS_ALIGN_TOLERANCE_SECONDS = 0.5
+LYRICS_EXTRA_TRACKS = ("translation", "romanization")
+
+http_client_lock = threading.Lock()
+http_clients: dict[str, Any] = {}
+# 【媒体组件】【歌词获取】批量预取时设置的限速函数，每次请求 lrclib.net 之前调用
+lrclib_throttle: Callable[[], None] | None = None
+lyrics_executor_lock = threading.Lock()
+lyrics_race_executor: "ThreadPoolExecutor | None" = None
+
+
+def lrclib_client() -> Any:
+    """获取复用连接的 lrclib.net HTTP 客户端。
 
-def lyrics_cache_dir() -> Path:
-    """获取歌词缓存目录。
+    Args:
+        无。
+    Returns:
+        httpx.Client: 同一进程内共享的客户端；安装了 h2 时启用 HTTP/2。
+    """
+    import httpx
+
+    with http_client_lock:
+        client = http_clients.get(LRCLIB_API)
+        if client is None:
+            # 【媒体组件】【歌词获取】切歌间隔通常在几分钟内，保持空闲连接可以省掉 /get 与 /search 各自的 TCP 和 TLS 握手
+            client = httpx.Client(
+                base_url=LRCLIB_API,
+                headers={"User-Agent": LRCLIB_USER_AGENT},
+                http2=importlib.util.find_spec("h2") is not None,
+                timeout=httpx.Timeout(LRCLIB_TIMEOUT_SECONDS, connect=LRCLIB_CONNECT_TIMEOUT_SECONDS),
+                limits=httpx.Limits(
+                    max_connections=LRCLIB_MAX_CONNECTIONS,
+                    max_keepalive_connections=LRCLIB_MAX_KEEPALIVE_CONNECTIONS,
+                    keepalive_expiry=LRCLIB_KEEPALIVE_EXPIRY_SECONDS,
+                ),
+            )
+            http_clients[LRCLIB_API] = client
+            media_metrics.count("lyrics_http_clients")
+        return client
+
+
+def close_lrclib_clients() -> None:
+    """关闭所有 lrclib.net HTTP 客户端及其空闲连接。
 
     Args:
         无。
     Returns:
-        Path: 歌词缓存目录。
+        None: 无返回值。
     """
-    base_dir = Path(os.environ.get("XDG_CACHE_HOME", Path.home() / ".cache"))
-    cache_dir = base_dir / "quickshell" / "media-lyrics"
-    cache_dir.mkdir(parents=True, exist_ok=True)
-    return cache_dir
+    with http_client_lock:
+        clients = list(http_clients.values())
+        http_clients.clear()
+    for client in clients:
+        client.close()
 
 
 def lyrics_cache_key(title: str, artist: str = "", album: str = "", duration: float = 0, player: str = "") -> str:
-    """生成歌词缓存键。
+    """生成规范化的歌词缓存键，重制版、合作艺术家、全角字符和艺术家顺序等写法差异都映射到同一个键。
 
     Args:
         title: 曲目标题。
         artist: 艺术家名称。
-        album: 专辑名称。
-        duration: 曲目时长，单位为秒；该参数保留用于兼容调用方。
+        album: 专辑名称；同一首歌常出现在多张专辑中，不参与缓存键。
+        duration: 曲目时长，单位为秒；已知时按档位参与缓存键，电台版和专辑版分开缓存。
         player: playerctl 播放器名称；该参数保留用于兼容调用方。
     Returns:
         str: 缓存键。
     """
-    raw_key = "||".join([title.strip(), artist.strip(), album.strip()])
-    return hashlib.sha256(raw_key.encode("utf-8")).hexdigest()
+    return lyrics_keys.track_key(title, artist, duration)
+
 
+def duration_matches(result: dict, duration: float) -> bool:
+    """判断缓存结果是否属于该时长的版本。
+
+    Args:
+        result: 缓存的歌词结果。
+        duration: 请求的曲目时长，单位为秒。
+    Returns:
+        bool: 请求时长未知，或结果记录的时长与请求相差不超过 LYRICS_DURATION_TOLERANCE_SECONDS 时返回 True。
+    """
+    if duration <= 0:
+        return True
+    cached_duration = float(result.get("duration") or 0)
+    return cached_duration > 0 and abs(cached_duration - duration) <= LYRICS_DURATION_TOLERANCE_SECONDS
 
-def lyrics_cache_path(title: str, artist: str = "", album: str = "", duration: float = 0, player: str = "") -> Path:
-    """获取歌词缓存文件路径。
+
+def legacy_lyrics_cache_key(title: str, artist: str = "", album: str = "") -> str:
+    """生成规范化之前使用的原样缓存键，用于读取旧缓存。
 
     Args:
         title: 曲目标题。
         artist: 艺术家名称。
         album: 专辑名称。
-        duration: 曲目时长，单位为秒。
-        player: playerctl 播放器名称。
     Returns:
-        Path: 缓存文件路径。
+        str: 旧版缓存键。
     """
-    return lyrics_cache_dir() / f"{lyrics_cache_key(title, artist, album, duration, player)}.json"
+    raw_key = "||".join([title.strip(), artist.strip(), album.strip()])
+    return hashlib.sha256(raw_key.encode("utf-8")).hexdigest()
 
 
 def load_cached_lyrics(title: str, artist: str = "", album: str = "", duration: float = 0, player: str = "") -> dict | None:
@@ -76,35 +158,37 @@ def load_cached_lyrics(title: str, artist: str = "", album: str = "", duration:
         duration: 曲目时长，单位为秒。
         player: playerctl 播放器名称。
     Returns:
-        dict | None: 缓存命中时返回歌词结果，否则返回 None。
+        dict | None: 缓存命中时返回歌词结果，未找到歌词的记录尚未过期时返回 success 为 False 的结果，否则返回 None。
     """
-    path = lyrics_cache_path(title, artist, album, duration, player)
-    if not path.exists():
-        return None
-
-    try:
-        with path.open("r", encoding="utf-8") as cache_file:
-            payload = json.load(cache_file)
-    except (OSError, json.JSONDecodeError):
-        return None
+    key = lyrics_cache_key(title, artist, album, duration, player)
+    result = lyrics_cache.get(key)
+    if not result and duration > 0:
+        # 【媒体组件】【歌词缓存】时长落在相邻档位时按不含时长的键查找，只采用时长接近的版本
+        result = lyrics_cache.get(lyrics_cache_key(title, artist))
+        if result and not duration_matches(result, duration):
+            result = None
+    if not result:
+        # 【媒体组件】【歌词缓存】旧版按原样元数据保存的条目命中后登记为别名，之后直接按规范化的键命中
+        legacy_key = legacy_lyrics_cache_key(title, artist, album)
+        result = lyrics_cache.get(legacy_key)
+        if not result or not result.get("success"):
+            return None
+        lyrics_cache.alias(key, legacy_key)
+        media_metrics.count("lyrics_cache_legacy_hit")
 
-    if not isinstance(payload, dict):
-        return None
-
-    cached_at = float(payload.get("cached_at", 0) or 0)
-    if time.time() - cached_at > LYRICS_CACHE_TTL_SECONDS:
-        return None
-
-    result = payload.get("result")
-    if not isinstance(result, dict) or not result.get("success"):
-        return None
-
-    result = dict(result)
     result["cached"] = True
     return result
 
 
-def save_cached_lyrics(title: str, artist: str, album: str, duration: float, player: str, result: dict) -> None:
+def save_cached_lyrics(
+    title: str,
+    artist: str,
+    album: str,
+    duration: float,
+    player: str,
+    result: dict,
+    record_key: str = "",
+) -> None:
     """保存歌词缓存。
 
     Args:
@@ -114,59 +198,255 @@ def save_cached_lyrics(title: str, artist: str, album: str, duration: float, pla
         duration: 曲目时长，单位为秒。
         player: playerctl 播放器名称。
         result: 歌词请求结果。
+        record_key: 歌词库返回的曲目记录对应的缓存键；与请求的键不同时按记录保存，请求的键登记为别名。
     Returns:
         None: 无返回值。
     """
     if not result.get("success"):
         return
 
-    path = lyrics_cache_path(title, artist, album, duration, player)
-    temp_path = path.with_suffix(".tmp")
-    payload = {
-        "cached_at": time.time(),
-        "result": result,
-    }
-    with temp_path.open("w", encoding="utf-8") as cache_file:
-        json.dump(payload, cache_file, ensure_ascii=False)
-    temp_path.replace(path)
+    key = lyrics_cache_key(title, artist, album, duration, player)
+    aliases = []
+    if duration > 0:
+        # 【媒体组件】【歌词缓存】记录版本时长，不含时长的键登记为别名，时长略有出入的播放器也能命中
+        result = {**result, "duration": result.get("duration") or duration}
+        aliases.append(lyrics_cache_key(title, artist))
+    if record_key and record_key != key:
+        # 【媒体组件】【歌词缓存】不同写法搜到同一条记录时共用一个条目，之后用记录本身的写法也能直接命中
+        lyrics_cache.put(record_key, result, [key, *aliases])
+    else:
+        lyrics_cache.put(key, result, aliases)
+
+
+def save_lyrics_miss(title: str, artist: str, album: str, duration: float, player: str, error: str, permanent: bool) -> dict:
+    """缓存未获取到歌词的结果，避免每次播放都重复请求歌词库。
+
+    Args:
+        title: 曲目标题。
+        artist: 艺术家名称。
+        album: 专辑名称。
+        duration: 曲目时长，单位为秒。
+        player: playerctl 播放器名称。
+        error: 错误信息。
+        permanent: 歌词库确认没有歌词时为 True；超时、服务端错误等临时错误为 False。
+    Returns:
+        dict: 带有 miss 类型和 retry_at 重试时间的失败结果。
+    """
+    key = lyrics_cache_key(title, artist, album, duration, player)
+    return lyrics_cache.put_miss(key, {"success": False, "error": error}, permanent)
+
+
+def is_transient_status(status_code: int) -> bool:
+    """判断 HTTP 状态码是否属于稍后重试可能成功的错误。
+
+    Args:
+        status_code: HTTP 状态码。
+    Returns:
+        bool: 限流和服务端错误返回 True。
+    """
+    return status_code == 429 or status_code >= 500
+
+
+def lrc_time(minutes: str, seconds: str, fraction: str | None) -> float:
+    """把 LRC 时间标签的各部分转换为秒数。
+
+    Args:
+        minutes: 分钟。
+        seconds: 秒。
+        fraction: 秒的小数部分，可以是一到三位数字或 None。
+    Returns:
+        float: 时间，单位为秒。
+    """
+    value = int(minutes) * 60 + int(seconds)
+    if fraction:
+        value += int(fraction) / 10 ** len(fraction)
+    return value
 
 
 def parse_lrc(lrc_content: str) -> list[dict]:
-    """Parse LRC format lyrics into list of {time, text} dicts."""
+    """逐行扫描 LRC 歌词，支持一行多个时间标签、[offset:] 和增强格式的 <mm:ss.xx> 逐字时间。
+
+    Args:
+        lrc_content: LRC 歌词文本。
+    Returns:
+        list[dict]: 按时间排序的歌词行，每行包含 time 和 text；带逐字时间的行另有 words 列表，
+            各项包含 time 和 text，依次拼接等于整行文本；行尾有空的时间标签时另有 end。
+    """
     if not lrc_content:
         return []
 
+    time_pattern = re.compile(LRC_TIME_PATTERN)
+    word_pattern = re.compile(LRC_WORD_PATTERN)
+    offset = 0.0
     lines = []
-    pattern = re.compile(r'\[(\d{2}):(\d{2})\.(\d{2,3})\](.*)$')
 
-    for line in lrc_content.split('\n'):
+    for line in lrc_content.splitlines():
         line = line.strip()
-        if not line:
+        if not line.startswith("["):
             continue
 
-        match = pattern.match(line)
-        if match:
-            minutes = int(match.group(1))
-            seconds = int(match.group(2))
-            ms_str = match.group(3)
-            if len(ms_str) == 2:
-                ms = int(ms_str) * 10
-            else:
-                ms = int(ms_str)
+        # 【媒体组件】【歌词解析】1. 读取行首的时间标签，同一句歌词可以在多个时间出现
+        stamps = []
+        pos = 0
+        while match := time_pattern.match(line, pos):
+            stamps.append(lrc_time(*match.groups()))
+            pos = match.end()
+        if not stamps:
+            tag = re.match(LRC_OFFSET_PATTERN, line)
+            if tag:
+                offset = int(tag.group(1)) / 1000
+            continue
 
-            time_sec = minutes * 60 + seconds + ms / 1000
-            text = match.group(4).strip()
+        # 【媒体组件】【歌词解析】2. 按 <mm:ss.xx> 切分逐字时间，第一个标签前的文字从行首时间开始
+        parts = word_pattern.split(line[pos:])
+        words = [[None, parts[0]]] if parts[0].strip() else []
+        end = None
+        for index in range(1, len(parts), 4):
+            word_time = lrc_time(parts[index], parts[index + 1], parts[index + 2])
+            segment = parts[index + 3]
+            if segment.strip():
+                words.append([word_time, segment])
+                end = None
+            else:
+                end = word_time
 
-            if text:
-                lines.append({
-                    "time": round(time_sec, 2),
-                    "text": text
-                })
+        text = "".join(segment for _, segment in words).strip()
+        if not text:
+            continue
+        if words:
+            words[0][1] = words[0][1].lstrip()
+            words[-1][1] = words[-1][1].rstrip()
+
+        for stamp in stamps:
+            entry: dict[str, Any] = {"time": stamp, "text": text}
+            if len(parts) > 1:
+                # 逐字时间按第一个时间标签书写，重复出现的句子整体平移
+                shift = stamp - stamps[0]
+                entry["words"] = [
+                    {"time": stamp if word_time is None else word_time + shift, "text": segment}
+                    for word_time, segment in words
+                ]
+                if end is not None:
+                    entry["end"] = end + shift
+            lines.append(entry)
+
+    # 【媒体组件】【歌词解析】3. [offset:] 为正时歌词提前显示；统一平移后保证每行的逐字时间不早于行首且不倒退
+    for entry in lines:
+        entry["time"] = round(max(entry["time"] - offset, 0), 2)
+        previous = entry["time"]
+        for word in entry.get("words", ()):
+            previous = max(round(word["time"] - offset, 2), previous)
+            word["time"] = previous
+        if "end" in entry:
+            entry["end"] = max(round(entry["end"] - offset, 2), previous)
 
     lines.sort(key=lambda x: x["time"])
     return lines
 
 
+def align_lyric_track(lines: list[dict], extra: list[dict], kind: str) -> None:
+    """把翻译或音译歌词按时间对齐到原文歌词行上。
+
+    Args:
+        lines: 按时间升序排列的原文歌词行，会被原地修改。
+        extra: 翻译或音译歌词行。
+        kind: 写入原文行的字段名，translation 或 romanization。
+    Returns:
+        None: 无返回值。
+    """
+    times = [line["time"] for line in lines]
+    for entry in extra:
+        # 【媒体组件】【歌词翻译】二分查找时间最接近的原文行，同一时间有多行时对齐到第一行，超出容差的行丢弃
+        position = bisect_left(times, entry["time"])
+        nearest = min(
+            (index for index in (position - 1, position) if 0 <= index < len(lines)),
+            key=lambda index: abs(times[index] - entry["time"]),
+            default=None,
+        )
+        if nearest is None or abs(times[nearest] - entry["time"]) > LYRICS_ALIGN_TOLERANCE_SECONDS:
+            continue
+        line = lines[nearest]
+        if entry["text"] != line["text"]:
+            line[kind] = f"{line[kind]} {entry['text']}" if kind in line else entry["text"]
+
+
+def parse_lyrics(
+    lrc_content: str,
+    translation: str = "",
+    romanization: str = "",
+    embedded_tracks: bool = True,
+) -> list[dict]:
+    """解析原文歌词并合并翻译和音译，写入缓存前一次完成对齐，显示时不再对齐。
+
+    Args:
+        lrc_content: 原文 LRC 歌词。
+        translation: 单独提供的翻译 LRC 歌词。
+        romanization: 单独提供的音译 LRC 歌词。
+        embedded_tracks: 是否把同一时间紧跟原文的第二、三行视为翻译和音译；更多的同时间行保留在列表中，定位当前行时仍选中原文行。
+    Returns:
+        list[dict]: 按时间排序的歌词行；有翻译或音译的行另有 translation 或 romanization 字段。
+    """
+    parsed = parse_lrc(lrc_content)
+    lines: list[dict] = []
+    embedded: dict[str, list[dict]] = {kind: [] for kind in LYRICS_EXTRA_TRACKS}
+    origin: dict | None = None
+    repeat = 0
+    for entry in parsed:
+        # 【媒体组件】【歌词翻译】1. 播放器和本地歌词常在原文之后用相同时间紧跟翻译行；合唱等更多的同时间行保留为普通行
+        if not embedded_tracks or origin is None or origin["time"] != entry["time"]:
+            lines.append(entry)
+            origin = entry
+            repeat = 0
+            continue
+        if entry["text"] == origin["text"]:
+            continue
+        if repeat < len(LYRICS_EXTRA_TRACKS):
+            embedded[LYRICS_EXTRA_TRACKS[repeat]].append(entry)
+        else:
+            lines.append(entry)
+        repeat += 1
+
+    # 【媒体组件】【歌词翻译】2. 单独提供的翻译或音译优先，没有时才使用内嵌的行
+    for kind, content in zip(LYRICS_EXTRA_TRACKS, (translation, romanization)):
+        extra = parse_lrc(content) if content else embedded[kind]
+        if extra:
+            align_lyric_track(lines, extra, kind)
+    return lines
+
+
+def fetch_local_lyrics(title: str, artist: str = "") -> dict | None:
+    """从本地歌词索引中查找并读取 .lrc 文件。
+
+    Args:
+        title: 曲目标题。
+        artist: 艺术家名称。
+    Returns:
+        dict | None: 找到歌词文件时返回歌词结果，否则返回 None。
+    """
+    with media_metrics.timed("lyrics_local"):
+        path = lyrics_local.find(title, artist)
+        if path is None:
+            return None
+        try:
+            content = path.read_text(encoding="utf-8", errors="replace").strip()
+        except OSError:
+            return None
+
+    if not content:
+        return None
+    media_metrics.count("lyrics_local_hit")
+    extra = {}
+    for kind, sidecar in lyrics_local.sidecars(path).items():
+        try:
+            extra[kind] = sidecar.read_text(encoding="utf-8", errors="replace")
+        except OSError:
+            continue
+    lines = parse_lyrics(content, **extra)
+    if lines:
+        return {"success": True, "synced": True, "lines": lines, "source": "local", "path": str(path)}
+    return {"success": True, "synced": False, "text": content, "source": "local", "path": str(path)}
+
+
 def fetch_mpris_lyrics(player: str = "") -> dict | None:
     """Fetch lyrics from MPRIS xesam:asText metadata (musicfox, etc.)."""
     try:
@@ -181,7 +461,7 @@ def fetch_mpris_lyrics(player: str = "") -> dict | None:
             lrc_content = result.stdout.strip()
             # Check if it looks like LRC format
             if "[" in lrc_content and "]" in lrc_content:
-                lines = parse_lrc(lrc_content)
+                lines = parse_lyrics(lrc_content)
                 if lines:
                     return {
                         "success": True,
@@ -194,8 +474,179 @@ def fetch_mpris_lyrics(player: str = "") -> dict | None:
         return None
 
 
-def fetch_lyrics(title: str, artist: str = "", album: str = "", duration: float = 0, player: str = "") -> dict:
-    """获取歌词，优先使用缓存和本地 MPRIS，再回退到 lrclib.net。
+def lrclib_record_result(data: Any) -> dict | None:
+    """把 lrclib.net 返回的曲目记录转换为歌词结果。
+
+    Args:
+        data: 曲目记录。
+    Returns:
+        dict | None: 记录中有同步或纯文本歌词时返回歌词结果，否则返回 None。
+    """
+    if not isinstance(data, dict):
+        return None
+
+    synced = data.get("syncedLyrics", "")
+    plain = data.get("plainLyrics", "")
+    if synced:
+        return {
+            "success": True,
+            "synced": True,
+            # lrclib.net 没有单独的翻译字段，同一时间的多行通常是合唱，不按翻译拆分
+            "lines": parse_lyrics(synced, embedded_tracks=False),
+            "source": "lrclib.net"
+        }
+    if plain:
+        return {
+            "success": True,
+            "synced": False,
+            "text": plain,
+            "source": "lrclib.net"
+        }
+    return None
+
+
+def query_lrclib(endpoint: str, params: dict) -> dict:
+    """请求 lrclib.net 的单个接口并归类结果。
+
+    Args:
+        endpoint: 接口名称，get 表示按曲目信息精确查询，search 表示关键字搜索。
+        params: 查询参数。
+    Returns:
+        dict: 来源结果；获取到歌词时包含 result，否则包含 error 和 permanent，final 为 True 表示不再参考优先级更低的来源。
+    """
+    import httpx
+
+    if lrclib_throttle is not None:
+        lrclib_throttle()
+    media_metrics.count("lyrics_network_requests")
+    try:
+        with media_metrics.timed(f"lyrics_lrclib_{endpoint}"):
+            response = lrclib_client().get(f"/{endpoint}", params=params)
+            if response.status_code == 404:
+                return {"error": "Lyrics not found", "permanent": True}
+            if response.status_code != 200:
+                return {"error": f"API error: {response.status_code}", "permanent": not is_transient_status(response.status_code)}
+            data = response.json()
+    except httpx.TimeoutException:
+        media_metrics.count("lyrics_network_errors")
+        return {"error": "Request timeout", "permanent": False}
+    except Exception as e:
+        media_metrics.count("lyrics_network_errors")
+        return {"error": str(e), "permanent": False}
+
+    if endpoint == "search":
+        data = data[0] if isinstance(data, list) and data else {}
+    result = lrclib_record_result(data)
+    if result:
+        record_title = data.get("trackName") or ""
+        record_duration = float(data.get("duration") or 0)
+        if record_duration > 0:
+            result["duration"] = record_duration
+        record_key = lyrics_keys.track_key(record_title, data.get("artistName") or "", record_duration) if record_title else ""
+        return {"result": result, "record_key": record_key}
+    if endpoint == "get":
+        # 【媒体组件】【歌词获取】精确查询命中但没有歌词通常是纯音乐，搜索结果不再可信
+        return {"error": "No lyrics in response", "permanent": True, "final": True}
+    return {"error": "Lyrics not found", "permanent": True}
+
+
+def mpris_source(player: str) -> dict:
+    """读取 MPRIS 本地歌词并归类结果。
+
+    Args:
+        player: playerctl 播放器名称。
+    Returns:
+        dict: 来源结果；没有本地歌词时 error 为空，不参与失败类型判断。
+    """
+    with media_metrics.timed("lyrics_mpris"):
+        result = fetch_mpris_lyrics(player)
+    if result:
+        media_metrics.count("lyrics_mpris_hit")
+        return {"result": result}
+    return {"error": ""}
+
+
+def lyrics_executor() -> "ThreadPoolExecutor":
+    """获取并发请求歌词来源的线程池。
+
+    Args:
+        无。
+    Returns:
+        ThreadPoolExecutor: 同一进程内共享的线程池。
+    """
+    global lyrics_race_executor
+    # concurrent.futures 会连带导入 logging，只在真正联网时导入
+    from concurrent.futures import ThreadPoolExecutor
+
+    with lyrics_executor_lock:
+        if lyrics_race_executor is None:
+            lyrics_race_executor = ThreadPoolExecutor(max_workers=LYRICS_RACE_WORKERS, thread_name_prefix="lyrics-source")
+        return lyrics_race_executor
+
+
+def shutdown_lyrics_executor() -> None:
+    """取消排队中的歌词来源请求，不等待已在执行的请求。
+
+    Args:
+        无。
+    Returns:
+        None: 无返回值。
+    """
+    global lyrics_race_executor
+    with lyrics_executor_lock:
+        if lyrics_race_executor is not None:
+            lyrics_race_executor.shutdown(wait=False, cancel_futures=True)
+            lyrics_race_executor = None
+
+
+def race_lyrics_sources(sources: list[tuple[str, Callable[[], dict]]]) -> tuple[str, dict]:
+    """并发请求多个歌词来源，按优先级选出结果并取消尚未开始的其他请求。
+
+    Args:
+        sources: 按优先级从高到低排列的来源名称和请求函数。
+    Returns:
+        tuple[str, dict]: 选中的来源名称和来源结果；所有来源都没有歌词时名称为空字符串，结果为合并后的失败信息。
+    """
+    from concurrent.futures import FIRST_COMPLETED, wait
+
+    executor = lyrics_executor()
+    futures = [executor.submit(request) for _, request in sources]
+    pending = set(futures)
+    try:
+        while True:
+            # 【媒体组件】【歌词获取】只有更高优先级的来源都已失败时才采用当前来源，第一个满足条件的结果立即返回
+            for (name, _), future in zip(sources, futures):
+                if not future.done():
+                    break
+                outcome = future.result()
+                if "result" in outcome or outcome.get("final"):
+                    media_metrics.count(f"lyrics_race_{name}")
+                    return name, outcome
+            else:
+                break
+            _, pending = wait(pending, return_when=FIRST_COMPLETED)
+    finally:
+        # 已在执行的 HTTP 请求无法中断，会在连接池上完成后被丢弃；尚未开始的请求直接取消
+        for future in futures:
+            future.cancel()
+
+    # 【媒体组件】【歌词获取】全部失败时，只要有一个来源是临时错误就按临时错误处理，避免把网络故障缓存成长期未命中
+    failures = [future.result() for future in futures if future.result().get("error")]
+    if not failures:
+        return "", {"error": "Lyrics not found", "permanent": True}
+    transient = [failure for failure in failures if not failure.get("permanent")]
+    return "", transient[0] if transient else failures[0]
+
+
+def fetch_lyrics(
+    title: str,
+    artist: str = "",
+    album: str = "",
+    duration: float = 0,
+    player: str = "",
+    use_mpris: bool = True,
+) -> dict:
+    """获取歌词，先查本地歌词文件和缓存，未命中时并发读取 MPRIS 与 lrclib.net，按 MPRIS、精确查询、搜索的优先级选用结果。
 
     Args:
         title: 曲目标题。
@@ -203,21 +654,59 @@ def fetch_lyrics(title: str, artist: str = "", album: str = "", duration: float
         album: 专辑名称。
         duration: 曲目时长，单位为秒。
         player: playerctl 播放器名称。
+        use_mpris: 是否读取 MPRIS 歌词；批量预取时曲目并未在播放，必须关闭。
     Returns:
         dict: 歌词请求结果。
     """
-    cached_result = load_cached_lyrics(title, artist, album, duration, player)
+    # 【媒体组件】【歌词获取】本地歌词文件查询只需一次索引查找，优先于缓存，修改 .lrc 后立即生效
+    local_result = fetch_local_lyrics(title, artist)
+    if local_result:
+        return local_result
+
+    with media_metrics.timed("lyrics_cache_read"):
+        cached_result = load_cached_lyrics(title, artist, album, duration, player)
+    if cached_result and cached_result.get("success"):
+        media_metrics.count("lyrics_cache_hit")
+        return cached_result
+    media_metrics.count("lyrics_cache_miss")
+
+    # 1. 近期确认没有歌词或刚遇到临时错误的曲目只读取 MPRIS 本地歌词，在重试时间之前不再联网
     if cached_result:
+        outcome = mpris_source(player) if use_mpris else {"error": ""}
+        if "result" in outcome:
+            save_cached_lyrics(title, artist, album, duration, player, outcome["result"])
+            return outcome["result"]
+        media_metrics.count("lyrics_cache_negative_hit")
         return cached_result
 
-    # 1. 优先读取 MPRIS 本地歌词，适配 musicfox 等播放器
-    mpris_result = fetch_mpris_lyrics(player)
-    if mpris_result:
-        save_cached_lyrics(title, artist, album, duration, player, mpris_result)
-        return mpris_result
+    # 2. MPRIS 本地歌词适配 musicfox 等播放器，优先级最高，与 lrclib.net 请求同时进行
+    extra_sources = [("mpris", lambda: mpris_source(player))] if use_mpris else []
+    return fetch_lrclib_lyrics(title, artist, album, duration, player, extra_sources)
 
-    # 2. 本地歌词不可用时再请求 lrclib.net
-    try:
+
+def fetch_lrclib_lyrics(
+    title: str,
+    artist: str = "",
+    album: str = "",
+    duration: float = 0,
+    player: str = "",
+    extra_sources: list[tuple[str, Callable[[], dict]]] | None = None,
+) -> dict:
+    """同时请求 lrclib.net 的精确查询和搜索接口，选出结果后写入缓存。
+
+    Args:
+        title: 曲目标题。
+        artist: 艺术家名称。
+        album: 专辑名称。
+        duration: 曲目时长，单位为秒。
+        player: playerctl 播放器名称。
+        extra_sources: 优先级高于 lrclib.net 的其他来源。
+    Returns:
+        dict: 歌词请求结果。
+    """
+    sources = list(extra_sources or [])
+    # httpx 只在真正联网时导入，避免拖慢只读歌词的命令
+    if importlib.util.find_spec("httpx") is not None:
         params = {
             "track_name": title,
         }
@@ -227,104 +716,223 @@ def fetch_lyrics(title: str, artist: str = "", album: str = "", duration: float
             params["album_name"] = album
         if duration > 0:
             params["duration"] = int(duration)
+        sources.append(("get", lambda: query_lrclib("get", params)))
+        sources.append(("search", lambda: query_lrclib("search", {"q": f"{artist} {title}"})))
+    elif not sources:
+        return {"success": False, "error": "httpx is not installed"}
 
-        with httpx.Client(timeout=10) as client:
-            response = client.get(f"{LRCLIB_API}/get", params=params)
+    with media_metrics.timed("lyrics_race"):
+        name, outcome = race_lyrics_sources(sources)
+    if "result" in outcome:
+        save_cached_lyrics(title, artist, album, duration, player, outcome["result"], outcome.get("record_key", ""))
+        return outcome["result"]
+    if not any(source_name in ("get", "search") for source_name, _ in sources):
+        return {"success": False, "error": "httpx is not installed"}
+    return save_lyrics_miss(title, artist, album, duration, player, outcome["error"], outcome["permanent"])
 
-            if response.status_code == 404:
-                response = client.get(f"{LRCLIB_API}/search", params={"q": f"{artist} {title}"})
-                if response.status_code == 200:
-                    results = response.json()
-                    if results and len(results) > 0:
-                        best = results[0]
-                        synced = best.get("syncedLyrics", "")
-                        plain = best.get("plainLyrics", "")
-
-                        if synced:
-                            result = {
-                                "success": True,
-                                "synced": True,
-                                "lines": parse_lrc(synced),
-                                "source": "lrclib.net"
-                            }
-                            save_cached_lyrics(title, artist, album, duration, player, result)
-                            return result
-                        elif plain:
-                            result = {
-                                "success": True,
-                                "synced": False,
-                                "text": plain,
-                                "source": "lrclib.net"
-                            }
-                            save_cached_lyrics(title, artist, album, duration, player, result)
-                            return result
-
-                return {"success": False, "error": "Lyrics not found"}
 
-            if response.status_code != 200:
-                return {"success": False, "error": f"API error: {response.status_code}"}
+class LyricsIndex:
+    """歌词时间索引：有序时间数组加平行文本列表，按游标快速路径和二分查找定位当前行；逐字时间展平为一个数组，按行记录区间。
 
-            data = response.json()
-            synced = data.get("syncedLyrics", "")
-            plain = data.get("plainLyrics", "")
-
-            if synced:
-                result = {
-                    "success": True,
-                    "synced": True,
-                    "lines": parse_lrc(synced),
-                    "source": "lrclib.net"
-                }
-                save_cached_lyrics(title, artist, album, duration, player, result)
-                return result
-            elif plain:
-                result = {
-                    "success": True,
-                    "synced": False,
-                    "text": plain,
-                    "source": "lrclib.net"
-                }
-                save_cached_lyrics(title, artist, album, duration, player, result)
-                return result
-            else:
-                return {"success": False, "error": "No lyrics in response"}
+    同一时间有多行时定位到其中第一行，即原文和合并到原文上的翻译。
+    """
+
+    __slots__ = ("lines", "times", "texts", "following", "cursor", "word_times", "word_bounds")
+
+    def __init__(self, lines: list[dict]) -> None:
+        """根据按时间排序的歌词行建立索引。
+
+        Args:
+            lines: parse_lrc 返回的歌词行列表，要求已按时间升序排列。
+        Returns:
+            None: 无返回值。
+        """
+        self.lines = lines
+        self.times = array("d", (float(line["time"]) for line in lines))
+        self.texts = [line["text"] for line in lines]
+        # 【媒体组件】【歌词定位】第 i 行之后第一个时间更晚的行，同一时间的其他行不会成为当前行或下一行
+        following = array("l", [0]) * len(lines)
+        next_index = len(lines)
+        for index in range(len(lines) - 1, -1, -1):
+            following[index] = next_index
+            if index == 0 or self.times[index - 1] != self.times[index]:
+                next_index = index
+        self.following = following
+        self.cursor = -1
+        self.word_times = None
+        self.word_bounds = None
+
+    def build_words(self) -> None:
+        """展平逐字时间，第一次查询逐字进度时才建立，没有逐字时间的歌词不付出额外开销。
+
+        Args:
+            无。
+        Returns:
+            None: 无返回值。
+        """
+        # 【媒体组件】【歌词定位】第 i 行的逐字时间位于 word_times[word_bounds[i]:word_bounds[i + 1]]
+        word_times = array("d")
+        word_bounds = array("l", [0])
+        for line in self.lines:
+            words = line.get("words")
+            if words:
+                word_times.extend(float(word["time"]) for word in words)
+            word_bounds.append(len(word_times))
+        self.word_times = word_times
+        self.word_bounds = word_bounds
+
+    def locate(self, position: float) -> int:
+        """查找播放进度对应的歌词行下标。
+
+        Args:
+            position: 播放进度，单位为秒。
+        Returns:
+            int: 当前行下标；进度早于第一行时返回 -1。
+        """
+        times = self.times
+        count = len(times)
+        cursor = self.cursor
+
+        # 【媒体组件】【歌词定位】1. 顺序播放时进度通常仍在当前行或刚进入下一行，先检查游标附近
+        if cursor < count:
+            following = self.following[cursor] if cursor >= 0 else 0
+            if (cursor < 0 or times[cursor] <= position) and (following >= count or position < times[following]):
+                return cursor
+            if following < count and times[following] <= position:
+                after = self.following[following]
+                if after >= count or position < times[after]:
+                    self.cursor = following
+                    return following
+
+        # 【媒体组件】【歌词定位】2. 跳转或首次查询时二分查找，同一时间有多行时回到第一行
+        index = bisect_right(times, position) - 1
+        if index > 0:
+            index = bisect_left(times, times[index], 0, index)
+        self.cursor = index
+        return index
+
+    def word(self, index: int, position: float) -> tuple[int, float]:
+        """在当前行的逐字时间中二分查找正在唱的字词。
+
+        Args:
+            index: 当前行下标。
+            position: 播放进度，单位为秒。
+        Returns:
+            tuple[int, float]: 字词下标和该字词已唱的比例；该行没有逐字时间时返回 (-1, 0.0)。
+        """
+        if self.word_bounds is None:
+            self.build_words()
+        start = self.word_bounds[index]
+        stop = self.word_bounds[index + 1]
+        if start == stop:
+            return -1, 0.0
+
+        current = max(bisect_right(self.word_times, position, start, stop) - 1, start)
+        # 最后一个字词唱到行尾时间，没有行尾时间时唱到下一行开始
+        if current + 1 < stop:
+            ends_at = self.word_times[current + 1]
+        else:
+            ends_at = float(self.lines[index].get("end") or (self.times[index + 1] if index + 1 < len(self.times) else 0))
+        length = ends_at - self.word_times[current]
+        progress = (position - self.word_times[current]) / length if length > 0 else 1.0
+        return current - start, round(min(max(progress, 0.0), 1.0), 3)
+
+    def line(self, position: float) -> dict:
+        """生成播放进度对应的当前行信息。
+
+        Args:
+            position: 播放进度，单位为秒。
+        Returns:
+            dict: 当前行下标、文本、下一行文本和当前行时间；有翻译或音译的行另有 translation 或 romanization，
+                带逐字时间的行另有 word_index 和 word_progress。
+        """
+        if not self.texts:
+            return {"index": -1, "text": "", "next_text": ""}
+
+        index = self.locate(position)
+        if index < 0:
+            return {"index": -1, "text": "", "next_text": self.texts[0], "time": 0}
+        state = {
+            "index": index,
+            "text": self.texts[index],
+            "next_text": self.texts[self.following[index]] if self.following[index] < len(self.texts) else "",
+            "time": self.lines[index]["time"],
+        }
+        line = self.lines[index]
+        # 【媒体组件】【歌词翻译】翻译和音译在写入缓存时已合并到同一行，与原文一次查找得到
+        for kind in LYRICS_EXTRA_TRACKS:
+            if kind in line:
+                state[kind] = line[kind]
+        if line.get("words"):
+            state["word_index"], state["word_progress"] = self.word(index, position)
+        return state
 
-    except httpx.TimeoutException:
-        return {"success": False, "error": "Request timeout"}
-    except Exception as e:
-        return {"success": False, "error": str(e)}
+
+lyrics_indexes: OrderedDict[int, LyricsIndex] = OrderedDict()
+
+
+def lyrics_index(lines: list[dict]) -> LyricsIndex:
+    """获取歌词行列表对应的索引，同一列表重复查询时复用索引和游标。
+
+    Args:
+        lines: 歌词行列表。
+    Returns:
+        LyricsIndex: 歌词时间索引。
+    """
+    key = id(lines)
+    index = lyrics_indexes.get(key)
+    # 【媒体组件】【歌词定位】按对象复用索引，同时校验对象身份和长度，避免 id 复用或列表被改写后命中旧索引
+    if index is not None and index.lines is lines and len(index.times) == len(lines):
+        lyrics_indexes.move_to_end(key)
+        return index
+
+    index = LyricsIndex(lines)
+    lyrics_indexes[key] = index
+    while len(lyrics_indexes) > LYRICS_INDEX_CACHE_SIZE:
+        lyrics_indexes.popitem(last=False)
+    return index
 
 
 def get_current_line(lines: list[dict], position: float) -> dict:
-    """Get current lyric line based on playback position."""
+    """根据播放进度获取当前歌词行。
+
+    Args:
+        lines: 按时间升序排列的歌词行列表。
+        position: 播放进度，单位为秒。
+    Returns:
+        dict: 当前行下标、文本、下一行文本和当前行时间，以及 LyricsIndex.line 中说明的翻译、音译和逐字进度。
+    """
     if not lines:
         return {"index": -1, "text": "", "next_text": ""}
+    return lyrics_index(lines).line(position)
 
-    current_idx = -1
-    for i, line in enumerate(lines):
-        if line["time"] <= position:
-            current_idx = i
-        else:
-            break
 
-    if current_idx >= 0:
-        current_text = lines[current_idx]["text"]
-        next_text = lines[current_idx + 1]["text"] if current_idx + 1 < len(lines) else ""
-        return {
-            "index": current_idx,
-            "text": current_text,
-            "next_text": next_text,
-            "time": lines[current_idx]["time"]
-        }
-    elif lines:
-        return {
-            "index": -1,
-            "text": "",
-            "next_text": lines[0]["text"],
-            "time": 0
-        }
+def load_lines_for_key(key: str) -> tuple[list[dict], str] | None:
+    """按曲目标识或缓存键读取已解析的同步歌词。
 
-    return {"index": -1, "text": "", "next_text": ""}
+    Args:
+        key: media_state.track_key 生成的曲目标识，或 fetch 命令输出的 cache_key。
+    Returns:
+        tuple[list[dict], str] | None: 歌词行和来源；来源为 payload 表示后台脚本写出的当前曲目歌词，cache 表示歌词缓存。没有同步歌词时返回 None。
+    """
+    if "||" in key:
+        # 延迟导入：media_state 依赖本模块，只有按曲目标识查询时才需要
+        from media_state import load_lyrics_payload, lyrics_payload_name
+
+        # 【媒体组件】【歌词定位】1. 正在播放的曲目直接读取后台脚本写出的歌词内容，不打开数据库
+        payload = load_lyrics_payload(lyrics_payload_name(key))
+        if payload["lines"]:
+            return payload["lines"], "payload"
+
+        # 【媒体组件】【歌词定位】2. 其他曲目按标识中的元数据换算为缓存键
+        title, artist, album, player = (key.rsplit("||", 3) + ["", "", ""])[:4]
+        result = load_cached_lyrics(title, artist, album, 0, player)
+    else:
+        result = lyrics_cache.get(key)
+
+    if result and result.get("synced") and result.get("lines"):
+        return result["lines"], "cache"
+    return None
 
 
 if __name__ == "__main__":
@@ -346,7 +954,14 @@ if __name__ == "__main__":
         player = sys.argv[6] if len(sys.argv) > 6 else ""
 
         result = fetch_lyrics(title, artist, album, duration, player)
+        # 调用方之后可以用 line --key 按缓存键查询当前行，不必再传完整歌词
+        result["cache_key"] = lyrics_cache_key(title, artist, album, duration, player)
         print(json.dumps(result, ensure_ascii=False))
+        # 【媒体组件】【歌词获取】落选的 lrclib.net 请求仍在线程池中执行，解释器退出时会等待它们；
+        # QML 调用方在进程退出后才读取输出，结果写入缓存后直接结束进程
+        shutdown_lyrics_executor()
+        sys.stdout.flush()
+        os._exit(0)
 
     elif command == "mpris":
         # Direct MPRIS fetch without online fallback
@@ -358,10 +973,31 @@ if __name__ == "__main__":
             print(json.dumps({"success": False, "error": "No MPRIS lyrics available"}))
 
     elif command == "line":
-        if len(sys.argv) < 4:
+        if len(sys.argv) < 4 or (sys.argv[2] == "--key" and len(sys.argv) < 5):
             print(json.dumps({"success": False, "error": "Missing arguments"}))
             sys.exit(1)
 
+        if sys.argv[2] == "--key":
+            # 【媒体组件】【歌词定位】按键读取已解析的歌词，只建一次索引，一次回答多个进度
+            try:
+                positions = [float(value) for value in sys.argv[4:]]
+            except ValueError as e:
+                print(json.dumps({"success": False, "error": str(e)}))
+                sys.exit(1)
+            found = load_lines_for_key(sys.argv[3])
+            if found is None:
+                print(json.dumps({"success": False, "error": "No synced lyrics for key"}))
+                sys.exit(1)
+            lines, source = found
+            index = LyricsIndex(lines)
+            print(json.dumps({
+                "success": True,
+                "source": source,
+                "line_count": len(lines),
+                "results": [{"position": position, **index.line(position)} for position in positions],
+            }, ensure_ascii=False))
+            sys.exit(0)
+
         try:
             lines = json.loads(sys.argv[2])
             position = float(sys.argv[3])
@@ -370,5 +1006,34 @@ if __name__ == "__main__":
         except Exception as e:
             print(json.dumps({"success": False, "error": str(e)}))
 
+    elif command == "cache":
+        action = sys.argv[2] if len(sys.argv) > 2 else "stats"
+        if action == "stats":
+            print(json.dumps(lyrics_cache.stats(), ensure_ascii=False))
+        elif action == "gc":
+            print(json.dumps(lyrics_cache.gc(), ensure_ascii=False))
+        else:
+            print(json.dumps({"success": False, "error": f"Unknown cache action: {action}"}))
+            sys.exit(1)
+
+    elif command == "local":
+        action = sys.argv[2] if len(sys.argv) > 2 else "stats"
+        if action == "index":
+            print(json.dumps(lyrics_local.rescan(full="--full" in sys.argv[3:]), ensure_ascii=False))
+        elif action == "find" and len(sys.argv) > 3:
+            path = lyrics_local.find(sys.argv[3], sys.argv[4] if len(sys.argv) > 4 else "")
+            print(json.dumps({"success": path is not None, "path": str(path) if path else ""}, ensure_ascii=False))
+        elif action == "stats":
+            print(json.dumps(lyrics_local.stats(), ensure_ascii=False))
+        else:
+            print(json.dumps({"success": False, "error": f"Unknown local action: {action}"}))
+            sys.exit(1)
+
+    elif command == "prewarm":
+        # 批量预取只在手动运行时用到，按需导入
+        import lyrics_prewarm
+
+        sys.exit(lyrics_prewarm.main(sys.argv[2:]))
+
     else:
         print(json.dumps({"success": False, "error": f"Unknown command: {command}"}))
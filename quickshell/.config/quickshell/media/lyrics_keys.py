@@ -0,0 +1,147 @@
+#!/usr/bin/env python3
+"""歌词匹配键：把不同播放器、不同版本写法的曲目元数据规范化为同一个键。"""
+
+from __future__ import annotations
+
+import hashlib
+import re
+import unicodedata
+
+
+# 【媒体组件】【歌词匹配】括号或 “ - ” 后缀只由这些词和数字组成时视为版本说明，不属于标题本身
+EDITION_WORDS = {
+    "remaster", "remastered", "remasterd", "mono", "stereo", "version", "ver", "single", "album",
+    "explicit", "clean", "deluxe", "bonus", "track", "edition", "mix", "original", "mixed", "digital",
+    # 浏览器播放视频时标题常带的说明
+    "official", "music", "video", "audio", "lyric", "lyrics", "mv", "pv", "hd", "hq", "mtv",
+}
+# 【媒体组件】【歌词匹配】现场、混音等版本的歌词或时间轴可能不同，保留为键的一部分
+VERSION_WORDS = {
+    "live", "acoustic", "remix", "instrumental", "karaoke", "demo", "unplugged", "extended", "tv", "inst",
+    # 电台版等剪辑版本比专辑版短，时间轴不同
+    "edit", "radio",
+}
+FEAT_WORDS = {"feat", "ft", "featuring", "with"}
+# 【媒体组件】【歌词匹配】时长已知时按该粒度分档写入缓存键，同名不同剪辑版本的歌词分开保存
+DURATION_BUCKET_SECONDS = 10
+VENUE_WORDS = {"at", "in", "from", "on"}
+
+# 正则在第一次匹配时由 re 模块编译并缓存，避免拖慢只查当前歌词行的命令
+BRACKET_PATTERN = r"[(\[【]([^)\]】]*)[)\]】]"
+DASH_PATTERN = r"\s+[-–—]\s+"
+WORD_PATTERN = r"\w+"
+ARTIST_FEAT_PATTERN = r"\s*[(\[]?\s*\b(?:feat|ft|featuring)\b\.?.*$"
+ARTIST_SPLIT_PATTERN = r"\s*(?:[,&/;、+]|\s(?:x|and|vs\.?|with)\s)\s*"
+ARTIST_SUFFIX_PATTERN = r"\s+-\s+topic$"
+
+
+def normalize_text(text: str) -> str:
+    """兼容字符归一并忽略大小写，只保留字母和数字。
+
+    Args:
+        text: 原始文本。
+    Returns:
+        str: 规范化后的文本。
+    """
+    text = unicodedata.normalize("NFKC", text).casefold()
+    return "".join(char for char in text if char.isalnum())
+
+
+def qualifier_kind(segment: str) -> tuple[str, list[str]]:
+    """判断括号或后缀中的内容是否为版本说明。
+
+    Args:
+        segment: 已归一大小写的括号内容或后缀。
+    Returns:
+        tuple[str, list[str]]: 类型和需要保留的版本词；类型为 feat 表示合作艺术家，edition 表示版本说明，title 表示标题的一部分。
+    """
+    words = [word for word in re.findall(WORD_PATTERN, segment) if not word.isdigit()]
+    if not words:
+        return "edition", []
+    if words[0] in FEAT_WORDS:
+        return "feat", []
+    if words[0] == "live" and len(words) > 1 and words[1] in VENUE_WORDS:
+        return "edition", ["live"]
+    if all(word in EDITION_WORDS or word in VERSION_WORDS for word in words):
+        return "edition", sorted({word for word in words if word in VERSION_WORDS})
+    return "title", []
+
+
+def title_key(title: str) -> str:
+    """生成标题匹配键：去掉合作艺术家和重制版等说明，保留现场、混音等版本词。
+
+    Args:
+        title: 曲目标题。
+    Returns:
+        str: 标题匹配键；带版本词时以 “|” 分隔附在末尾。
+    """
+    text = unicodedata.normalize("NFKC", title).casefold().strip()
+    versions: set[str] = set()
+
+    def replace_bracket(match: re.Match[str]) -> str:
+        """按括号内容的类型决定保留还是删除。
+
+        Args:
+            match: 括号匹配结果。
+        Returns:
+            str: 替换后的文本。
+        """
+        kind, words = qualifier_kind(match.group(1))
+        versions.update(words)
+        return match.group(0) if kind == "title" else " "
+
+    text = re.sub(BRACKET_PATTERN, replace_bracket, text)
+    # 【媒体组件】【歌词匹配】第一段总是标题，之后的 “ - ” 段只有是版本说明时才去掉
+    segments = re.split(DASH_PATTERN, text)
+    kept = segments[:1]
+    for segment in segments[1:]:
+        kind, words = qualifier_kind(segment)
+        versions.update(words)
+        if kind == "title":
+            kept.append(segment)
+
+    key = normalize_text(" ".join(kept)) or normalize_text(title)
+    return "|".join([key, *sorted(versions)])
+
+
+def artist_key(artist: str) -> str:
+    """生成艺术家匹配键：去掉合作艺术家，拆分多位艺术家后排序。
+
+    Args:
+        artist: 艺术家名称。
+    Returns:
+        str: 以逗号连接的艺术家匹配键。
+    """
+    text = unicodedata.normalize("NFKC", artist).casefold().strip()
+    text = re.sub(ARTIST_SUFFIX_PATTERN, "", re.sub(ARTIST_FEAT_PATTERN, "", text))
+    names = {normalize_text(name) for name in re.split(ARTIST_SPLIT_PATTERN, text)}
+    return ",".join(sorted(name for name in names if name))
+
+
+def artists_overlap(left: str, right: str) -> bool:
+    """判断两个艺术家匹配键是否有共同的艺术家。
+
+    Args:
+        left: 艺术家匹配键。
+        right: 艺术家匹配键。
+    Returns:
+        bool: 有共同艺术家时返回 True。
+    """
+    return bool(set(left.split(",")) & set(right.split(","))) if left and right else False
+
+
+def track_key(title: str, artist: str = "", duration: float = 0) -> str:
+    """生成规范化的曲目缓存键。
+
+    Args:
+        title: 曲目标题。
+        artist: 艺术家名称。
+        duration: 曲目时长，单位为秒；大于 0 时按 DURATION_BUCKET_SECONDS 分档加入缓存键。
+    Returns:
+        str: 缓存键；时长为 0 时与不区分时长的旧键相同。
+    """
+    parts = [title_key(title), artist_key(artist)]
+    if duration > 0:
+        parts.append(str(int(duration // DURATION_BUCKET_SECONDS)))
+    raw_key = "||".join(parts)
+    return hashlib.sha256(raw_key.encode("utf-8")).hexdigest()
@@ -0,0 +1,359 @@
+#!/usr/bin/env python3
+"""本地 .lrc 歌词索引：扫描音乐目录中与音频放在一起的歌词文件，按规范化的标题和艺术家查找。"""
+
+from __future__ import annotations
+
+import json
+import os
+import re
+import threading
+import time
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+import media_metrics
+from lyrics_cache import cache_base_dir
+from lyrics_keys import artist_key, artists_overlap, title_key
+
+if TYPE_CHECKING:
+    import sqlite3
+
+
+LOCAL_INDEX_SCHEMA_VERSION = 3
+LOCAL_SCAN_WORKERS = min(8, (os.cpu_count() or 1) * 2)
+# 【媒体组件】【本地歌词】只读取文件开头的标签，避免为建索引读完整个歌词文件
+LRC_HEADER_BYTES = 2048
+# 本模块随 lyrics_fetcher 一起导入，正则只保存字符串，第一次扫描时才编译
+LRC_TAG_PATTERN = r"(?im)^\[(ti|ar):([^\]]*)\]\s*$"
+TRACK_NUMBER_PATTERN = r"^\s*(?:\d{1,3}[\s._-]+)+"
+# 【媒体组件】【本地歌词】与原文歌词同名、带这些后缀的文件是翻译或音译，不单独建索引
+LRC_SIDECAR_SUFFIXES = {
+    ".trans": "translation",
+    ".tr": "translation",
+    ".translation": "translation",
+    ".roma": "romanization",
+    ".romaji": "romanization",
+    ".romanization": "romanization",
+}
+
+index_lock = threading.Lock()
+connections: dict[str, sqlite3.Connection] = {}
+
+
+def music_dirs() -> list[Path]:
+    """获取需要扫描的音乐目录。
+
+    Args:
+        无。
+    Returns:
+        list[Path]: 目录列表，可通过 QS_MEDIA_LYRICS_DIRS 配置，多个目录用冒号分隔；默认使用 XDG_MUSIC_DIR 或 ~/Music。
+    """
+    configured = os.environ.get("QS_MEDIA_LYRICS_DIRS", "")
+    if configured:
+        return [Path(item).expanduser() for item in configured.split(os.pathsep) if item]
+    return [Path(os.environ.get("XDG_MUSIC_DIR", Path.home() / "Music")).expanduser()]
+
+
+def lrc_names(path: Path) -> tuple[str, str]:
+    """读取歌词文件的标题和艺术家，优先使用 [ti:] 和 [ar:] 标签，缺失时从文件名推断。
+
+    Args:
+        path: 歌词文件路径。
+    Returns:
+        tuple[str, str]: 标题和艺术家；无法确定艺术家时为空字符串。
+    """
+    tags: dict[str, str] = {}
+    try:
+        with path.open("rb") as lrc_file:
+            header = lrc_file.read(LRC_HEADER_BYTES).decode("utf-8", "replace")
+        for match in re.finditer(LRC_TAG_PATTERN, header):
+            tags.setdefault(match.group(1).lower(), match.group(2).strip())
+    except OSError:
+        pass
+
+    # 【媒体组件】【本地歌词】文件名按 “艺术家 - 标题” 或 “序号 标题” 解析
+    stem = re.sub(TRACK_NUMBER_PATTERN, "", path.stem) or path.stem
+    artist, separator, title = stem.partition(" - ")
+    if not separator:
+        artist, title = "", stem
+    return tags.get("ti") or title.strip(), tags.get("ar") or artist.strip()
+
+
+def is_sidecar(name: str) -> bool:
+    """判断歌词文件是否为翻译或音译附属文件。
+
+    Args:
+        name: 歌词文件名。
+    Returns:
+        bool: 是附属文件时返回 True。
+    """
+    return Path(name[:-4]).suffix.lower() in LRC_SIDECAR_SUFFIXES
+
+
+def sidecars(path: Path) -> dict[str, Path]:
+    """查找原文歌词旁边的翻译和音译文件。
+
+    Args:
+        path: 原文歌词文件路径。
+    Returns:
+        dict[str, Path]: 以 translation 或 romanization 为键的附属文件路径；同一类有多个文件时取第一个。
+    """
+    found: dict[str, Path] = {}
+    for suffix, kind in LRC_SIDECAR_SUFFIXES.items():
+        candidate = path.with_name(f"{path.stem}{suffix}.lrc")
+        if kind not in found and candidate.is_file():
+            found[kind] = candidate
+    return found
+
+
+def index_db_path() -> Path:
+    """获取本地歌词索引数据库路径。
+
+    Args:
+        无。
+    Returns:
+        Path: 数据库文件路径。
+    """
+    return cache_base_dir() / "lyrics-local.sqlite3"
+
+
+def connect() -> sqlite3.Connection:
+    """打开本地歌词索引数据库，首次打开时建表。
+
+    Args:
+        无。
+    Returns:
+        sqlite3.Connection: 数据库连接；同一进程内复用，调用方需持有 index_lock。
+    """
+    path = str(index_db_path())
+    connection = connections.get(path)
+    if connection is not None:
+        return connection
+
+    # 索引数据库只在扫描和查找本地歌词时打开，sqlite3 到这时才导入
+    import sqlite3
+
+    connection = sqlite3.connect(path, timeout=5, check_same_thread=False, isolation_level=None)
+    connection.execute("PRAGMA journal_mode=WAL")
+    connection.execute("PRAGMA synchronous=NORMAL")
+    if connection.execute("PRAGMA user_version").fetchone()[0] < LOCAL_INDEX_SCHEMA_VERSION:
+        # 【媒体组件】【本地歌词】匹配键的规则变化后旧索引不可用，直接重建，下次扫描重新读取所有文件
+        connection.executescript(
+            f"""
+            BEGIN;
+            DROP TABLE IF EXISTS dirs;
+            DROP TABLE IF EXISTS files;
+            CREATE TABLE IF NOT EXISTS dirs (
+                path TEXT PRIMARY KEY,
+                mtime_ns INTEGER NOT NULL,
+                subdirs TEXT NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS files (
+                path TEXT PRIMARY KEY,
+                dir TEXT NOT NULL,
+                mtime_ns INTEGER NOT NULL,
+                title TEXT NOT NULL,
+                artist TEXT NOT NULL,
+                title_key TEXT NOT NULL,
+                artist_key TEXT NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS files_dir ON files (dir);
+            CREATE INDEX IF NOT EXISTS files_title_key ON files (title_key, artist_key);
+            PRAGMA user_version = {LOCAL_INDEX_SCHEMA_VERSION};
+            COMMIT;
+            """
+        )
+    connections[path] = connection
+    return connection
+
+
+def scan_dir(
+    path: str,
+    known: tuple[int, list[str]] | None,
+    known_files: dict[str, int],
+    full: bool,
+) -> dict[str, Any] | None:
+    """扫描单个目录，目录修改时间未变时沿用上次记录的子目录，只检查已索引文件的修改时间。
+
+    Args:
+        path: 目录路径。
+        known: 上次扫描记录的修改时间和子目录列表。
+        known_files: 上次扫描记录的该目录中歌词文件及其修改时间。
+        full: 是否忽略修改时间强制重新列出。
+    Returns:
+        dict[str, Any] | None: 扫描结果，files 为 None 表示目录和其中的歌词文件都未变化；目录不可读时返回 None。
+    """
+    try:
+        mtime_ns = os.stat(path).st_mtime_ns
+    except OSError:
+        return None
+    # 【媒体组件】【本地歌词】新增、删除或重命名文件都会更新目录修改时间，未变化的目录不重新列出；
+    # 原地修改文件内容不会更新目录修改时间，逐个 stat 已索引的文件
+    if known is not None and known[0] == mtime_ns and not full:
+        files = []
+        for file_path in known_files:
+            try:
+                files.append((file_path, os.stat(file_path).st_mtime_ns))
+            except OSError:
+                continue
+        changed = len(files) != len(known_files) or any(known_files[file_path] != file_mtime for file_path, file_mtime in files)
+        return {"path": path, "mtime_ns": mtime_ns, "subdirs": known[1], "files": files if changed else None}
+
+    subdirs = []
+    files = []
+    try:
+        with os.scandir(path) as entries:
+            for entry in entries:
+                if entry.name.startswith("."):
+                    continue
+                if entry.is_dir(follow_symlinks=False):
+                    subdirs.append(entry.path)
+                elif entry.name.lower().endswith(".lrc") and not is_sidecar(entry.name) and entry.is_file():
+                    files.append((entry.path, entry.stat().st_mtime_ns))
+    except OSError:
+        return None
+    return {"path": path, "mtime_ns": mtime_ns, "subdirs": subdirs, "files": files}
+
+
+def rescan(full: bool = False) -> dict[str, Any]:
+    """增量更新本地歌词索引，按目录层级并行扫描。
+
+    Args:
+        full: 是否忽略目录修改时间重新列出所有目录。
+    Returns:
+        dict[str, Any]: 扫描统计。
+    """
+    from concurrent.futures import ThreadPoolExecutor
+
+    started_at = time.perf_counter()
+    with index_lock:
+        connection = connect()
+        known_dirs = {
+            path: (mtime_ns, json.loads(subdirs))
+            for path, mtime_ns, subdirs in connection.execute("SELECT path, mtime_ns, subdirs FROM dirs")
+        }
+        indexed_files: dict[str, int] = {}
+        files_by_dir: dict[str, dict[str, int]] = {}
+        for path, dir_path, mtime_ns in connection.execute("SELECT path, dir, mtime_ns FROM files"):
+            indexed_files[path] = mtime_ns
+            files_by_dir.setdefault(dir_path, {})[path] = mtime_ns
+
+    seen_dirs: set[str] = set()
+    changed_dirs: list[dict[str, Any]] = []
+    frontier = [str(path) for path in music_dirs() if path.is_dir()]
+    with ThreadPoolExecutor(max_workers=LOCAL_SCAN_WORKERS, thread_name_prefix="lyrics-scan") as executor:
+        # 【媒体组件】【本地歌词】1. 按目录层级并行 stat 和列目录，修改时间未变的目录不列出内容
+        while frontier:
+            results = executor.map(lambda path: scan_dir(path, known_dirs.get(path), files_by_dir.get(path, {}), full), frontier)
+            frontier = []
+            for result in results:
+                if result is None or result["path"] in seen_dirs:
+                    continue
+                seen_dirs.add(result["path"])
+                frontier.extend(result["subdirs"])
+                if result["files"] is not None:
+                    changed_dirs.append(result)
+
+        # 【媒体组件】【本地歌词】2. 只为新增或修改时间变化的歌词文件并行读取标签
+        updated = [
+            (path, result["path"], mtime_ns)
+            for result in changed_dirs
+            for path, mtime_ns in result["files"]
+            if indexed_files.get(path) != mtime_ns
+        ]
+        names = list(executor.map(lambda item: lrc_names(Path(item[0])), updated))
+
+    removed = 0
+    with index_lock:
+        connection = connect()
+        connection.execute("BEGIN")
+        connection.executemany(
+            "INSERT OR REPLACE INTO files VALUES (?, ?, ?, ?, ?, ?, ?)",
+            [
+                (path, dir_path, mtime_ns, title, artist, title_key(title), artist_key(artist))
+                for (path, dir_path, mtime_ns), (title, artist) in zip(updated, names)
+            ],
+        )
+        for result in changed_dirs:
+            current = {path for path, _ in result["files"]}
+            for path, in connection.execute("SELECT path FROM files WHERE dir = ?", (result["path"],)).fetchall():
+                if path not in current:
+                    connection.execute("DELETE FROM files WHERE path = ?", (path,))
+                    removed += 1
+            connection.execute(
+                "INSERT OR REPLACE INTO dirs VALUES (?, ?, ?)",
+                (result["path"], result["mtime_ns"], json.dumps(result["subdirs"], ensure_ascii=False)),
+            )
+
+        # 【媒体组件】【本地歌词】本次没有访问到的目录已被删除或移出配置，连同其中的文件一起清理
+        for path in known_dirs.keys() - seen_dirs:
+            connection.execute("DELETE FROM dirs WHERE path = ?", (path,))
+            removed += connection.execute("DELETE FROM files WHERE dir = ?", (path,)).rowcount
+        connection.execute("COMMIT")
+        total = connection.execute("SELECT COUNT(*) FROM files").fetchone()[0]
+
+    elapsed = time.perf_counter() - started_at
+    media_metrics.observe("lyrics_local_rescan", elapsed)
+    return {
+        "success": True,
+        "dirs": len(seen_dirs),
+        "changed_dirs": len(changed_dirs),
+        "files": total,
+        "updated": len(updated),
+        "removed": removed,
+        "elapsed_ms": round(elapsed * 1000, 2),
+    }
+
+
+def find(title: str, artist: str = "") -> Path | None:
+    """按标题和艺术家查找本地歌词文件。
+
+    Args:
+        title: 曲目标题。
+        artist: 艺术家名称。
+    Returns:
+        Path | None: 匹配的歌词文件；没有匹配或同名曲目无法区分时返回 None。
+    """
+    track_title = title_key(title)
+    if not track_title:
+        return None
+    track_artist = artist_key(artist)
+
+    with index_lock:
+        connection = connect()
+        rows = connection.execute("SELECT path, artist_key FROM files WHERE title_key = ?", (track_title,)).fetchall()
+
+    # 【媒体组件】【本地歌词】艺术家一致的文件优先，其次是有共同艺术家的，再次是任一方没有艺术家信息的，其他艺术家的同名曲目不采用
+    candidates = [(path, row_artist) for path, row_artist in rows if row_artist == track_artist]
+    if not candidates:
+        candidates = [(path, row_artist) for path, row_artist in rows if artists_overlap(row_artist, track_artist)]
+    if not candidates:
+        candidates = [(path, row_artist) for path, row_artist in rows if not row_artist or not track_artist]
+    # 【媒体组件】【本地歌词】候选文件属于多位不同艺术家时无法判断是哪一首，例如浏览器标签页没有艺术家信息
+    if len({row_artist for _, row_artist in candidates if row_artist}) > 1:
+        return None
+    for path, _ in candidates:
+        if os.path.isfile(path):
+            return Path(path)
+    return None
+
+
+def stats() -> dict[str, Any]:
+    """统计本地歌词索引。
+
+    Args:
+        无。
+    Returns:
+        dict[str, Any]: 索引目录、文件数量和数据库路径。
+    """
+    with index_lock:
+        connection = connect()
+        dirs = connection.execute("SELECT COUNT(*) FROM dirs").fetchone()[0]
+        files = connection.execute("SELECT COUNT(*) FROM files").fetchone()[0]
+    return {
+        "success": True,
+        "path": str(index_db_path()),
+        "music_dirs": [str(path) for path in music_dirs()],
+        "dirs": dirs,
+        "files": files,
+    }
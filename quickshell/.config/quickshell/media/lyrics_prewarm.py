@@ -0,0 +1,363 @@
+#!/usr/bin/env python3
+"""批量预取歌词：从播放列表、音乐目录或 CSV 读取曲目，限速并发写入歌词缓存，中断后可继续。"""
+
+from __future__ import annotations
+
+import argparse
+import csv
+import hashlib
+import json
+import os
+import re
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Iterator
+
+import lyrics_fetcher
+from lyrics_cache import cache_base_dir
+
+
+AUDIO_SUFFIXES = {".mp3", ".flac", ".ogg", ".opus", ".m4a", ".aac", ".wav", ".wma", ".ape", ".alac", ".aiff"}
+DEFAULT_WORKERS = 4
+# 【媒体组件】【歌词预取】lrclib.net 是公益服务，默认每秒最多两次请求；每首曲目会同时请求精确查询和搜索
+DEFAULT_REQUESTS_PER_SECOND = 2.0
+EXTINF_PATTERN = re.compile(r"^#EXTINF:\s*(-?\d+(?:\.\d+)?)[^,]*,(.*)$")
+TRACK_NUMBER_PATTERN = re.compile(r"^\s*(?:\d{1,3}[\s._-]+)+")
+# 【媒体组件】【歌词预取】这些结果不会因为重试而改变，记入进度文件，继续时跳过
+FINAL_STATUSES = {"local", "cached", "fetched", "missing"}
+
+
+class RateLimiter:
+    """多个线程共享的请求限速器，按固定间隔放行请求。"""
+
+    def __init__(self, per_second: float) -> None:
+        """初始化限速器。
+
+        Args:
+            per_second: 每秒最多放行的请求数，小于等于 0 表示不限速。
+        Returns:
+            None: 无返回值。
+        """
+        self.interval = 1 / per_second if per_second > 0 else 0.0
+        self.next_at = 0.0
+        self.lock = threading.Lock()
+
+    def __call__(self) -> None:
+        """等待到下一个可用的请求时间。
+
+        Args:
+            无。
+        Returns:
+            None: 无返回值。
+        """
+        if self.interval <= 0:
+            return
+        with self.lock:
+            now = time.monotonic()
+            wait = self.next_at - now
+            self.next_at = max(now, self.next_at) + self.interval
+        if wait > 0:
+            time.sleep(wait)
+
+
+def split_artist_title(text: str) -> tuple[str, str]:
+    """把 “艺术家 - 标题” 形式的文本拆开。
+
+    Args:
+        text: 文件名或播放列表中的曲目描述。
+    Returns:
+        tuple[str, str]: 标题和艺术家；没有分隔符时艺术家为空字符串。
+    """
+    artist, separator, title = text.partition(" - ")
+    if not separator:
+        return text.strip(), ""
+    return title.strip(), artist.strip()
+
+
+def audio_tags(path: Path) -> dict[str, Any]:
+    """读取音频文件的标签；安装了 mutagen 时读取内嵌标签，否则从路径推断。
+
+    Args:
+        path: 音频文件路径。
+    Returns:
+        dict[str, Any]: 包含 title、artist、album 和 duration 的曲目信息。
+    """
+    try:
+        import mutagen
+
+        audio = mutagen.File(path, easy=True)
+        if audio is not None and audio.get("title"):
+            return {
+                "title": audio["title"][0],
+                "artist": (audio.get("artist") or [""])[0],
+                "album": (audio.get("album") or [""])[0],
+                "duration": float(getattr(audio.info, "length", 0) or 0),
+            }
+    except Exception:
+        # 【媒体组件】【歌词预取】没有 mutagen 或标签损坏时回退到路径推断
+        pass
+
+    # 【媒体组件】【歌词预取】按 “艺术家/专辑/序号 标题” 的目录结构推断
+    stem = TRACK_NUMBER_PATTERN.sub("", path.stem) or path.stem
+    title, artist = split_artist_title(stem)
+    if not artist and len(path.parts) >= 3:
+        artist = path.parent.parent.name
+    return {"title": title, "artist": artist, "album": path.parent.name, "duration": 0.0}
+
+
+def read_m3u(path: Path) -> Iterator[dict[str, Any]]:
+    """读取 M3U 播放列表，优先使用 #EXTINF 中的曲目信息。
+
+    Args:
+        path: 播放列表路径。
+    Returns:
+        Iterator[dict[str, Any]]: 曲目信息。
+    """
+    extinf: dict[str, Any] | None = None
+    for line in path.read_text(encoding="utf-8", errors="replace").splitlines():
+        line = line.strip()
+        if not line:
+            continue
+        match = EXTINF_PATTERN.match(line)
+        if match:
+            title, artist = split_artist_title(match.group(2))
+            extinf = {"title": title, "artist": artist, "album": "", "duration": max(float(match.group(1)), 0.0)}
+            continue
+        if line.startswith("#"):
+            continue
+        if extinf is not None and extinf["title"]:
+            yield extinf
+        elif "://" not in line:
+            yield audio_tags((path.parent / line).expanduser())
+        extinf = None
+
+
+def read_csv(path: Path) -> Iterator[dict[str, Any]]:
+    """读取 CSV 曲目列表，每行依次为标题、艺术家、专辑和时长，首行可以是表头。
+
+    Args:
+        path: CSV 文件路径。
+    Returns:
+        Iterator[dict[str, Any]]: 曲目信息。
+    """
+    with path.open(newline="", encoding="utf-8") as csv_file:
+        for index, row in enumerate(csv.reader(csv_file)):
+            if not row or not row[0].strip():
+                continue
+            if index == 0 and row[0].strip().lower() == "title":
+                continue
+            try:
+                duration = float(row[3]) if len(row) > 3 and row[3].strip() else 0.0
+            except ValueError:
+                duration = 0.0
+            yield {
+                "title": row[0].strip(),
+                "artist": row[1].strip() if len(row) > 1 else "",
+                "album": row[2].strip() if len(row) > 2 else "",
+                "duration": duration,
+            }
+
+
+def read_directory(path: Path) -> Iterator[dict[str, Any]]:
+    """递归读取目录中的音频文件。
+
+    Args:
+        path: 音乐目录。
+    Returns:
+        Iterator[dict[str, Any]]: 曲目信息。
+    """
+    for root, dirs, files in os.walk(path):
+        dirs[:] = sorted(name for name in dirs if not name.startswith("."))
+        for name in sorted(files):
+            if Path(name).suffix.lower() in AUDIO_SUFFIXES:
+                yield audio_tags(Path(root) / name)
+
+
+def read_tracks(source: Path) -> list[dict[str, Any]]:
+    """按来源类型读取曲目，并按缓存键去重。
+
+    Args:
+        source: M3U 播放列表、CSV 文件或音乐目录。
+    Returns:
+        list[dict[str, Any]]: 去重后的曲目信息，每项带有缓存键 key。
+    """
+    if source.is_dir():
+        tracks = read_directory(source)
+    elif source.suffix.lower() == ".csv":
+        tracks = read_csv(source)
+    else:
+        tracks = read_m3u(source)
+
+    unique: dict[str, dict[str, Any]] = {}
+    for track in tracks:
+        if not track["title"]:
+            continue
+        key = lyrics_fetcher.lyrics_cache_key(track["title"], track["artist"], track["album"], track["duration"])
+        unique.setdefault(key, {**track, "key": key})
+    return list(unique.values())
+
+
+def progress_path(source: Path) -> Path:
+    """获取预取进度文件路径，每个来源单独记录。
+
+    Args:
+        source: 预取来源。
+    Returns:
+        Path: 进度文件路径。
+    """
+    digest = hashlib.sha1(str(source.resolve()).encode("utf-8")).hexdigest()[:12]
+    progress_dir = cache_base_dir() / "lyrics-prewarm"
+    progress_dir.mkdir(parents=True, exist_ok=True)
+    return progress_dir / f"{digest}.jsonl"
+
+
+def load_progress(path: Path) -> set[str]:
+    """读取已完成的曲目缓存键。
+
+    Args:
+        path: 进度文件路径。
+    Returns:
+        set[str]: 已完成的缓存键。
+    """
+    done = set()
+    try:
+        with path.open(encoding="utf-8") as progress_file:
+            for line in progress_file:
+                try:
+                    done.add(json.loads(line)["key"])
+                except (ValueError, KeyError, TypeError):
+                    # 中断时最后一行可能只写了一半
+                    continue
+    except OSError:
+        pass
+    return done
+
+
+def result_status(result: dict[str, Any]) -> str:
+    """把歌词结果归类为预取状态。
+
+    Args:
+        result: 歌词请求结果。
+    Returns:
+        str: local、cached、fetched、missing 或 error。
+    """
+    if result.get("success"):
+        if result.get("source") == "local":
+            return "local"
+        return "cached" if result.get("cached") else "fetched"
+    if result.get("miss") == "permanent":
+        return "missing"
+    return "error"
+
+
+def prewarm(source: Path, workers: int, requests_per_second: float, restart: bool) -> dict[str, Any]:
+    """并发预取来源中所有曲目的歌词。
+
+    Args:
+        source: M3U 播放列表、CSV 文件或音乐目录。
+        workers: 并发曲目数。
+        requests_per_second: 对 lrclib.net 的每秒请求上限。
+        restart: 是否忽略之前的进度从头开始。
+    Returns:
+        dict[str, Any]: 各状态的曲目数量和耗时。
+    """
+    started_at = time.perf_counter()
+    tracks = read_tracks(source)
+    progress = progress_path(source)
+    if restart:
+        progress.unlink(missing_ok=True)
+    done = load_progress(progress)
+    pending = [track for track in tracks if track["key"] not in done]
+    counts = {status: 0 for status in ("local", "cached", "fetched", "missing", "error")}
+    counts_lock = threading.Lock()
+    finished = [0]
+
+    def run(track: dict[str, Any]) -> None:
+        """预取单首曲目并记录进度。
+
+        Args:
+            track: 曲目信息。
+        Returns:
+            None: 无返回值。
+        """
+        try:
+            result = lyrics_fetcher.fetch_lyrics(
+                track["title"], track["artist"], track["album"], track["duration"], use_mpris=False
+            )
+            status = result_status(result)
+        except Exception as e:
+            result = {"error": str(e)}
+            status = "error"
+
+        with counts_lock:
+            counts[status] += 1
+            finished[0] += 1
+            if status in FINAL_STATUSES:
+                with progress.open("a", encoding="utf-8") as progress_file:
+                    progress_file.write(json.dumps({"key": track["key"], "status": status}) + "\n")
+            label = f"{track['artist']} - {track['title']}" if track["artist"] else track["title"]
+            detail = ""
+            if status == "error":
+                detail = f" ({result.get('error')}"
+                if result.get("retry_at"):
+                    detail += f", retry after {max(result['retry_at'] - time.time(), 0):.0f}s"
+                detail += ")"
+            print(f"[{finished[0]}/{len(pending)}] {status:<7} {label}{detail}", file=sys.stderr, flush=True)
+
+    lyrics_fetcher.lrclib_throttle = RateLimiter(requests_per_second)
+    try:
+        with ThreadPoolExecutor(max_workers=max(workers, 1), thread_name_prefix="lyrics-prewarm") as executor:
+            # 【媒体组件】【歌词预取】按 Ctrl+C 时等待进行中的曲目写完进度，未开始的曲目留给下次继续
+            futures = [executor.submit(run, track) for track in pending]
+            try:
+                for future in futures:
+                    future.result()
+            except KeyboardInterrupt:
+                for future in futures:
+                    future.cancel()
+                raise
+    finally:
+        lyrics_fetcher.lrclib_throttle = None
+        lyrics_fetcher.close_lrclib_clients()
+
+    return {
+        "success": counts["error"] == 0,
+        "source": str(source),
+        "tracks": len(tracks),
+        "skipped": len(tracks) - len(pending),
+        **counts,
+        "progress": str(progress),
+        "elapsed_s": round(time.perf_counter() - started_at, 2),
+    }
+
+
+def main(argv: list[str]) -> int:
+    """执行 prewarm 子命令。
+
+    Args:
+        argv: prewarm 之后的命令行参数。
+    Returns:
+        int: 进程退出码；有曲目因临时错误未完成时返回 1，可再次运行继续。
+    """
+    parser = argparse.ArgumentParser(prog="lyrics_fetcher.py prewarm", description="Prefetch lyrics into the cache")
+    parser.add_argument("source", help="M3U/M3U8 播放列表、CSV 文件（标题,艺术家,专辑,时长）或音乐目录")
+    parser.add_argument("--workers", type=int, default=DEFAULT_WORKERS, help="并发曲目数")
+    parser.add_argument("--rate", type=float, default=DEFAULT_REQUESTS_PER_SECOND, help="每秒请求 lrclib.net 的次数上限")
+    parser.add_argument("--restart", action="store_true", help="忽略之前的进度从头开始")
+    args = parser.parse_args(argv)
+
+    source = Path(args.source).expanduser()
+    if not source.exists():
+        print(json.dumps({"success": False, "error": f"Not found: {source}"}))
+        return 1
+
+    try:
+        summary = prewarm(source, args.workers, args.rate, args.restart)
+    except KeyboardInterrupt:
+        print(json.dumps({"success": False, "error": "Interrupted, run again to resume"}))
+        return 130
+    print(json.dumps(summary, ensure_ascii=False))
+    return 0 if summary["success"] else 1
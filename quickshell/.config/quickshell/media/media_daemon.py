@@ -0,0 +1,481 @@
+#!/usr/bin/env python3
+"""媒体状态后台同步循环，只在 daemon 子命令中导入，避免 snapshot 等短命令加载 asyncio。"""
+
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import json
+import os
+import signal
+import socket
+import sys
+import time
+from collections import OrderedDict
+from typing import Any, Callable
+
+import lyrics_local
+import media_metrics
+from lyrics_fetcher import close_lrclib_clients, fetch_lyrics
+from media_state import (
+    POLL_INTERVAL_SECONDS,
+    StateWriter,
+    instance_lock_name,
+    lyrics_line_deadline,
+    read_players_playerctl,
+    refresh_lyrics_line,
+    snapshot_for_current_player,
+    socket_path,
+    write_pid,
+)
+from media_subscribers import SubscriberHub
+
+
+IDLE_EXIT_SECONDS = 30 * 60
+IDLE_BACKOFF_MAX_SECONDS = 8.0
+IDLE_WAKE_SECONDS = 60 * 60
+LYRICS_RESULT_CACHE_SIZE = 16
+LOCAL_LYRICS_RESCAN_SECONDS = 15 * 60
+LYRICS_ERROR_RETRY_SECONDS = 60
+SYSTEMD_LISTEN_FD = 3
+
+
+class PlayerctlSource:
+    """通过 playerctl 轮询读取播放器状态的数据源，用于 D-Bus 不可用时回退。"""
+
+    name = "playerctl"
+    poll_interval = POLL_INTERVAL_SECONDS
+    push_events = False
+
+    def __init__(self) -> None:
+        """初始化数据源。
+
+        Args:
+            无。
+        Returns:
+            None: 无返回值。
+        """
+        self.changed = asyncio.Event()
+        self.follower: asyncio.subprocess.Process | None = None
+        self.follow_task: asyncio.Task[None] | None = None
+
+    async def start(self) -> None:
+        """启动 playerctl --follow 监听进程，播放状态或曲目变化时立即唤醒。
+
+        Args:
+            无。
+        Returns:
+            None: 无返回值。
+        """
+        try:
+            self.follower = await asyncio.create_subprocess_exec(
+                "playerctl",
+                "--all-players",
+                "--follow",
+                "metadata",
+                "--format",
+                "{{playerInstance}} {{status}} {{title}}",
+                stdout=asyncio.subprocess.PIPE,
+                stderr=asyncio.subprocess.DEVNULL,
+            )
+        except OSError:
+            # 【媒体组件】【数据源】无法启动监听进程时只依赖退避轮询
+            return
+        self.follow_task = asyncio.get_running_loop().create_task(self.follow())
+
+    async def follow(self) -> None:
+        """读取监听进程输出，每行变化都唤醒后台循环。
+
+        Args:
+            无。
+        Returns:
+            None: 无返回值。
+        """
+        assert self.follower is not None and self.follower.stdout is not None
+        while True:
+            line = await self.follower.stdout.readline()
+            if not line:
+                return
+            self.changed.set()
+
+    async def read_players(self) -> list[dict[str, Any]]:
+        """读取所有播放器信息。
+
+        Args:
+            无。
+        Returns:
+            list[dict[str, Any]]: 播放器信息列表。
+        """
+        self.changed.clear()
+        return await asyncio.to_thread(read_players_playerctl)
+
+    async def wait_changed(self, timeout: float) -> bool:
+        """等待下一次轮询或被主动唤醒。
+
+        Args:
+            timeout: 最长等待时间，单位为秒。
+        Returns:
+            bool: 被主动唤醒时返回 True，超时返回 False。
+        """
+        try:
+            await asyncio.wait_for(self.changed.wait(), max(timeout, 0))
+        except asyncio.TimeoutError:
+            return False
+        return True
+
+    async def close(self) -> None:
+        """释放数据源资源。
+
+        Args:
+            无。
+        Returns:
+            None: 无返回值。
+        """
+        if self.follow_task is not None:
+            self.follow_task.cancel()
+            self.follow_task = None
+        if self.follower is not None and self.follower.returncode is None:
+            self.follower.kill()
+            await self.follower.wait()
+        self.follower = None
+
+
+async def rescan_local_lyrics() -> None:
+    """启动后及之后定期增量更新本地歌词索引。
+
+    Args:
+        无。
+    Returns:
+        None: 无返回值。
+    """
+    while True:
+        try:
+            await asyncio.to_thread(lyrics_local.rescan)
+        except Exception:
+            # 【媒体组件】【本地歌词】索引失败只影响本地歌词来源，下次定时扫描重试
+            media_metrics.count("lyrics_local_rescan_errors")
+        await asyncio.sleep(LOCAL_LYRICS_RESCAN_SECONDS)
+
+
+async def open_player_source() -> Any:
+    """打开播放器数据源，优先使用 D-Bus 信号订阅，失败时回退到 playerctl 轮询。
+
+    Args:
+        无。
+    Returns:
+        Any: 播放器数据源，提供 read_players、wait_changed 和 close 方法。
+    """
+    if os.environ.get("QS_MEDIA_BACKEND", "") != "playerctl":
+        try:
+            from mpris_watcher import MprisWatcher
+
+            watcher = MprisWatcher()
+            await watcher.start()
+            return watcher
+        except Exception:
+            # 【媒体组件】【数据源】缺少 dbus-next 或会话总线不可用时回退到 playerctl
+            pass
+
+    source = PlayerctlSource()
+    await source.start()
+    return source
+
+
+def idle_poll_interval(source: Any, idle_polls: int) -> float:
+    """计算暂停或停止时下一次读取播放器前的等待时间。
+
+    Args:
+        source: 播放器数据源。
+        idle_polls: 进入空闲后已经连续读取的次数。
+    Returns:
+        float: 等待时间，单位为秒。
+    """
+    if source.push_events:
+        return IDLE_WAKE_SECONDS
+    # 【媒体组件】【后台状态】轮询数据源按 0.5、1、2、4 秒指数退避，直到上限
+    return min(source.poll_interval * (2 ** min(idle_polls, 16)), IDLE_BACKOFF_MAX_SECONDS)
+
+
+class LyricsWorker:
+    """在后台线程获取歌词，按曲目键缓存最近的结果，切换播放器时无需重新请求。"""
+
+    def __init__(self, on_ready: Callable[[], None], capacity: int = LYRICS_RESULT_CACHE_SIZE) -> None:
+        """初始化歌词后台任务。
+
+        Args:
+            on_ready: 歌词获取完成后调用的回调，用于唤醒后台循环。
+            capacity: 最多缓存的歌词结果数量。
+        Returns:
+            None: 无返回值。
+        """
+        self.on_ready = on_ready
+        self.capacity = capacity
+        self.results: OrderedDict[str, dict[str, Any]] = OrderedDict()
+        self.tasks: dict[str, asyncio.Task] = {}
+
+    def request(self, track: dict[str, Any]) -> dict[str, Any] | None:
+        """读取曲目的歌词结果，尚未缓存且没有进行中的请求时启动后台请求。
+
+        Args:
+            track: 曲目信息。
+        Returns:
+            dict[str, Any] | None: 歌词请求结果；仍在加载时返回 None。
+        """
+        key = track["key"]
+        result = self.results.get(key)
+        # 【媒体组件】【歌词任务】未获取到歌词的结果到达重试时间后重新请求，避免临时错误在本次运行中一直生效
+        if result is not None and time.time() >= result.get("retry_at", float("inf")):
+            del self.results[key]
+            result = None
+        if result is not None:
+            self.results.move_to_end(key)
+            return result
+
+        if key not in self.tasks:
+            media_metrics.count("lyrics_lru_miss")
+            self.tasks[key] = asyncio.get_running_loop().create_task(self.fetch(dict(track)))
+        return None
+
+    def ready(self, key: str) -> bool:
+        """判断曲目的歌词结果是否已缓存。
+
+        Args:
+            key: 曲目键。
+        Returns:
+            bool: 已缓存时返回 True。
+        """
+        return key in self.results
+
+    def retain(self, keys: set[str]) -> None:
+        """取消不再属于任何播放器当前曲目的请求，已缓存结果保留在 LRU 中。
+
+        Args:
+            keys: 各播放器当前曲目的键。
+        Returns:
+            None: 无返回值。
+        """
+        for key in [key for key in self.tasks if key not in keys]:
+            self.tasks.pop(key).cancel()
+
+    async def fetch(self, track: dict[str, Any]) -> None:
+        """在线程池中获取歌词并写入 LRU。
+
+        Args:
+            track: 曲目信息。
+        Returns:
+            None: 无返回值。
+        """
+        try:
+            with media_metrics.timed("lyrics_fetch"):
+                result = await asyncio.to_thread(
+                    fetch_lyrics,
+                    track["title"],
+                    track["artist"],
+                    track["album"],
+                    float(track.get("length", 0) or 0),
+                    track["player"],
+                )
+        except Exception as e:
+            # 【媒体组件】【歌词任务】缓存或本地索引出错时也保存失败结果，避免界面一直加载且每次唤醒都重新请求
+            media_metrics.count("lyrics_fetch_errors")
+            result = {"success": False, "error": str(e), "retry_at": time.time() + LYRICS_ERROR_RETRY_SECONDS}
+        finally:
+            self.tasks.pop(track["key"], None)
+
+        # 【媒体组件】【歌词任务】结果按曲目键保存，切歌后返回的结果留给切回该曲目时使用
+        self.results[track["key"]] = result
+        self.results.move_to_end(track["key"])
+        while len(self.results) > self.capacity:
+            self.results.popitem(last=False)
+        self.on_ready()
+
+    def cancel(self) -> None:
+        """取消所有正在进行的歌词请求。
+
+        Args:
+            无。
+        Returns:
+            None: 无返回值。
+        """
+        for task in self.tasks.values():
+            task.cancel()
+        self.tasks.clear()
+
+
+def acquire_instance_lock() -> socket.socket | None:
+    """绑定抽象命名空间套接字作为单实例锁。
+
+    Args:
+        无。
+    Returns:
+        socket.socket | None: 持有锁的套接字，进程退出时由内核自动释放；已有实例运行时返回 None。
+    """
+    lock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        lock.bind(f"\0{instance_lock_name()}")
+    except OSError:
+        lock.close()
+        return None
+    return lock
+
+
+def systemd_listen_socket() -> socket.socket | None:
+    """读取 systemd 套接字激活传入的监听套接字；设置了 LISTEN_FDS 但 LISTEN_PID 不是本进程时抛出 RuntimeError。
+
+    Args:
+        无。
+    Returns:
+        socket.socket | None: 已监听的 Unix 套接字；不是由 systemd 激活时返回 None。
+    """
+    if "LISTEN_FDS" not in os.environ:
+        return None
+    listen_pid = os.environ.get("LISTEN_PID", "")
+    # 【媒体组件】【后台状态】经 uv run 等包装进程启动时套接字属于包装进程；此时若自行重建套接字会删掉 systemd 管理的路径，之后再也无法激活
+    if listen_pid != str(os.getpid()):
+        raise RuntimeError(
+            f"LISTEN_FDS is set for pid {listen_pid or '?'}, not {os.getpid()}; "
+            "start the daemon with the interpreter directly instead of through a wrapper"
+        )
+    try:
+        count = int(os.environ.get("LISTEN_FDS", "0"))
+    except ValueError:
+        count = 0
+    # 【媒体组件】【后台状态】清理环境变量，避免子进程误认为自己也被套接字激活
+    for name in ("LISTEN_PID", "LISTEN_FDS", "LISTEN_FDNAMES"):
+        os.environ.pop(name, None)
+    if count < 1:
+        return None
+    return socket.socket(fileno=SYSTEMD_LISTEN_FD)
+
+
+async def run_daemon(listen_socket: socket.socket | None = None) -> None:
+    """运行媒体状态后台同步循环。
+
+    Args:
+        listen_socket: systemd 传入的监听套接字；为 None 时自行创建。
+    Returns:
+        None: 无返回值。
+    """
+    write_pid()
+    # 【媒体组件】【后台状态】收到 SIGTERM 时取消主任务，保证退出前写出统计
+    asyncio.get_running_loop().add_signal_handler(signal.SIGTERM, asyncio.current_task().cancel)
+    source = await open_player_source()
+    writer = StateWriter()
+    poll = {"source": source.name, "reads": 0, "interval": source.poll_interval}
+
+    def daemon_stats() -> dict[str, Any]:
+        """汇总订阅、轮询和运行计数统计。
+
+        Args:
+            无。
+        Returns:
+            dict[str, Any]: 附加统计。
+        """
+        return {
+            "subscribers": hub.stats(),
+            "poll": dict(poll),
+            "selected_player": selection["player"],
+            "lyrics_cached": len(lyrics.results),
+            "metrics": media_metrics.snapshot(),
+        }
+
+    selection = {"player": ""}
+
+    def select_player(name: str) -> None:
+        """记录订阅方选择的播放器并唤醒后台循环。
+
+        Args:
+            name: 播放器名称，空字符串表示自动选择。
+        Returns:
+            None: 无返回值。
+        """
+        selection["player"] = name
+        source.changed.set()
+
+    hub = SubscriberHub(
+        source.changed.set,
+        lambda: {**writer.stats(), **daemon_stats(), "updated_at": time.time()},
+        select_player,
+    )
+    await hub.start(socket_path(), listen_socket)
+    lyrics = LyricsWorker(source.changed.set)
+    local_index = asyncio.get_running_loop().create_task(rescan_local_lyrics())
+    idle_started_at = 0.0
+    idle_polls = 0
+    snapshot: dict[str, Any] | None = None
+    next_poll_at = 0.0
+    changed = True
+
+    try:
+        while True:
+            tick_started_at = time.perf_counter()
+            if snapshot is None or changed or time.monotonic() >= next_poll_at:
+                media_metrics.count("wake_changed" if changed else "wake_poll")
+                players = await source.read_players()
+                poll["reads"] += 1
+                snapshot = snapshot_for_current_player(players, lyrics, selection["player"])
+                writer.write(snapshot)
+
+                if snapshot.get("active") and snapshot.get("playback", {}).get("playing"):
+                    idle_started_at = 0.0
+                    idle_polls = 0
+                    poll["interval"] = source.poll_interval
+                else:
+                    if idle_started_at <= 0:
+                        idle_started_at = time.time()
+                    # 【媒体组件】【后台状态】1. 信号驱动的数据源空闲时几乎没有开销，常驻不退出；轮询数据源长时间空闲后才退出
+                    if not source.push_events and time.time() - idle_started_at >= IDLE_EXIT_SECONDS:
+                        break
+                    # 【媒体组件】【后台状态】2. 收到变化信号后回到最快间隔，之后继续退避
+                    if changed:
+                        idle_polls = 0
+                    poll["interval"] = idle_poll_interval(source, idle_polls)
+                    idle_polls += 1
+                next_poll_at = time.monotonic() + poll["interval"]
+                hub.publish(snapshot)
+                media_metrics.observe("tick", time.perf_counter() - tick_started_at)
+            else:
+                # 【媒体组件】【歌词调度】1. 歌词行边界唤醒时只按锚点推算，不重新读取播放器
+                media_metrics.count("wake_lyric_line")
+                snapshot = refresh_lyrics_line(snapshot)
+                hub.publish(snapshot)
+
+            writer.flush_stats(extra=daemon_stats)
+
+            # 【媒体组件】【歌词调度】2. 有订阅方时精确睡到下一句歌词开始，否则只等待下一次读取或信号
+            wait = next_poll_at - time.monotonic()
+            deadline = lyrics_line_deadline(snapshot) if hub.subscribers else None
+            if deadline is not None:
+                wait = min(wait, deadline)
+            changed = await source.wait_changed(wait)
+    finally:
+        local_index.cancel()
+        lyrics.cancel()
+        close_lrclib_clients()
+        # 【媒体组件】【运行统计】退出前强制写出统计，停止后仍可通过 stats 子命令查看
+        writer.flush_stats(force=True, extra=daemon_stats)
+        await hub.close()
+        await source.close()
+
+
+def daemon_loop() -> None:
+    """运行媒体状态后台同步循环的同步入口。
+
+    Args:
+        无。
+    Returns:
+        None: 无返回值。
+    """
+    try:
+        listen_socket = systemd_listen_socket()
+    except RuntimeError as e:
+        print(json.dumps({"success": False, "error": str(e)}), file=sys.stderr)
+        sys.exit(1)
+
+    lock = acquire_instance_lock()
+    if lock is None:
+        # 【媒体组件】【后台状态】已有实例持有锁时直接退出，同时启动的多个进程最终只保留一个
+        return
+
+    with lock, contextlib.suppress(asyncio.CancelledError):
+        asyncio.run(run_daemon(listen_socket))
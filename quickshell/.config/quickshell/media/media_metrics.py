@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+"""媒体组件运行计数与耗时直方图，供 stats 子命令查看后台脚本的耗时分布。"""
+
+from __future__ import annotations
+
+import bisect
+import contextlib
+import time
+from typing import Any, Iterator
+
+
+LATENCY_BUCKETS_MS = [0.5, 1, 2, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000]
+
+counters: dict[str, int] = {}
+histograms: dict[str, dict[str, Any]] = {}
+
+
+def count(name: str, value: int = 1) -> None:
+    """累加计数器。
+
+    Args:
+        name: 计数器名称。
+        value: 累加值。
+    Returns:
+        None: 无返回值。
+    """
+    counters[name] = counters.get(name, 0) + value
+
+
+def observe(name: str, seconds: float) -> None:
+    """记录一次耗时样本。
+
+    Args:
+        name: 直方图名称。
+        seconds: 耗时，单位为秒。
+    Returns:
+        None: 无返回值。
+    """
+    histogram = histograms.get(name)
+    if histogram is None:
+        # 【媒体组件】【运行统计】最后一个桶收集超过最大边界的样本
+        histogram = {"count": 0, "sum_ms": 0.0, "max_ms": 0.0, "buckets": [0] * (len(LATENCY_BUCKETS_MS) + 1)}
+        histograms[name] = histogram
+
+    value_ms = seconds * 1000
+    histogram["count"] += 1
+    histogram["sum_ms"] += value_ms
+    histogram["max_ms"] = max(histogram["max_ms"], value_ms)
+    histogram["buckets"][bisect.bisect_left(LATENCY_BUCKETS_MS, value_ms)] += 1
+
+
+@contextlib.contextmanager
+def timed(name: str) -> Iterator[None]:
+    """统计代码块耗时，异常退出时同样记录。
+
+    Args:
+        name: 直方图名称。
+    Returns:
+        Iterator[None]: 上下文管理器。
+    """
+    started_at = time.perf_counter()
+    try:
+        yield
+    finally:
+        observe(name, time.perf_counter() - started_at)
+
+
+def bucket_percentile(histogram: dict[str, Any], ratio: float) -> float:
+    """按桶边界估算分位数。
+
+    Args:
+        histogram: 直方图数据。
+        ratio: 分位比例，取值 0 到 1。
+    Returns:
+        float: 分位数所在桶的上边界，单位为毫秒；落在溢出桶时返回最大值。
+    """
+    target = ratio * histogram["count"]
+    seen = 0
+    for index, bucket_count in enumerate(histogram["buckets"]):
+        seen += bucket_count
+        if bucket_count and seen >= target:
+            if index < len(LATENCY_BUCKETS_MS):
+                return min(LATENCY_BUCKETS_MS[index], histogram["max_ms"])
+            break
+    return histogram["max_ms"]
+
+
+def snapshot() -> dict[str, Any]:
+    """生成可序列化的统计快照。
+
+    Args:
+        无。
+    Returns:
+        dict[str, Any]: 计数器和各直方图的次数、平均值、分位数与非空桶。
+    """
+    latency: dict[str, Any] = {}
+    for name, histogram in sorted(histograms.items()):
+        buckets = {}
+        for index, bucket_count in enumerate(histogram["buckets"]):
+            if not bucket_count:
+                continue
+            label = f"<={LATENCY_BUCKETS_MS[index]:g}" if index < len(LATENCY_BUCKETS_MS) else f">{LATENCY_BUCKETS_MS[-1]:g}"
+            buckets[label] = bucket_count
+        latency[name] = {
+            "count": histogram["count"],
+            "mean_ms": round(histogram["sum_ms"] / max(histogram["count"], 1), 3),
+            "p50_ms": round(bucket_percentile(histogram, 0.5), 3),
+            "p95_ms": round(bucket_percentile(histogram, 0.95), 3),
+            "max_ms": round(histogram["max_ms"], 3),
+            "total_ms": round(histogram["sum_ms"], 3),
+            "buckets": buckets,
+        }
+    return {"counters": dict(sorted(counters.items())), "latency": latency}
+
+
+def reset() -> None:
+    """清空所有计数和直方图。
+
+    Args:
+        无。
+    Returns:
+        None: 无返回值。
+    """
+    counters.clear()
+    histograms.clear()
@@ -4,20 +4,43 @@
 from __future__ import annotations
 
 import argparse
+import contextlib
+import hashlib
 import json
 import os
+import socket
 import subprocess
 import sys
 import time
 from pathlib import Path
-from typing import Any
+from typing import TYPE_CHECKING, Any, Callable
 
-from lyrics_fetcher import fetch_lyrics, get_current_line
+import media_metrics
+from lyrics_fetcher import get_current_line
+
+if TYPE_CHECKING:
+    from media_daemon import LyricsWorker
 
 
 STATE_VERSION = 1
 POLL_INTERVAL_SECONDS = 0.5
-IDLE_EXIT_SECONDS = 180
+SEEK_TOLERANCE_SECONDS = 1.0
+LYRIC_DEADLINE_SLACK_SECONDS = 0.01
+STATS_FLUSH_SECONDS = 30
+LYRICS_PAYLOAD_KEEP = 8
+LIVENESS_TIMEOUT_SECONDS = 0.2
+INSTANCE_LOCK_NAME = "quickshell-media-state"
+STATS_QUERY_TIMEOUT_SECONDS = 2.0
+PLAYERCTL_FIELD_SEPARATOR = "\x1f"
+PLAYERCTL_BATCH_FIELDS = [
+    "playerInstance",
+    "status",
+    "position",
+    "mpris:length",
+    "title",
+    "artist",
+    "album",
+]
 
 
 def runtime_dir() -> Path:
@@ -44,6 +67,63 @@ def state_path() -> Path:
     return runtime_dir() / "media-state.json"
 
 
+def lyrics_payload_dir() -> Path:
+    """获取按曲目保存的歌词内容目录。
+
+    Args:
+        无。
+    Returns:
+        Path: 歌词内容目录路径。
+    """
+    return runtime_dir() / "media-lyrics"
+
+
+def lyrics_payload_name(key: str) -> str:
+    """根据曲目标识生成歌词内容文件名。
+
+    Args:
+        key: track_key 生成的曲目标识。
+    Returns:
+        str: 歌词内容文件名。
+    """
+    return hashlib.sha1(key.encode("utf-8")).hexdigest() + ".json"
+
+
+def stats_path() -> Path:
+    """获取后台脚本统计文件路径。
+
+    Args:
+        无。
+    Returns:
+        Path: 统计文件路径。
+    """
+    return runtime_dir() / "media-state-stats.json"
+
+
+def socket_path() -> Path:
+    """获取媒体状态订阅套接字路径。
+
+    Args:
+        无。
+    Returns:
+        Path: Unix 套接字路径。
+    """
+    return runtime_dir() / "media-state.sock"
+
+
+def instance_lock_name() -> str:
+    """获取后台脚本单实例锁使用的抽象命名空间套接字名称。
+
+    Args:
+        无。
+    Returns:
+        str: 套接字名称，不含开头的空字节。
+    """
+    # 【媒体组件】【后台状态】锁名包含运行时目录，基准测试使用独立目录时不会与正在使用的后台冲突
+    scope = hashlib.sha1(str(runtime_dir()).encode("utf-8")).hexdigest()[:12]
+    return f"{INSTANCE_LOCK_NAME}-{os.getuid()}-{scope}"
+
+
 def pid_path() -> Path:
     """获取后台状态脚本 PID 文件路径。
 
@@ -106,20 +186,22 @@ def read_json_file(path: Path) -> dict[str, Any] | None:
     return data
 
 
-def write_json_file(path: Path, data: dict[str, Any]) -> None:
+def write_json_file(path: Path, data: dict[str, Any]) -> int:
     """原子写入 JSON 文件。
 
     Args:
         path: JSON 文件路径。
         data: 需要写入的数据。
     Returns:
-        None: 无返回值。
+        int: 写入的字节数。
     """
     path.parent.mkdir(parents=True, exist_ok=True)
     temp_path = path.with_suffix(".tmp")
-    with temp_path.open("w", encoding="utf-8") as state_file:
-        json.dump(data, state_file, ensure_ascii=False)
+    payload = json.dumps(data, ensure_ascii=False).encode("utf-8")
+    with temp_path.open("wb") as state_file:
+        state_file.write(payload)
     temp_path.replace(path)
+    return len(payload)
 
 
 def load_state() -> dict[str, Any]:
@@ -136,16 +218,125 @@ def load_state() -> dict[str, Any]:
     return {**inactive_state(), **data}
 
 
-def save_state(data: dict[str, Any]) -> None:
+def extrapolate_position(playback: dict[str, Any], now: float | None = None) -> float:
+    """根据进度锚点推算指定时刻的播放进度。
+
+    Args:
+        playback: 快照中的播放状态。
+        now: 推算时刻的 time.monotonic() 值；为空时使用当前时刻。
+    Returns:
+        float: 推算后的播放进度，单位为秒。
+    """
+    anchor = playback.get("anchor") or {}
+    position = float(anchor.get("position", playback.get("position", 0)) or 0)
+    if not anchor or not playback.get("playing"):
+        return position
+
+    elapsed = (time.monotonic() if now is None else now) - float(anchor.get("monotonic", 0) or 0)
+    position += float(anchor.get("rate", 1.0) or 0) * max(elapsed, 0)
+    length = float(playback.get("length", 0) or 0)
+    if length > 0:
+        position = min(position, length)
+    return position
+
+
+def current_state() -> dict[str, Any]:
+    """读取状态快照，并按锚点推算当前进度和歌词行。
+
+    Args:
+        无。
+    Returns:
+        dict[str, Any]: 推算到当前时刻的状态快照。
+    """
+    data = load_state()
+    data["daemon_alive"] = daemon_alive()
+    playback = data.get("playback") or {}
+    if not data.get("active") or not playback:
+        return data
+
+    # 【媒体组件】【进度锚点】1. 后台只在状态变化时写入，读取时再推算当前进度
+    position = extrapolate_position(playback)
+    playback["position"] = position
+
+    # 【媒体组件】【进度锚点】2. 热状态文件不含歌词内容，按引用合并后再由读取方计算当前行
+    lyrics = data.get("lyrics") or {}
+    if lyrics.get("payload"):
+        lyrics.update(load_lyrics_payload(str(lyrics["payload"])))
+    if lyrics.get("synced") and lyrics.get("lines"):
+        lyrics.update(current_line_fields(get_current_line(lyrics["lines"], position)))
+    return data
+
+
+def load_lyrics_payload(name: str) -> dict[str, Any]:
+    """读取按曲目保存的歌词内容。
+
+    Args:
+        name: 歌词内容文件名。
+    Returns:
+        dict[str, Any]: 包含 lines 和 text 的歌词内容；读取失败时返回空列表和空文本。
+    """
+    data = read_json_file(lyrics_payload_dir() / Path(name).name) or {}
+    lines = data.get("lines")
+    return {
+        "lines": lines if isinstance(lines, list) else [],
+        "text": str(data.get("text", "")),
+    }
+
+
+def split_lyrics_payload(snapshot: dict[str, Any]) -> tuple[dict[str, Any], dict[str, Any] | None]:
+    """把快照拆分为热状态和按曲目保存的静态歌词内容。
+
+    Args:
+        snapshot: 完整媒体状态快照。
+    Returns:
+        tuple[dict[str, Any], dict[str, Any] | None]: 热状态快照和歌词内容；歌词未加载时歌词内容为 None。
+    """
+    lyrics = snapshot.get("lyrics") or {}
+    hot_lyrics = {key: value for key, value in lyrics.items() if key not in ("lines", "text")}
+    hot = {**snapshot, "lyrics": hot_lyrics}
+    if not lyrics.get("loaded"):
+        return hot, None
+
+    key = str((snapshot.get("track") or {}).get("key", ""))
+    lines = lyrics.get("lines") or []
+    hot_lyrics["payload"] = lyrics_payload_name(key)
+    hot_lyrics["line_count"] = len(lines)
+    payload = {
+        "track_key": key,
+        "synced": bool(lyrics.get("synced")),
+        "lines": lines,
+        "text": str(lyrics.get("text", "")),
+    }
+    return hot, payload
+
+
+def prune_lyrics_payloads(keep: int = LYRICS_PAYLOAD_KEEP) -> None:
+    """只保留最近写入的若干首歌词内容文件。
+
+    Args:
+        keep: 保留的文件数量。
+    Returns:
+        None: 无返回值。
+    """
+    try:
+        paths = sorted(lyrics_payload_dir().glob("*.json"), key=lambda path: path.stat().st_mtime, reverse=True)
+    except OSError:
+        return
+    for path in paths[keep:]:
+        path.unlink(missing_ok=True)
+
+
+def save_state(data: dict[str, Any]) -> int:
     """保存当前媒体状态快照。
 
     Args:
         data: 当前状态快照。
     Returns:
-        None: 无返回值。
+        int: 写入的字节数。
     """
     data["updated_at"] = time.time()
-    write_json_file(state_path(), data)
+    with media_metrics.timed("save_state"):
+        return write_json_file(state_path(), data)
 
 
 def run_playerctl(args: list[str], timeout: float = 2) -> subprocess.CompletedProcess[str] | None:
@@ -158,14 +349,16 @@ def run_playerctl(args: list[str], timeout: float = 2) -> subprocess.CompletedPr
         subprocess.CompletedProcess[str] | None: 命令结果；执行失败时返回 None。
     """
     try:
-        return subprocess.run(
-            ["playerctl", *args],
-            capture_output=True,
-            text=True,
-            timeout=timeout,
-            check=False,
-        )
+        with media_metrics.timed("playerctl"):
+            return subprocess.run(
+                ["playerctl", *args],
+                capture_output=True,
+                text=True,
+                timeout=timeout,
+                check=False,
+            )
     except (FileNotFoundError, subprocess.SubprocessError):
+        media_metrics.count("playerctl_errors")
         return None
 
 
@@ -326,6 +519,156 @@ def read_track(player: str) -> dict[str, Any]:
     }
 
 
+def read_player(player: str) -> dict[str, Any]:
+    """读取单个播放器的状态、进度和曲目信息。
+
+    Args:
+        player: playerctl 播放器名称。
+    Returns:
+        dict[str, Any]: 播放器信息，字段与 MPRIS 数据源保持一致。
+    """
+    track = read_track(player)
+    return {
+        "player": player,
+        "status": player_status(player),
+        "title": track["title"],
+        "artist": track["artist"],
+        "album": track["album"],
+        "length": track["length"],
+        "position": playback_position(player),
+        "rate": 1.0,
+    }
+
+
+def playerctl_batch_format() -> str:
+    """生成批量查询所有播放器时使用的 playerctl 模板。
+
+    Args:
+        无。
+    Returns:
+        str: playerctl --format 模板，字段之间使用单元分隔符。
+    """
+    return PLAYERCTL_FIELD_SEPARATOR.join(f"{{{{{field}}}}}" for field in PLAYERCTL_BATCH_FIELDS)
+
+
+def microseconds_to_seconds(value: str) -> float:
+    """把 playerctl 输出的微秒文本转换为秒。
+
+    Args:
+        value: 微秒文本。
+    Returns:
+        float: 秒数；解析失败时返回 0。
+    """
+    try:
+        return float(value) / 1_000_000
+    except ValueError:
+        return 0
+
+
+def parse_batch_output(output: str) -> list[dict[str, Any]] | None:
+    """单次遍历解析批量查询输出。
+
+    Args:
+        output: playerctl -a metadata --format 的标准输出。
+    Returns:
+        list[dict[str, Any]] | None: 播放器信息列表；输出格式不符合预期时返回 None。
+    """
+    players: list[dict[str, Any]] = []
+    for line in output.splitlines():
+        if not line.strip():
+            continue
+
+        fields = line.split(PLAYERCTL_FIELD_SEPARATOR)
+        if len(fields) != len(PLAYERCTL_BATCH_FIELDS) or not fields[0].strip():
+            return None
+
+        instance, status, position, length, title, artist, album = fields
+        players.append({
+            "player": instance.strip(),
+            "status": status.strip(),
+            "title": title.strip(),
+            "artist": artist.strip(),
+            "album": album.strip(),
+            "length": microseconds_to_seconds(length.strip()),
+            "position": microseconds_to_seconds(position.strip()),
+            "rate": 1.0,
+        })
+    return players
+
+
+def read_players_batched() -> list[dict[str, Any]] | None:
+    """通过一次 playerctl 调用读取所有播放器的状态、进度和曲目信息。
+
+    Args:
+        无。
+    Returns:
+        list[dict[str, Any]] | None: 播放器信息列表；当前 playerctl 不支持批量模板时返回 None。
+    """
+    result = run_playerctl(["-a", "metadata", "--format", playerctl_batch_format()])
+    if result is None:
+        return None
+    if result.returncode != 0:
+        # 【媒体组件】【批量查询】没有播放器时 playerctl 以非零状态退出，视为空列表；其他错误可能是旧版不支持 -a 或 --format，交给逐字段查询
+        if "No players found" in result.stderr:
+            return []
+        media_metrics.count("playerctl_batch_errors")
+        return None
+    return parse_batch_output(result.stdout)
+
+
+def read_players_individually() -> list[dict[str, Any]]:
+    """逐字段调用 playerctl 读取当前活动播放器信息。
+
+    Args:
+        无。
+    Returns:
+        list[dict[str, Any]]: 播放器信息列表；只包含当前活动播放器。
+    """
+    player = active_player()
+    if not player:
+        return []
+    return [read_player(player)]
+
+
+def read_players_playerctl() -> list[dict[str, Any]]:
+    """读取播放器信息，优先单次批量查询，旧版 playerctl 回退到逐字段查询。
+
+    Args:
+        无。
+    Returns:
+        list[dict[str, Any]]: 播放器信息列表。
+    """
+    players = read_players_batched()
+    if players is None:
+        return read_players_individually()
+    return players
+
+
+def choose_player(players: list[dict[str, Any]], preferred: str = "") -> dict[str, Any] | None:
+    """选择当前媒体组件应该展示的播放器信息。
+
+    Args:
+        players: 播放器信息列表。
+        preferred: 订阅方选择的播放器名称；为空或该播放器已退出时自动选择。
+    Returns:
+        dict[str, Any] | None: 播放器信息；没有可用播放器时返回 None。
+    """
+    if not players:
+        return None
+
+    for player in players:
+        if preferred and player.get("player") == preferred:
+            return player
+
+    # 【媒体组件】【播放器选择】1. 优先选择正在播放的播放器，避免暂停实例抢占状态
+    for player in players:
+        if str(player.get("status", "")).lower() == "playing":
+            return player
+
+    # 【媒体组件】【播放器选择】2. 没有播放中的实例时保留第一个可用播放器状态
+    return players[0]
+
+
 def lyrics_loading_state() -> dict[str, Any]:
     """生成歌词加载中状态。
 
@@ -346,6 +689,23 @@ def lyrics_loading_state() -> dict[str, Any]:
     }
 
 
+def current_line_fields(line_state: dict[str, Any]) -> dict[str, Any]:
+    """把 get_current_line 的结果转换为歌词状态中的当前行字段。
+
+    Args:
+        line_state: get_current_line 返回的当前行信息。
+    Returns:
+        dict[str, Any]: 当前行下标、文本、下一行文本以及当前行的翻译和音译。
+    """
+    return {
+        "current_index": int(line_state.get("index", -1)),
+        "current_text": str(line_state.get("text", "")),
+        "next_text": str(line_state.get("next_text", "")),
+        "current_translation": str(line_state.get("translation", "")),
+        "current_romanization": str(line_state.get("romanization", "")),
+    }
+
+
 def build_lyrics_state(result: dict[str, Any], position: float) -> dict[str, Any]:
     """根据歌词请求结果构建展示状态。
 
@@ -375,9 +735,7 @@ def build_lyrics_state(result: dict[str, Any], position: float) -> dict[str, Any
             "error": "",
             "synced": True,
             "lines": result["lines"],
-            "current_index": int(line_state.get("index", -1)),
-            "current_text": str(line_state.get("text", "")),
-            "next_text": str(line_state.get("next_text", "")),
+            **current_line_fields(line_state),
         }
 
     return {
@@ -393,7 +751,13 @@ def build_lyrics_state(result: dict[str, Any], position: float) -> dict[str, Any
     }
 
 
-def base_snapshot(player: str, track: dict[str, Any], position: float, status: str) -> dict[str, Any]:
+def base_snapshot(
+    player: str,
+    track: dict[str, Any],
+    position: float,
+    status: str,
+    rate: float = 1.0,
+) -> dict[str, Any]:
     """生成不含歌词结果的媒体状态快照。
 
     Args:
@@ -401,8 +765,9 @@ def base_snapshot(player: str, track: dict[str, Any], position: float, status: s
         track: 曲目信息。
         position: 当前播放进度，单位为秒。
         status: 播放状态文本。
+        rate: 播放速率。
     Returns:
-        dict[str, Any]: 媒体状态快照。
+        dict[str, Any]: 媒体状态快照，playback.anchor 供读取方推算实时进度。
     """
     return {
         "success": True,
@@ -415,50 +780,93 @@ def base_snapshot(player: str, track: dict[str, Any], position: float, status: s
             "playing": status.lower() == "playing",
             "position": position,
             "length": float(track.get("length", 0) or 0),
+            "rate": rate,
+            "anchor": {
+                "position": position,
+                "rate": rate,
+                "monotonic": time.monotonic(),
+                "wall": time.time(),
+            },
         },
         "lyrics": lyrics_loading_state(),
         "updated_at": time.time(),
     }
 
 
-def snapshot_for_current_player(last_lyrics: dict[str, Any] | None = None) -> tuple[dict[str, Any], dict[str, Any] | None]:
-    """读取当前播放器并生成状态快照。
+def player_track(info: dict[str, Any]) -> dict[str, Any]:
+    """从播放器信息中提取曲目信息。
 
     Args:
-        last_lyrics: 上一次曲目的歌词状态缓存。
+        info: 数据源返回的单个播放器信息。
     Returns:
-        tuple[dict[str, Any], dict[str, Any] | None]: 状态快照和可复用歌词缓存。
+        dict[str, Any]: 曲目信息。
     """
-    player = active_player()
-    if not player:
-        return inactive_state(), None
+    player = str(info["player"])
+    return {
+        "key": track_key(info["title"], info["artist"], info["album"], player),
+        "title": info["title"],
+        "artist": info["artist"],
+        "album": info["album"],
+        "length": float(info.get("length", 0) or 0),
+        "player": player,
+    }
 
-    status = player_status(player)
-    position = playback_position(player)
-    track = read_track(player)
-    snapshot = base_snapshot(player, track, position, status)
+
+def snapshot_for_current_player(
+    players: list[dict[str, Any]],
+    lyrics: LyricsWorker,
+    preferred: str = "",
+) -> dict[str, Any]:
+    """根据播放器信息生成当前播放器的状态快照，并附带所有播放器的摘要。
+
+    Args:
+        players: 数据源返回的播放器信息列表。
+        lyrics: 歌词后台任务；歌词未就绪时快照处于加载中状态。
+        preferred: 订阅方选择的播放器名称。
+    Returns:
+        dict[str, Any]: 状态快照。
+    """
+    # 【媒体组件】【多播放器】1. 所有有曲目的播放器都预取歌词，切换播放器时直接命中 LRU
+    summaries: list[dict[str, Any]] = []
+    current_keys: set[str] = set()
+    for info in players:
+        track = player_track(info)
+        status = str(info.get("status", ""))
+        if track["title"] and status.lower() in ("playing", "paused"):
+            current_keys.add(track["key"])
+            lyrics.request(track)
+        summaries.append({
+            "player": track["player"],
+            "status": status,
+            "track_key": track["key"],
+            "title": track["title"],
+            "artist": track["artist"],
+            "lyrics_ready": lyrics.ready(track["key"]),
+        })
+
+    info = choose_player(players, preferred)
+    # 【媒体组件】【多播放器】2. 被选中的已停止播放器也会请求歌词，保留它的请求，避免每次刷新都取消后重新发起
+    if info is not None:
+        current_keys.add(player_track(info)["key"])
+    lyrics.retain(current_keys)
+    if info is None:
+        snapshot = inactive_state()
+        snapshot["players"] = summaries
+        return snapshot
+
+    track = player_track(info)
+    status = str(info.get("status", ""))
+    position = float(info.get("position", 0) or 0)
+    snapshot = base_snapshot(track["player"], track, position, status, float(info.get("rate", 1.0) or 0))
+    snapshot["players"] = summaries
     if not snapshot["active"]:
-        return snapshot, None
-
-    if last_lyrics and last_lyrics.get("track_key") == track["key"]:
-        snapshot["lyrics"] = build_lyrics_state(last_lyrics["result"], position)
-        return snapshot, last_lyrics
-
-    # 【媒体组件】【歌词状态】1. 先写入加载中快照，使新打开的组件不会立即重复发起请求
-    save_state(snapshot)
-    result = fetch_lyrics(
-        track["title"],
-        track["artist"],
-        track["album"],
-        float(track.get("length", 0) or 0),
-        player,
-    )
-    last_lyrics = {
-        "track_key": track["key"],
-        "result": result,
-    }
-    snapshot["lyrics"] = build_lyrics_state(result, position)
-    return snapshot, last_lyrics
+        return snapshot
+
+    # 【媒体组件】【歌词状态】3. 歌词未就绪时保持加载中快照，使新打开的组件不会重复发起请求
+    result = lyrics.request(track)
+    if result is not None:
+        snapshot["lyrics"] = build_lyrics_state(result, position)
+    return snapshot
 
 
 def read_pid() -> int:
@@ -496,6 +904,43 @@ def process_alive(pid: int) -> bool:
     return True
 
 
+def daemon_alive() -> bool:
+    """通过单实例锁判断后台脚本是否存活，不连接订阅套接字。
+
+    Args:
+        无。
+    Returns:
+        bool: 后台脚本持有单实例锁时返回 True。
+    """
+    # 【媒体组件】【后台状态】读取内核的 Unix 套接字列表，不会唤醒后台循环，也不会触发 systemd 套接字激活；
+    # 锁随进程退出释放，不会把被复用的 PID 误判为存活
+    name = f"@{instance_lock_name()}"
+    try:
+        with open("/proc/net/unix", encoding="utf-8", errors="replace") as sockets:
+            return any(line.rstrip("\n").endswith(f" {name}") for line in sockets)
+    except OSError:
+        return process_alive(read_pid())
+
+
+def daemon_reachable() -> bool:
+    """通过连接订阅套接字判断后台脚本能否接受订阅。
+
+    Args:
+        无。
+    Returns:
+        bool: 套接字可连接时返回 True；使用 systemd 套接字激活时连接本身会拉起后台脚本。
+    """
+    client = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    client.settimeout(LIVENESS_TIMEOUT_SECONDS)
+    try:
+        client.connect(str(socket_path()))
+    except OSError:
+        return False
+    finally:
+        client.close()
+    return True
+
+
 def write_pid() -> None:
     """写入当前进程 PID。
 
@@ -515,10 +960,11 @@ def ensure_daemon() -> dict[str, Any]:
     Returns:
         dict[str, Any]: 启动结果。
     """
-    existing_pid = read_pid()
-    if process_alive(existing_pid):
-        return {"success": True, "running": True, "pid": existing_pid}
+    # 【媒体组件】【后台状态】后台未运行时再连接套接字，由 systemd 管理的套接字会在连接时拉起后台脚本
+    if daemon_alive() or daemon_reachable():
+        return {"success": True, "running": True, "pid": read_pid()}
 
+    # 【媒体组件】【后台状态】多个组件同时启动时可能各自拉起一个进程，由后台脚本的实例锁保证只保留一个
     script_path = Path(__file__).resolve()
     with Path(os.devnull).open("w", encoding="utf-8") as devnull:
         process = subprocess.Popen(
@@ -534,31 +980,258 @@ def ensure_daemon() -> dict[str, Any]:
     return {"success": True, "running": True, "pid": process.pid}
 
 
-def daemon_loop() -> None:
-    """运行媒体状态后台同步循环。
+def refresh_lyrics_line(snapshot: dict[str, Any]) -> dict[str, Any]:
+    """不重新读取播放器，按进度锚点推算当前歌词行。
+
+    Args:
+        snapshot: 上一次生成的快照。
+    Returns:
+        dict[str, Any]: 更新当前歌词行后的新快照；原快照不会被修改。
+    """
+    lyrics = snapshot.get("lyrics") or {}
+    if not lyrics.get("synced") or not lyrics.get("lines"):
+        return snapshot
+
+    position = extrapolate_position(snapshot.get("playback") or {})
+    line_state = get_current_line(lyrics["lines"], position)
+    return {
+        **snapshot,
+        "lyrics": {
+            **lyrics,
+            **current_line_fields(line_state),
+        },
+    }
+
+
+def lyrics_line_deadline(snapshot: dict[str, Any]) -> float | None:
+    """计算距离下一句歌词开始还有多久。
+
+    Args:
+        snapshot: 当前快照。
+    Returns:
+        float | None: 等待时间，单位为秒；未播放、没有同步歌词或已是最后一句时返回 None。
+    """
+    playback = snapshot.get("playback") or {}
+    lyrics = snapshot.get("lyrics") or {}
+    lines = lyrics.get("lines") or []
+    rate = float((playback.get("anchor") or {}).get("rate", 1.0) or 0)
+    if not playback.get("playing") or not lyrics.get("synced") or not lines or rate <= 0:
+        return None
+
+    position = extrapolate_position(playback)
+    next_index = int(get_current_line(lines, position).get("index", -1)) + 1
+    # 【媒体组件】【歌词调度】当前行之后同一时间的行不会成为当前行，等待下一个更晚的行
+    while next_index < len(lines) and float(lines[next_index]["time"]) <= position:
+        next_index += 1
+    if next_index >= len(lines):
+        return None
+
+    # 【媒体组件】【歌词调度】多等待一个极小余量，保证醒来时进度已越过行边界
+    return max((float(lines[next_index]["time"]) - position) / rate, 0) + LYRIC_DEADLINE_SLACK_SECONDS
+
+
+def snapshot_digest(snapshot: dict[str, Any]) -> str:
+    """计算快照中有实质意义部分的摘要，忽略写入时间、实时进度和当前歌词行。
+
+    Args:
+        snapshot: 媒体状态快照。
+    Returns:
+        str: 快照摘要。
+    """
+    playback = {
+        key: value
+        for key, value in (snapshot.get("playback") or {}).items()
+        if key not in ("position", "anchor")
+    }
+    lyrics = {
+        key: value
+        for key, value in (snapshot.get("lyrics") or {}).items()
+        if key not in ("current_index", "current_text", "next_text", "current_translation", "current_romanization")
+    }
+    meaningful = {
+        "success": snapshot.get("success"),
+        "active": snapshot.get("active"),
+        "track": snapshot.get("track"),
+        "playback": playback,
+        "lyrics": lyrics,
+        # 【媒体组件】【多播放器】播放器摘要不含进度，出现新播放器或后台播放器切歌、歌词就绪时都需要写入
+        "players": snapshot.get("players", []),
+    }
+    payload = json.dumps(meaningful, ensure_ascii=False, sort_keys=True).encode("utf-8")
+    return hashlib.sha1(payload).hexdigest()
+
+
+def position_jumped(previous: dict[str, Any] | None, snapshot: dict[str, Any]) -> bool:
+    """判断实际进度是否偏离上一次写入的锚点推算值，即是否发生跳转。
+
+    Args:
+        previous: 上一次写入的快照。
+        snapshot: 新生成的快照。
+    Returns:
+        bool: 发生跳转时返回 True。
+    """
+    if previous is None:
+        return True
+    previous_playback = previous.get("playback") or {}
+    position = float((snapshot.get("playback") or {}).get("position", 0) or 0)
+    return abs(extrapolate_position(previous_playback) - position) > SEEK_TOLERANCE_SECONDS
+
+
+class StateWriter:
+    """只在快照有实质变化时写入状态文件，并维护写入序号和统计。"""
+
+    def __init__(self) -> None:
+        """初始化写入器，序号从已有状态文件继续递增。
+
+        Args:
+            无。
+        Returns:
+            None: 无返回值。
+        """
+        previous = read_json_file(state_path()) or {}
+        try:
+            self.seq = int(previous.get("seq", 0) or 0)
+        except (TypeError, ValueError):
+            self.seq = 0
+        self.last_snapshot: dict[str, Any] | None = None
+        self.last_digest = ""
+        self.payload_name = ""
+        self.writes = 0
+        self.skipped_writes = 0
+        self.bytes_written = 0
+        self.lyrics_bytes_written = 0
+        self.started_at = time.time()
+        self.stats_dirty = True
+        self.stats_flushed_at = 0.0
+
+    def write(self, snapshot: dict[str, Any]) -> bool:
+        """按需写入快照，歌词内容每首只写一次，热状态文件只保留引用。
+
+        Args:
+            snapshot: 完整媒体状态快照。
+        Returns:
+            bool: 实际写入时返回 True，内容未变化而跳过时返回 False。
+        """
+        hot, payload = split_lyrics_payload(snapshot)
+        digest = snapshot_digest(hot)
+        if digest == self.last_digest and not position_jumped(self.last_snapshot, snapshot):
+            # 【媒体组件】【状态写入】跳过写入时沿用已写入的锚点和序号，使推送内容与文件保持一致
+            snapshot["seq"] = self.seq
+            previous_anchor = ((self.last_snapshot or {}).get("playback") or {}).get("anchor")
+            if previous_anchor and snapshot.get("playback"):
+                snapshot["playback"]["anchor"] = previous_anchor
+            self.skipped_writes += 1
+            self.stats_dirty = True
+            return False
+
+        # 【媒体组件】【状态写入】每次实际写入递增序号，读取方比较 seq 即可判断是否需要重新解析
+        self.seq += 1
+        snapshot["seq"] = hot["seq"] = self.seq
+        if payload is not None and hot["lyrics"]["payload"] != self.payload_name:
+            self.lyrics_bytes_written += self.write_lyrics_payload(hot["lyrics"]["payload"], payload)
+        self.bytes_written += save_state(hot)
+        snapshot["updated_at"] = hot["updated_at"]
+        self.writes += 1
+        self.last_digest = digest
+        self.last_snapshot = snapshot
+        self.stats_dirty = True
+        return True
+
+    def write_lyrics_payload(self, name: str, payload: dict[str, Any]) -> int:
+        """写入当前曲目的歌词内容文件。
+
+        Args:
+            name: 歌词内容文件名。
+            payload: 歌词内容。
+        Returns:
+            int: 写入的字节数。
+        """
+        # 【媒体组件】【歌词内容】先写歌词内容再写热状态，读取方拿到引用时文件一定已存在
+        with media_metrics.timed("lyrics_payload_write"):
+            size = write_json_file(lyrics_payload_dir() / name, payload)
+        self.payload_name = name
+        prune_lyrics_payloads()
+        return size
+
+    def stats(self) -> dict[str, Any]:
+        """生成写入统计。
+
+        Args:
+            无。
+        Returns:
+            dict[str, Any]: 写入统计。
+        """
+        return {
+            "pid": os.getpid(),
+            "started_at": self.started_at,
+            "uptime_seconds": round(time.time() - self.started_at, 3),
+            "seq": self.seq,
+            "writes": self.writes,
+            "skipped_writes": self.skipped_writes,
+            "bytes_written": self.bytes_written,
+            "lyrics_bytes_written": self.lyrics_bytes_written,
+        }
+
+    def flush_stats(self, force: bool = False, extra: Callable[[], dict[str, Any]] | None = None) -> None:
+        """把统计写入运行时目录，非强制时按固定间隔节流。
+
+        Args:
+            force: 是否忽略节流立即写入。
+            extra: 生成其他统计的函数，只在实际写入时调用。
+        Returns:
+            None: 无返回值。
+        """
+        if not self.stats_dirty:
+            return
+        if not force and time.time() - self.stats_flushed_at < STATS_FLUSH_SECONDS:
+            return
+        write_json_file(stats_path(), {**self.stats(), **(extra() if extra else {}), "updated_at": time.time()})
+        self.stats_dirty = False
+        self.stats_flushed_at = time.time()
+
+
+def query_live_stats() -> dict[str, Any] | None:
+    """通过订阅套接字向运行中的后台脚本请求实时统计。
 
     Args:
         无。
     Returns:
-        None: 无返回值。
+        dict[str, Any] | None: 实时统计；后台未运行或未响应时返回 None。
     """
-    write_pid()
-    last_lyrics: dict[str, Any] | None = None
-    idle_started_at = 0.0
+    # 【媒体组件】【运行统计】后台未运行时读取统计文件即可，不通过连接拉起后台脚本
+    if not daemon_alive():
+        return None
+    client = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    client.settimeout(STATS_QUERY_TIMEOUT_SECONDS)
+    try:
+        client.connect(str(socket_path()))
+        client.sendall(b"stats\n")
+        with client.makefile("r", encoding="utf-8") as stream:
+            # 【媒体组件】【运行统计】连接后先收到全量快照，跳过其他消息直到统计响应
+            for line in stream:
+                message = json.loads(line)
+                if message.get("type") == "stats":
+                    return message.get("stats") or {}
+    except (OSError, ValueError):
+        return None
+    finally:
+        client.close()
+    return None
 
-    while True:
-        snapshot, last_lyrics = snapshot_for_current_player(last_lyrics)
-        save_state(snapshot)
 
-        if snapshot.get("active") and snapshot.get("playback", {}).get("playing"):
-            idle_started_at = 0.0
-        else:
-            if idle_started_at <= 0:
-                idle_started_at = time.time()
-            if time.time() - idle_started_at >= IDLE_EXIT_SECONDS:
-                break
+def load_stats() -> dict[str, Any]:
+    """读取后台脚本运行统计，优先实时查询，后台未运行时读取退出前写出的统计文件。
 
-        time.sleep(POLL_INTERVAL_SECONDS)
+    Args:
+        无。
+    Returns:
+        dict[str, Any]: 运行统计；live 表示是否来自运行中的后台脚本。
+    """
+    live = query_live_stats()
+    if live is not None:
+        return {"success": True, "daemon_alive": True, "live": True, **live}
+    data = read_json_file(stats_path()) or {}
+    return {"success": True, "daemon_alive": False, "live": False, **data}
 
 
 def stop_daemon() -> dict[str, Any]:
@@ -581,6 +1254,48 @@ def stop_daemon() -> dict[str, Any]:
     return {"success": True, "stopped": True, "pid": pid}
 
 
+def subscribe() -> None:
+    """连接订阅套接字，把推送的每行 JSON 原样输出到标准输出。
+
+    Args:
+        无。
+    Returns:
+        None: 无返回值。
+    """
+    client = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        client.connect(str(socket_path()))
+    except OSError as error:
+        print_json({"type": "error", "success": False, "error": str(error)})
+        client.close()
+        return
+
+    with client, client.makefile("r", encoding="utf-8") as stream:
+        for line in stream:
+            sys.stdout.write(line)
+            sys.stdout.flush()
+
+
+def select_player(player: str) -> dict[str, Any]:
+    """通知后台脚本切换展示的播放器。
+
+    Args:
+        player: 播放器名称；为空时恢复自动选择。
+    Returns:
+        dict[str, Any]: 切换结果。
+    """
+    client = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    client.settimeout(STATS_QUERY_TIMEOUT_SECONDS)
+    try:
+        client.connect(str(socket_path()))
+        client.sendall(f"select {player}\n".encode("utf-8"))
+    except OSError as error:
+        return {"success": False, "error": str(error)}
+    finally:
+        client.close()
+    return {"success": True, "player": player}
+
+
 def print_json(data: dict[str, Any]) -> None:
     """输出 JSON 数据。
 
@@ -603,9 +1318,10 @@ def parse_args() -> argparse.Namespace:
     parser = argparse.ArgumentParser(description="QuickShell media state helper")
     parser.add_argument(
         "command",
-        choices=["ensure-daemon", "daemon", "snapshot", "stop"],
+        choices=["ensure-daemon", "daemon", "snapshot", "subscribe", "stats", "select", "stop"],
         help="需要执行的命令",
     )
+    parser.add_argument("player", nargs="?", default="", help="select 命令使用的播放器名称，省略时恢复自动选择")
     return parser.parse_args()
 
 
@@ -623,11 +1339,27 @@ def main() -> None:
         return
 
     if args.command == "daemon":
+        # 【媒体组件】【后台状态】后台循环及其 asyncio、D-Bus 依赖只在 daemon 子命令中导入
+        from media_daemon import daemon_loop
+
         daemon_loop()
         return
 
     if args.command == "snapshot":
-        print_json(load_state())
+        print_json(current_state())
+        return
+
+    if args.command == "subscribe":
+        with contextlib.suppress(KeyboardInterrupt, BrokenPipeError):
+            subscribe()
+        return
+
+    if args.command == "stats":
+        print_json(load_stats())
+        return
+
+    if args.command == "select":
+        print_json(select_player(args.player))
         return
 
     if args.command == "stop":
@@ -0,0 +1,325 @@
+#!/usr/bin/env python3
+"""媒体状态订阅套接字，向订阅方推送换行分隔的 JSON 增量。"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import socket
+from pathlib import Path
+from typing import Any, Callable
+
+
+SUBSCRIBER_QUEUE_SIZE = 64
+SUBSCRIBER_DRAIN_TIMEOUT_SECONDS = 5.0
+# 【媒体组件】【订阅推送】连接后在该时间内断开且没有发送请求的视为存活检测，不算订阅方
+SUBSCRIBER_PROBE_SECONDS = 0.05
+
+
+def encode_message(message: dict[str, Any]) -> bytes:
+    """把消息编码为一行 JSON。
+
+    Args:
+        message: 需要发送的消息。
+    Returns:
+        bytes: 以换行结尾的 UTF-8 字节串。
+    """
+    return (json.dumps(message, ensure_ascii=False) + "\n").encode("utf-8")
+
+
+def lyrics_payload(lyrics: dict[str, Any]) -> dict[str, Any]:
+    """去掉歌词状态中随进度变化的当前行字段。
+
+    Args:
+        lyrics: 快照中的歌词状态。
+    Returns:
+        dict[str, Any]: 只包含歌词内容和加载状态的字典。
+    """
+    return {
+        key: value
+        for key, value in lyrics.items()
+        if key not in ("current_index", "current_text", "next_text", "current_translation", "current_romanization")
+    }
+
+
+def snapshot_deltas(previous: dict[str, Any] | None, snapshot: dict[str, Any]) -> list[dict[str, Any]]:
+    """比较前后两次快照，生成增量消息。
+
+    Args:
+        previous: 上一次推送的快照。
+        snapshot: 新快照。
+    Returns:
+        list[dict[str, Any]]: 增量消息列表；没有变化时为空列表。
+    """
+    seq = snapshot.get("seq", 0)
+    if previous is None:
+        return [{"type": "snapshot", "seq": seq, "state": snapshot}]
+
+    messages: list[dict[str, Any]] = []
+    track = snapshot.get("track") or {}
+    playback = snapshot.get("playback") or {}
+    lyrics = snapshot.get("lyrics") or {}
+    previous_track = previous.get("track") or {}
+    previous_playback = previous.get("playback") or {}
+    previous_lyrics = previous.get("lyrics") or {}
+
+    # 【媒体组件】【订阅推送】1. 切歌时同时携带播放状态，订阅方无需等待下一条消息
+    if snapshot.get("active") != previous.get("active") or track.get("key") != previous_track.get("key"):
+        messages.append({
+            "type": "track",
+            "seq": seq,
+            "active": bool(snapshot.get("active")),
+            "track": track,
+            "playback": playback,
+        })
+    elif playback.get("anchor") != previous_playback.get("anchor") or playback.get("state") != previous_playback.get("state"):
+        messages.append({"type": "playback", "seq": seq, "track_key": track.get("key", ""), "playback": playback})
+
+    # 【媒体组件】【订阅推送】2. 其他播放器的曲目、状态或歌词就绪情况变化时推送播放器列表
+    if snapshot.get("players", []) != previous.get("players", []):
+        messages.append({"type": "players", "seq": seq, "players": snapshot.get("players", [])})
+
+    # 【媒体组件】【订阅推送】3. 歌词内容只在加载状态变化时整体推送，逐行变化只推送当前行
+    if lyrics_payload(lyrics) != lyrics_payload(previous_lyrics):
+        messages.append({"type": "lyrics", "seq": seq, "track_key": track.get("key", ""), "lyrics": lyrics})
+    elif lyrics.get("current_index") != previous_lyrics.get("current_index"):
+        messages.append({
+            "type": "lyrics_line",
+            "seq": seq,
+            "track_key": track.get("key", ""),
+            "index": lyrics.get("current_index", -1),
+            "text": lyrics.get("current_text", ""),
+            "next_text": lyrics.get("next_text", ""),
+            "translation": lyrics.get("current_translation", ""),
+            "romanization": lyrics.get("current_romanization", ""),
+        })
+    return messages
+
+
+class Subscriber:
+    """单个订阅连接的发送队列。"""
+
+    def __init__(self, writer: asyncio.StreamWriter) -> None:
+        """初始化订阅连接。
+
+        Args:
+            writer: 连接写入流。
+        Returns:
+            None: 无返回值。
+        """
+        self.writer = writer
+        self.queue: asyncio.Queue[dict[str, Any]] = asyncio.Queue(maxsize=SUBSCRIBER_QUEUE_SIZE)
+        self.resync = False
+
+    def offer(self, message: dict[str, Any]) -> bool:
+        """尝试把消息放入发送队列。
+
+        Args:
+            message: 需要发送的消息。
+        Returns:
+            bool: 成功入队或已在等待全量同步时返回 True；本次因队列已满转为全量同步时返回 False。
+        """
+        if self.resync:
+            return True
+        try:
+            self.queue.put_nowait(message)
+        except asyncio.QueueFull:
+            # 【媒体组件】【订阅推送】慢速订阅方积压时丢弃旧增量，改为补发一次全量快照
+            while not self.queue.empty():
+                self.queue.get_nowait()
+            self.resync = True
+            self.queue.put_nowait({"type": "resync"})
+            return False
+        return True
+
+
+class SubscriberHub:
+    """管理订阅套接字和所有订阅连接。"""
+
+    def __init__(
+        self,
+        on_subscribe: Callable[[], None] | None = None,
+        stats_provider: Callable[[], dict[str, Any]] | None = None,
+        on_select: Callable[[str], None] | None = None,
+    ) -> None:
+        """初始化订阅中心。
+
+        Args:
+            on_subscribe: 新订阅方连接后调用的回调，用于唤醒后台循环重新安排歌词行调度。
+            stats_provider: 生成后台运行统计的函数，用于响应 stats 请求。
+            on_select: 订阅方选择播放器时调用的回调，参数为播放器名称，空字符串表示自动选择。
+        Returns:
+            None: 无返回值。
+        """
+        self.on_subscribe = on_subscribe
+        self.stats_provider = stats_provider
+        self.on_select = on_select
+        self.server: asyncio.AbstractServer | None = None
+        self.path: Path | None = None
+        self.subscribers: set[Subscriber] = set()
+        self.last_snapshot: dict[str, Any] | None = None
+        self.messages_sent = 0
+        self.resyncs = 0
+        self.dropped_clients = 0
+
+    async def start(self, path: Path, sock: socket.socket | None = None) -> None:
+        """在指定路径上开始监听订阅连接。
+
+        Args:
+            path: Unix 套接字路径。
+            sock: systemd 传入的已监听套接字；为 None 时自行创建。
+        Returns:
+            None: 无返回值。
+        """
+        if sock is not None:
+            # 【媒体组件】【订阅推送】套接字文件由 systemd 管理，退出时不删除；asyncio 默认关闭时会删除套接字路径
+            self.server = await asyncio.start_unix_server(self.handle_client, sock=sock, cleanup_socket=False)
+            return
+        path.unlink(missing_ok=True)
+        self.server = await asyncio.start_unix_server(self.handle_client, str(path))
+        self.path = path
+
+    async def close(self) -> None:
+        """关闭监听套接字和所有订阅连接。
+
+        Args:
+            无。
+        Returns:
+            None: 无返回值。
+        """
+        for subscriber in list(self.subscribers):
+            subscriber.writer.close()
+        if self.server is not None:
+            self.server.close()
+            self.server = None
+        if self.path is not None:
+            self.path.unlink(missing_ok=True)
+            self.path = None
+
+    def snapshot_message(self) -> dict[str, Any]:
+        """生成当前全量快照消息。
+
+        Args:
+            无。
+        Returns:
+            dict[str, Any]: 全量快照消息。
+        """
+        snapshot = self.last_snapshot or {}
+        return {"type": "snapshot", "seq": snapshot.get("seq", 0), "state": {**snapshot, "daemon_alive": True}}
+
+    def publish(self, snapshot: dict[str, Any]) -> None:
+        """计算增量并推送给所有订阅方。
+
+        Args:
+            snapshot: 新快照。
+        Returns:
+            None: 无返回值。
+        """
+        # 【媒体组件】【订阅推送】第一次读取播放器之前连接的订阅方只收到空快照，第一次推送时补发全量快照
+        first = self.last_snapshot is None
+        messages = [] if first else snapshot_deltas(self.last_snapshot, snapshot)
+        self.last_snapshot = snapshot
+        if first:
+            messages = [self.snapshot_message()]
+        for subscriber in list(self.subscribers):
+            for message in messages:
+                if not subscriber.offer(message):
+                    self.resyncs += 1
+                    break
+
+    def subscribe(self, writer: asyncio.StreamWriter) -> tuple[Subscriber, asyncio.Task]:
+        """把连接登记为订阅方，排队全量快照并唤醒后台循环。
+
+        Args:
+            writer: 连接写入流。
+        Returns:
+            tuple[Subscriber, asyncio.Task]: 订阅连接和它的发送任务。
+        """
+        subscriber = Subscriber(writer)
+        subscriber.offer(self.snapshot_message())
+        self.subscribers.add(subscriber)
+        if self.on_subscribe is not None:
+            self.on_subscribe()
+        return subscriber, asyncio.get_running_loop().create_task(self.send_loop(subscriber))
+
+    async def handle_client(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        """处理单个连接：存活检测直接关闭，单次统计查询直接回复，其他连接先发送全量快照，再持续推送增量。
+
+        Args:
+            reader: 连接读取流。
+            writer: 连接写入流。
+        Returns:
+            None: 无返回值。
+        """
+        subscriber: Subscriber | None = None
+        sender: asyncio.Task | None = None
+        try:
+            # 【媒体组件】【订阅推送】1. 先等待第一条请求；只连接不读取的订阅方等待片刻后开始推送，立即断开的存活检测不会唤醒后台循环
+            try:
+                line = await asyncio.wait_for(reader.readline(), SUBSCRIBER_PROBE_SECONDS)
+            except asyncio.TimeoutError:
+                line = None
+
+            # 【媒体组件】【订阅推送】2. 订阅方可发送 snapshot 请求全量快照、stats 请求运行统计、select <播放器> 切换播放器，连接关闭时结束
+            while line != b"":
+                request = line.strip() if line else b""
+                if request == b"stats" and self.stats_provider is not None:
+                    message = {"type": "stats", "stats": self.stats_provider()}
+                    if subscriber is None:
+                        writer.write(encode_message(message))
+                        await asyncio.wait_for(writer.drain(), SUBSCRIBER_DRAIN_TIMEOUT_SECONDS)
+                    else:
+                        subscriber.offer(message)
+                elif subscriber is None:
+                    subscriber, sender = self.subscribe(writer)
+                elif request == b"snapshot":
+                    subscriber.offer(self.snapshot_message())
+                if (request == b"select" or request.startswith(b"select ")) and self.on_select is not None:
+                    self.on_select(request[len(b"select"):].decode("utf-8", "replace").strip())
+                line = await reader.readline()
+        except (ConnectionError, asyncio.IncompleteReadError, asyncio.TimeoutError):
+            pass
+        finally:
+            if subscriber is not None:
+                self.subscribers.discard(subscriber)
+            if sender is not None:
+                sender.cancel()
+            writer.close()
+
+    async def send_loop(self, subscriber: Subscriber) -> None:
+        """持续发送订阅方队列中的消息，写入阻塞过久时断开连接。
+
+        Args:
+            subscriber: 订阅连接。
+        Returns:
+            None: 无返回值。
+        """
+        writer = subscriber.writer
+        try:
+            while True:
+                message = await subscriber.queue.get()
+                if subscriber.resync:
+                    subscriber.resync = False
+                    message = self.snapshot_message()
+                writer.write(encode_message(message))
+                await asyncio.wait_for(writer.drain(), SUBSCRIBER_DRAIN_TIMEOUT_SECONDS)
+                self.messages_sent += 1
+        except (asyncio.TimeoutError, ConnectionError):
+            self.dropped_clients += 1
+            self.subscribers.discard(subscriber)
+            writer.close()
+
+    def stats(self) -> dict[str, Any]:
+        """生成订阅推送统计。
+
+        Args:
+            无。
+        Returns:
+            dict[str, Any]: 订阅推送统计。
+        """
+        return {
+            "subscribers": len(self.subscribers),
+            "messages_sent": self.messages_sent,
+            "resyncs": self.resyncs,
+            "dropped_clients": self.dropped_clients,
+        }
@@ -0,0 +1,420 @@
+#!/usr/bin/env python3
+"""基于 D-Bus 信号的 MPRIS 播放器状态监听。"""
+
+from __future__ import annotations
+
+import asyncio
+import time
+from typing import Any
+
+from dbus_next import BusType, Message, MessageType, Variant
+from dbus_next.aio import MessageBus
+
+import media_metrics
+
+
+MPRIS_PREFIX = "org.mpris.MediaPlayer2."
+MPRIS_PATH = "/org/mpris/MediaPlayer2"
+PLAYER_INTERFACE = "org.mpris.MediaPlayer2.Player"
+PROPERTIES_INTERFACE = "org.freedesktop.DBus.Properties"
+DBUS_NAME = "org.freedesktop.DBus"
+DBUS_PATH = "/org/freedesktop/DBus"
+CALL_TIMEOUT_SECONDS = 2.0
+POSITION_RESYNC_SECONDS = 5.0
+POSITION_JUMP_SECONDS = 0.5
+
+MATCH_RULES = [
+    f"type='signal',interface='{PROPERTIES_INTERFACE}',member='PropertiesChanged',"
+    f"path='{MPRIS_PATH}',arg0='{PLAYER_INTERFACE}'",
+    f"type='signal',interface='{PLAYER_INTERFACE}',member='Seeked',path='{MPRIS_PATH}'",
+    f"type='signal',sender='{DBUS_NAME}',interface='{DBUS_NAME}',member='NameOwnerChanged',"
+    "arg0namespace='org.mpris.MediaPlayer2'",
+]
+
+
+def unwrap_variant(value: Any) -> Any:
+    """递归展开 D-Bus Variant。
+
+    Args:
+        value: D-Bus 返回的原始值。
+    Returns:
+        Any: 展开后的 Python 值。
+    """
+    if isinstance(value, Variant):
+        return unwrap_variant(value.value)
+    if isinstance(value, dict):
+        return {key: unwrap_variant(item) for key, item in value.items()}
+    if isinstance(value, list):
+        return [unwrap_variant(item) for item in value]
+    return value
+
+
+def metadata_text(metadata: dict[str, Any], key: str) -> str:
+    """读取元数据文本字段，列表字段按 playerctl 规则合并。
+
+    Args:
+        metadata: 已展开的 MPRIS 元数据。
+        key: MPRIS 元数据键名。
+    Returns:
+        str: 元数据文本。
+    """
+    value = metadata.get(key, "")
+    if isinstance(value, list):
+        return ", ".join(str(item).strip() for item in value if str(item).strip())
+    return str(value or "").strip()
+
+
+def player_name(bus_name: str) -> str:
+    """把 D-Bus 名称转换为 playerctl 播放器名称。
+
+    Args:
+        bus_name: MPRIS D-Bus 名称。
+    Returns:
+        str: playerctl 播放器名称。
+    """
+    return bus_name[len(MPRIS_PREFIX):] if bus_name.startswith(MPRIS_PREFIX) else bus_name
+
+
+class MprisWatcher:
+    """订阅 MPRIS 信号并在内存中维护所有播放器状态。"""
+
+    name = "dbus"
+    poll_interval = POSITION_RESYNC_SECONDS
+    push_events = True
+
+    def __init__(self) -> None:
+        """初始化监听器。
+
+        Args:
+            无。
+        Returns:
+            None: 无返回值。
+        """
+        self.bus: MessageBus | None = None
+        self.players: dict[str, dict[str, Any]] = {}
+        self.changed = asyncio.Event()
+        self.tasks: set[asyncio.Task] = set()
+        self.next_order = 0
+
+    async def start(self) -> None:
+        """连接会话总线、注册信号匹配并加载已有播放器。
+
+        Args:
+            无。
+        Returns:
+            None: 无返回值。
+        """
+        self.bus = await MessageBus(bus_type=BusType.SESSION).connect()
+        self.bus.add_message_handler(self.on_message)
+
+        # 【媒体组件】【MPRIS】1. 先订阅信号，再枚举播放器，避免两步之间漏掉变化
+        for rule in MATCH_RULES:
+            await self.call(DBUS_NAME, DBUS_PATH, DBUS_NAME, "AddMatch", "s", [rule])
+
+        names = await self.call(DBUS_NAME, DBUS_PATH, DBUS_NAME, "ListNames")
+        for bus_name in (names or [[]])[0]:
+            if bus_name.startswith(MPRIS_PREFIX):
+                await self.add_player(bus_name)
+        self.changed.set()
+
+    async def close(self) -> None:
+        """断开会话总线连接。
+
+        Args:
+            无。
+        Returns:
+            None: 无返回值。
+        """
+        for task in list(self.tasks):
+            task.cancel()
+        if self.bus is not None:
+            self.bus.disconnect()
+            self.bus = None
+
+    async def call(
+        self,
+        destination: str,
+        path: str,
+        interface: str,
+        member: str,
+        signature: str = "",
+        body: list[Any] | None = None,
+    ) -> list[Any] | None:
+        """发送 D-Bus 方法调用。
+
+        Args:
+            destination: 目标总线名称。
+            path: 对象路径。
+            interface: 接口名称。
+            member: 方法名称。
+            signature: 参数签名。
+            body: 参数列表。
+        Returns:
+            list[Any] | None: 返回值列表；调用失败或超时时返回 None。
+        """
+        if self.bus is None:
+            return None
+
+        message = Message(
+            destination=destination,
+            path=path,
+            interface=interface,
+            member=member,
+            signature=signature,
+            body=body or [],
+        )
+        try:
+            with media_metrics.timed("dbus_call"):
+                reply = await asyncio.wait_for(self.bus.call(message), CALL_TIMEOUT_SECONDS)
+        except (asyncio.TimeoutError, OSError):
+            media_metrics.count("dbus_call_errors")
+            return None
+
+        if reply is None or reply.message_type == MessageType.ERROR:
+            media_metrics.count("dbus_call_errors")
+            return None
+        return reply.body
+
+    def spawn(self, coroutine: Any) -> None:
+        """在后台执行协程并保留引用，防止任务被提前回收。
+
+        Args:
+            coroutine: 需要执行的协程。
+        Returns:
+            None: 无返回值。
+        """
+        task = asyncio.get_running_loop().create_task(coroutine)
+        self.tasks.add(task)
+        task.add_done_callback(self.tasks.discard)
+
+    async def add_player(self, bus_name: str) -> None:
+        """读取新播放器的全部属性并加入模型。
+
+        Args:
+            bus_name: MPRIS D-Bus 名称。
+        Returns:
+            None: 无返回值。
+        """
+        owner = await self.call(DBUS_NAME, DBUS_PATH, DBUS_NAME, "GetNameOwner", "s", [bus_name])
+        if not owner:
+            return
+
+        player = self.players.get(bus_name)
+        if player is None:
+            player = {
+                "bus_name": bus_name,
+                "player": player_name(bus_name),
+                "owner": "",
+                "status": "",
+                "metadata": {},
+                "rate": 1.0,
+                "position": 0.0,
+                "position_at": time.monotonic(),
+                "order": self.next_order,
+            }
+            self.next_order += 1
+        player["owner"] = owner[0]
+        self.players[bus_name] = player
+        await self.refresh_player(player)
+
+    async def refresh_player(self, player: dict[str, Any]) -> None:
+        """重新读取播放器的全部 Player 属性。
+
+        Args:
+            player: 播放器模型。
+        Returns:
+            None: 无返回值。
+        """
+        reply = await self.call(
+            player["bus_name"], MPRIS_PATH, PROPERTIES_INTERFACE, "GetAll", "s", [PLAYER_INTERFACE]
+        )
+        if not reply:
+            return
+        self.apply_properties(player, unwrap_variant(reply[0]))
+        self.changed.set()
+
+    async def resync_position(self, player: dict[str, Any]) -> None:
+        """主动读取播放进度，校正本地推算值。
+
+        Args:
+            player: 播放器模型。
+        Returns:
+            None: 无返回值。
+        """
+        reply = await self.call(
+            player["bus_name"], MPRIS_PATH, PROPERTIES_INTERFACE, "Get", "ss", [PLAYER_INTERFACE, "Position"]
+        )
+        if not reply:
+            return
+        try:
+            position = float(unwrap_variant(reply[0])) / 1_000_000
+        except (TypeError, ValueError):
+            return
+
+        # 【媒体组件】【MPRIS】实际进度与推算值明显不同（切歌或未发送 Seeked 的跳转）时唤醒后台循环
+        if abs(position - self.current_position(player)) > POSITION_JUMP_SECONDS:
+            self.changed.set()
+        player["position"] = position
+        player["position_at"] = time.monotonic()
+
+    def apply_properties(self, player: dict[str, Any], properties: dict[str, Any]) -> None:
+        """把属性变化写入播放器模型。
+
+        Args:
+            player: 播放器模型。
+            properties: 已展开的属性字典。
+        Returns:
+            None: 无返回值。
+        """
+        # 【媒体组件】【MPRIS】1. 状态或速率变化前先固化当前推算进度，保证锚点连续
+        if "PlaybackStatus" in properties or "Rate" in properties:
+            player["position"] = self.current_position(player)
+            player["position_at"] = time.monotonic()
+
+        if "PlaybackStatus" in properties:
+            player["status"] = str(properties["PlaybackStatus"] or "")
+        if "Rate" in properties:
+            try:
+                player["rate"] = float(properties["Rate"])
+            except (TypeError, ValueError):
+                player["rate"] = 1.0
+        if "Metadata" in properties and isinstance(properties["Metadata"], dict):
+            player["metadata"] = properties["Metadata"]
+        if "Position" in properties:
+            try:
+                player["position"] = float(properties["Position"]) / 1_000_000
+                player["position_at"] = time.monotonic()
+            except (TypeError, ValueError):
+                pass
+
+    def find_by_owner(self, owner: str) -> dict[str, Any] | None:
+        """根据唯一连接名查找播放器。
+
+        Args:
+            owner: D-Bus 唯一连接名。
+        Returns:
+            dict[str, Any] | None: 播放器模型；未找到时返回 None。
+        """
+        for player in self.players.values():
+            if player["owner"] == owner:
+                return player
+        return None
+
+    def on_message(self, message: Message) -> None:
+        """处理订阅到的 D-Bus 信号。
+
+        Args:
+            message: D-Bus 消息。
+        Returns:
+            None: 无返回值，消息继续交给 dbus-next 默认处理。
+        """
+        if message.message_type != MessageType.SIGNAL:
+            return None
+        media_metrics.count("dbus_signals")
+
+        if message.member == "NameOwnerChanged" and message.interface == DBUS_NAME:
+            bus_name, _old_owner, new_owner = message.body
+            if not bus_name.startswith(MPRIS_PREFIX):
+                return None
+            if new_owner:
+                self.spawn(self.add_player(bus_name))
+            else:
+                self.players.pop(bus_name, None)
+                self.changed.set()
+            return None
+
+        player = self.find_by_owner(message.sender or "")
+        if player is None:
+            return None
+
+        if message.member == "PropertiesChanged":
+            _interface, changed, invalidated = message.body
+            self.apply_properties(player, unwrap_variant(changed))
+            # 【媒体组件】【MPRIS】2. 部分播放器只发送失效通知，需要重新读取完整属性
+            if invalidated:
+                self.spawn(self.refresh_player(player))
+            # 【媒体组件】【MPRIS】3. Position 不会随 PropertiesChanged 推送，切歌或切状态后主动校正
+            if {"PlaybackStatus", "Metadata", "Rate"} & set(changed):
+                self.spawn(self.resync_position(player))
+            self.changed.set()
+            return None
+
+        if message.member == "Seeked" and message.body:
+            player["position"] = float(message.body[0]) / 1_000_000
+            player["position_at"] = time.monotonic()
+            self.changed.set()
+        return None
+
+    def current_position(self, player: dict[str, Any]) -> float:
+        """根据最近一次进度锚点推算当前进度。
+
+        Args:
+            player: 播放器模型。
+        Returns:
+            float: 当前播放进度，单位为秒。
+        """
+        position = float(player["position"])
+        if player["status"] == "Playing":
+            position += float(player["rate"]) * (time.monotonic() - float(player["position_at"]))
+        length = self.track_length(player)
+        if length > 0:
+            position = min(position, length)
+        return max(position, 0.0)
+
+    def track_length(self, player: dict[str, Any]) -> float:
+        """读取曲目总时长。
+
+        Args:
+            player: 播放器模型。
+        Returns:
+            float: 曲目总时长，单位为秒。
+        """
+        try:
+            return float(player["metadata"].get("mpris:length", 0) or 0) / 1_000_000
+        except (TypeError, ValueError):
+            return 0
+
+    async def read_players(self) -> list[dict[str, Any]]:
+        """读取所有播放器的当前信息。
+
+        Args:
+            无。
+        Returns:
+            list[dict[str, Any]]: 播放器信息列表，顺序与播放器出现顺序一致。
+        """
+        self.changed.clear()
+        now = time.monotonic()
+
+        # 【媒体组件】【MPRIS】1. 浏览器等播放器不一定发送 Seeked，播放中定期校正一次进度
+        for player in list(self.players.values()):
+            if player["status"] == "Playing" and now - player["position_at"] >= POSITION_RESYNC_SECONDS:
+                await self.resync_position(player)
+
+        players = sorted(self.players.values(), key=lambda item: item["order"])
+        return [
+            {
+                "player": player["player"],
+                "status": player["status"],
+                "title": metadata_text(player["metadata"], "xesam:title"),
+                "artist": metadata_text(player["metadata"], "xesam:artist"),
+                "album": metadata_text(player["metadata"], "xesam:album"),
+                "length": self.track_length(player),
+                "position": self.current_position(player),
+                "rate": float(player["rate"]),
+            }
+            for player in players
+        ]
+
+    async def wait_changed(self, timeout: float) -> bool:
+        """等待播放器状态变化。
+
+        Args:
+            timeout: 最长等待时间，单位为秒。
+        Returns:
+            bool: 等待期间收到变化时返回 True，超时返回 False。
+        """
+        try:
+            await asyncio.wait_for(self.changed.wait(), max(timeout, 0))
+        except asyncio.TimeoutError:
+            return False
+        return True
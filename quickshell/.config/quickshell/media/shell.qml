@@ -292,23 +292,56 @@ ShellRoot {
         onTriggered: updateCurrentLyric()
     }
 
-    // 【媒体组件】【后台状态】后台脚本请求歌词时，组件只轮询快照，不重复请求接口
+    // 【媒体组件】【后台状态】后台脚本请求歌词时，订阅连接不可用才轮询快照，不重复请求接口
     Timer {
         interval: 1000
-        running: root.hasPlayer && root.lyricsLoading && !root.mediaStateLoadPending
+        running: root.hasPlayer && root.lyricsLoading && !root.mediaStateLoadPending && !mediaStateSocket.connected
         repeat: true
         onTriggered: root.requestMediaStateSnapshot(false)
     }
 
+    // 【媒体组件】【订阅推送】后台脚本刚启动时套接字可能尚未创建，短暂重试连接
+    Timer {
+        id: mediaStateSocketRetry
+        interval: 500
+        repeat: false
+        onTriggered: root.connectMediaStateSocket()
+    }
+
     property string scriptPath: Qt.resolvedUrl("lyrics_fetcher.py").toString().replace("file://", "")
     property string mediaStateScriptPath: Qt.resolvedUrl("media_state.py").toString().replace("file://", "")
     property string uvPath: "/usr/bin/uv"
     property string rootDir: Quickshell.env("HOME") + "/.config/quickshell"
+    property string mediaStateSocketPath: (Quickshell.env("XDG_RUNTIME_DIR") || "/tmp") + "/quickshell/media-state.sock"
+    property int mediaStateSocketRetries: 0
+    property bool mediaStateDaemonProbe: false
+
+    Socket {
+        id: mediaStateSocket
+        path: root.mediaStateSocketPath
+        connected: false
+        parser: SplitParser {
+            onRead: data => root.applyMediaStateMessage(data)
+        }
+        onError: error => {
+            // 【媒体组件】【后台状态】首次连接失败说明后台脚本未运行，才启动进程拉起后台脚本
+            if (root.mediaStateDaemonProbe) {
+                root.mediaStateDaemonProbe = false
+                root.startMediaStateDaemon()
+                return
+            }
+            if (root.mediaStateSocketRetries < 10) {
+                root.mediaStateSocketRetries += 1
+                mediaStateSocketRetry.restart()
+            }
+        }
+    }
 
     Process {
         id: mediaStateDaemon
         command: ["echo"]
         stdout: StdioCollector {}
+        onExited: (code, status) => root.connectMediaStateSocket()
         stderr: StdioCollector {
             onStreamFinished: {
                 if (text && text.trim()) {
@@ -394,11 +427,65 @@ ShellRoot {
      * @returns 无
      */
     function ensureMediaStateDaemon() {
-        // 【媒体组件】【后台状态】1. 后台脚本自行检查 PID，避免重复启动
+        // 【媒体组件】【后台状态】1. 先直接连接订阅套接字，后台已运行或由 systemd 套接字激活时无需启动进程
+        if (mediaStateSocket.connected) return
+        mediaStateDaemonProbe = true
+        mediaStateSocketRetries = 0
+        mediaStateSocket.connected = true
+    }
+
+    /**
+     * 启动 ensure-daemon 进程拉起后台脚本，结束后重新连接订阅套接字。
+     *
+     * @param 无
+     * @returns 无
+     */
+    function startMediaStateDaemon() {
+        // 【媒体组件】【后台状态】2. 后台脚本自带单实例锁，多个组件同时启动也只保留一个
         mediaStateDaemon.command = [uvPath, "run", "--directory", rootDir, mediaStateScriptPath, "ensure-daemon"]
         mediaStateDaemon.running = true
     }
 
+    /**
+     * 连接媒体状态订阅套接字，后台脚本推送变化后无需轮询快照。
+     *
+     * @param 无
+     * @returns 无
+     */
+    function connectMediaStateSocket() {
+        if (mediaStateSocket.connected) return
+        mediaStateSocket.connected = true
+    }
+
+    /**
+     * 应用订阅套接字推送的一行消息。
+     *
+     * @param {string} line - 后台脚本推送的 JSON 行。
+     * @returns 无
+     */
+    function applyMediaStateMessage(line) {
+        let message
+        try {
+            message = JSON.parse(line)
+        } catch (e) {
+            console.log("【媒体组件】【订阅推送】解析消息失败:", e)
+            return
+        }
+
+        // 【媒体组件】【订阅推送】1. 全量快照与轮询快照走同一处理流程
+        if (message.type === "snapshot") {
+            applyMediaStateData(message.state || {})
+            return
+        }
+
+        // 【媒体组件】【订阅推送】2. 歌词加载完成时直接应用；进度和当前行由组件自身的 MPRIS 状态计算
+        if (message.type === "lyrics" && message.track_key === trackKey && !mediaStateLoadPending) {
+            if (applyLyricsFromMediaState(message.lyrics || {}) && lyricsLoaded) {
+                updateCurrentLyric()
+            }
+        }
+    }
+
     /**
      * 请求媒体状态快照。
      *
@@ -484,14 +571,30 @@ ShellRoot {
      * @returns 无
      */
     function applyMediaStateSnapshot(text) {
+        let data
+        try {
+            data = JSON.parse(text || "{}")
+        } catch (e) {
+            console.log("【媒体组件】【状态脚本】解析状态失败:", e)
+            data = {}
+        }
+        applyMediaStateData(data)
+    }
+
+    /**
+     * 应用已解析的媒体后台状态。
+     *
+     * @param {var} data - 后台状态对象。
+     * @returns 无
+     */
+    function applyMediaStateData(data) {
         let applied = false
         try {
-            let data = JSON.parse(text || "{}")
             let track = data.track || {}
             let playback = data.playback || {}
             let snapshotTrackKey = track.key || ""
-            let updatedAt = data.updated_at || 0
-            let stale = updatedAt > 0 && (Date.now() / 1000 - updatedAt > 20)
+            // 【媒体组件】【进度锚点】后台只在状态变化时写入，快照新旧由后台进程是否存活判断
+            let stale = data.daemon_alive === false
 
             if (data.success && data.active && snapshotTrackKey === trackKey && !stale) {
                 if (playback.position !== undefined) {
@@ -506,7 +609,7 @@ ShellRoot {
                 scheduleLyricsFetch()
             }
         } catch (e) {
-            console.log("【媒体组件】【状态脚本】解析状态失败:", e)
+            console.log("【媒体组件】【状态脚本】应用状态失败:", e)
         }
 
         if (mediaStateLoadPending) {
@@ -553,9 +656,10 @@ ShellRoot {
         let pos = isDragging ? dragPosition : position
         let newIndex = -1
 
+        // 【媒体组件】【歌词定位】同一时间有多行时停在第一行，即原文和合并到原文上的翻译
         for (let i = 0; i < lyricsLines.length; i++) {
             if (lyricsLines[i].time <= pos) {
-                newIndex = i
+                if (newIndex < 0 || lyricsLines[i].time > lyricsLines[newIndex].time) newIndex = i
             } else {
                 break
             }
@@ -565,7 +669,9 @@ ShellRoot {
             currentLyricIndex = newIndex
             if (newIndex >= 0) {
                 currentLyric = lyricsLines[newIndex].text
-                nextLyric = (newIndex + 1 < lyricsLines.length) ? lyricsLines[newIndex + 1].text : ""
+                let nextIndex = newIndex + 1
+                while (nextIndex < lyricsLines.length && lyricsLines[nextIndex].time <= lyricsLines[newIndex].time) nextIndex++
+                nextLyric = nextIndex < lyricsLines.length ? lyricsLines[nextIndex].text : ""
             } else if (lyricsLines.length > 0) {
                 currentLyric = ""
                 nextLyric = lyricsLines[0].text
@@ -606,15 +712,30 @@ ShellRoot {
     function nextPlayer() {
         if (playersList.length > 1) {
             currentPlayerIndex = (currentPlayerIndex + 1) % playersList.length
+            selectMediaStatePlayer()
         }
     }
 
     function prevPlayer() {
         if (playersList.length > 1) {
             currentPlayerIndex = (currentPlayerIndex - 1 + playersList.length) % playersList.length
+            selectMediaStatePlayer()
         }
     }
 
+    /**
+     * 通知后台脚本切换到组件当前展示的播放器。
+     *
+     * @param 无
+     * @returns 无
+     */
+    function selectMediaStatePlayer() {
+        // 【媒体组件】【多播放器】后台为每个播放器缓存歌词，切换后立即推送所选播放器的歌词，无需重新请求
+        if (!mediaStateSocket.connected || !playerctlName) return
+        mediaStateSocket.write("select " + playerctlName + "\n")
+        mediaStateSocket.flush()
+    }
+
     // ============ UI ============
     MediaView {
         controller: root